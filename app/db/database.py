@@ -1,6 +1,21 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
+from typing import Dict
+from app.db.monitoring import command_metrics
+import asyncio
 import os
 
+# Connection pool and wire settings, see https://pymongo.readthedocs.io/en/stable/api/pymongo/mongo_client.html
+MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", 100))
+MONGO_MIN_POOL_SIZE = int(os.environ.get("MONGO_MIN_POOL_SIZE", 10))
+MONGO_MAX_IDLE_TIME_MS = int(os.environ.get("MONGO_MAX_IDLE_TIME_MS", 300000))
+# How long a request waits for a free pooled connection before failing, instead of queueing forever
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get("MONGO_WAIT_QUEUE_TIMEOUT_MS", 10000))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", 10000))
+# Compressors missing from the environment (zstd needs zstandard, snappy needs python-snappy) are skipped
+MONGO_COMPRESSORS = os.environ.get("MONGO_COMPRESSORS", "zstd,zlib")
+# Ping the cluster and open MONGO_MIN_POOL_SIZE connections before the app serves requests
+MONGO_WARMUP = os.environ.get("MONGO_WARMUP", "true").lower() == "true"
+
 
 def get_mongo_uri():
     return f"mongodb+srv://{os.environ.get('MONGO_USER')}:{os.environ.get('MONGO_PASSWORD')}@{os.environ.get('MONGO_CLUSTER')}/?retryWrites=true&w=majority&appName=Cluster0"
@@ -27,12 +42,37 @@ class MongoClient:
         Connect to the database on startup
         """
         try:
-            self._client = AsyncIOMotorClient(get_mongo_uri())
+            self._client = AsyncIOMotorClient(get_mongo_uri(), **self._client_options())
+            if MONGO_WARMUP:
+                await self.warm_up()
             print("Connected to mongo.")
         except Exception as e:
             print("Error connecting to mongo.")
             raise e
 
+    @staticmethod
+    def _client_options() -> Dict:
+        options = {
+            "maxPoolSize": MONGO_MAX_POOL_SIZE,
+            "minPoolSize": MONGO_MIN_POOL_SIZE,
+            "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+            "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            # Per-collection and per-command latency, exposed at /metrics
+            "event_listeners": [command_metrics],
+        }
+        if MONGO_COMPRESSORS:
+            options["compressors"] = MONGO_COMPRESSORS
+        return options
+
+    async def warm_up(self):
+        """
+        Fail fast if the cluster is unreachable, then run minPoolSize concurrent pings so that many
+        connections are already open when the first requests arrive.
+        """
+        await self._client.admin.command("ping")
+        await asyncio.gather(*(self._client.admin.command("ping") for _ in range(MONGO_MIN_POOL_SIZE)))
+
     async def disconnect_db(self):
         """ Disconnect from the database on shutdown """
         if self._client is None:
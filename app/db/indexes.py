@@ -0,0 +1,191 @@
+"""
+Declarative registry of the indexes the repositories rely on.
+
+ensure_indexes runs from the lifespan hook in app/main.py and can be run standalone:
+
+    python -m app.db.indexes          # create missing indexes, drop retired ones, report drift
+    python -m app.db.indexes --check  # only report, exit 1 if anything is missing, retired or drifted
+"""
+import asyncio
+import os
+import sys
+from typing import Dict, List, Tuple
+from pydantic import BaseModel
+from pymongo.errors import OperationFailure
+from app.db import client as default_client
+from app.db.database import MongoClient
+
+# Index options compared against the live index when looking for drift
+COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+# Changelog entries older than this are removed by a TTL index; unset keeps them forever
+CHANGELOG_RETENTION_DAYS = os.environ.get("CHANGELOG_RETENTION_DAYS")
+
+
+class IndexSpec(BaseModel):
+    collection: str
+    keys: List[Tuple[str, int]]
+    name: str
+    options: Dict = {}
+
+
+class IndexReport(BaseModel):
+    created: List[str] = []
+    updated: List[str] = []
+    dropped: List[str] = []
+    missing: List[str] = []
+    retired: List[str] = []
+    drifted: List[str] = []
+    failed: List[str] = []
+    ok: List[str] = []
+
+    @property
+    def healthy(self) -> bool:
+        return not (self.missing or self.retired or self.drifted or self.failed)
+
+
+INDEXES: List[IndexSpec] = [
+    # Reminder upserts and lookups match on (company_id, action_id)
+    IndexSpec(collection="reminders", keys=[("company_id", 1), ("action_id", 1)], name="company_id_action_id", options={"unique": True}),
+    # Open reminders by due date window
+    IndexSpec(collection="reminders", keys=[("completed", 1), ("due_date", 1), ("_id", 1)], name="completed_due_date_id"),
+    # Per-company email summary, stats and newest-first history
+    IndexSpec(collection="emails", keys=[("company_id", 1), ("datetime", -1), ("_id", -1)], name="company_id_datetime_id"),
+    # Keyset pagination of the company listing
+    IndexSpec(collection="company", keys=[("legal_name", 1), ("_id", 1)], name="legal_name_id"),
+    # Import matching on the normalized legal name; unique so concurrent imports cannot both insert a company
+    IndexSpec(collection="company", keys=[("legal_name_key", 1)], name="legal_name_key", options={"unique": True}),
+    # Positional updates of contacts and actions
+    IndexSpec(collection="company", keys=[("contacts.id", 1)], name="contacts_id"),
+    IndexSpec(collection="company", keys=[("actions.id", 1)], name="actions_id"),
+    # Newest-first changelog queries, unfiltered and per company, operation or user
+    IndexSpec(collection="changelog", keys=[("date", -1), ("_id", -1)], name="date_id"),
+    IndexSpec(collection="changelog", keys=[("company_id", 1), ("date", -1), ("_id", -1)], name="company_id_date_id"),
+    IndexSpec(collection="changelog", keys=[("operation", 1), ("date", -1), ("_id", -1)], name="operation_date_id"),
+    IndexSpec(collection="changelog", keys=[("user", 1), ("date", -1), ("_id", -1)], name="user_date_id"),
+]
+
+if CHANGELOG_RETENTION_DAYS:
+    # Retention; TTL indexes must be single-field. Without a retention period this would only
+    # duplicate date_id, so it is not registered at all.
+    INDEXES.append(IndexSpec(
+        collection="changelog",
+        keys=[("date", 1)],
+        name="date_ttl",
+        options={"expireAfterSeconds": int(float(CHANGELOG_RETENTION_DAYS) * 86400)}
+    ))
+
+# (collection, name) of indexes that were replaced and are dropped when still present
+RETIRED_INDEXES: List[Tuple[str, str]] = [
+    # Superseded by company_id_datetime_id, which also serves the newest-first keyset pages
+    ("emails", "company_id_datetime"),
+]
+
+if not CHANGELOG_RETENTION_DAYS:
+    # A TTL index left from an earlier retention setting would keep expiring entries
+    RETIRED_INDEXES.append(("changelog", "date_ttl"))
+
+
+def _label(spec: IndexSpec) -> str:
+    return f"{spec.collection}.{spec.name}"
+
+
+def _find_existing(spec: IndexSpec, existing: Dict) -> Tuple[str, Dict] | None:
+    """
+    Live indexes are matched on their key pattern, not their name. Numeric directions may come back
+    as floats (1.0); special index types ("text", "hashed", "2dsphere") are compared as-is.
+    """
+    for name, info in existing.items():
+        if [(k, d if isinstance(d, str) else int(d)) for k, d in info["key"]] == spec.keys:
+            return name, info
+    return None
+
+
+def _drift(spec: IndexSpec, info: Dict) -> Dict:
+    """
+    Return {option: (expected, actual)} for every option that differs from the spec.
+    """
+    diff = {}
+    for option in COMPARED_OPTIONS:
+        expected, actual = spec.options.get(option), info.get(option)
+        if option in ("unique", "sparse"):
+            expected, actual = bool(expected), bool(actual)
+        if expected != actual:
+            diff[option] = (expected, actual)
+    return diff
+
+
+async def ensure_indexes(
+    client: MongoClient,
+    create: bool = True,
+    specs: List[IndexSpec] = INDEXES,
+    retired: List[Tuple[str, str]] = RETIRED_INDEXES
+) -> IndexReport:
+    """
+    Create the registered indexes that are missing, drop the retired ones and report the ones
+    whose options drifted. Drifted indexes are never dropped automatically.
+    """
+    report = IndexReport()
+    existing_by_collection: Dict[str, Dict] = {}
+    for collection, name in retired:
+        if collection not in existing_by_collection:
+            existing_by_collection[collection] = await client.collection(collection).index_information()
+        if name not in existing_by_collection[collection]:
+            continue
+        label = f"{collection}.{name}"
+        if not create:
+            report.retired.append(label)
+            continue
+        try:
+            await client.collection(collection).drop_index(name)
+            del existing_by_collection[collection][name]
+            report.dropped.append(label)
+        except OperationFailure as ex:
+            print(f"Could not drop retired index {label}: {ex}")
+            report.failed.append(label)
+    for spec in specs:
+        if spec.collection not in existing_by_collection:
+            existing_by_collection[spec.collection] = await client.collection(spec.collection).index_information()
+        found = _find_existing(spec, existing_by_collection[spec.collection])
+        if found is None:
+            if not create:
+                report.missing.append(_label(spec))
+                continue
+            try:
+                await client.collection(spec.collection).create_index(spec.keys, name=spec.name, **spec.options)
+                report.created.append(_label(spec))
+            except OperationFailure as ex:
+                print(f"Could not create index {_label(spec)}: {ex}")
+                report.failed.append(_label(spec))
+            continue
+        diff = _drift(spec, found[1])
+        if create and set(diff) == {"expireAfterSeconds"} and spec.options.get("expireAfterSeconds") is not None:
+            # A changed retention period can be applied in place
+            try:
+                await client.get_database().command({
+                    "collMod": spec.collection,
+                    "index": {"name": found[0], "expireAfterSeconds": spec.options["expireAfterSeconds"]},
+                })
+                report.updated.append(_label(spec))
+                continue
+            except OperationFailure as ex:
+                print(f"Could not update TTL of index {_label(spec)}: {ex}")
+        if diff:
+            print(f"Index {spec.collection}.{found[0]} drifted from {spec.name}: {diff}")
+            report.drifted.append(_label(spec))
+        else:
+            report.ok.append(_label(spec))
+    return report
+
+
+async def main(check_only: bool) -> int:
+    await default_client.connect_db()
+    try:
+        report = await ensure_indexes(default_client, create=not check_only)
+    finally:
+        await default_client.disconnect_db()
+    print(report.model_dump_json(indent=2))
+    return 0 if report.healthy else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main("--check" in sys.argv[1:])))
@@ -0,0 +1,68 @@
+from typing import Dict, Tuple
+from pymongo import monitoring
+from prometheus_client import Counter, Histogram
+
+MONGO_COMMAND_SECONDS = Histogram(
+    "mongo_command_duration_seconds",
+    "Duration of MongoDB commands as seen by the driver.",
+    ["collection", "command"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "mongo_command_failures_total",
+    "MongoDB commands that returned an error.",
+    ["collection", "command"],
+)
+MONGO_COMMAND_DOCUMENTS = Counter(
+    "mongo_command_documents_total",
+    "Documents returned by cursors or affected by writes, per collection and command.",
+    ["collection", "command"],
+)
+
+
+def _collection(command_name: str, command: Dict) -> str:
+    # getMore names its collection separately; most other commands carry it as their first value
+    target = command.get("collection") if command_name == "getMore" else command.get(command_name)
+    return target if isinstance(target, str) else "-"
+
+
+def _documents(reply: Dict) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    if "n" in reply:
+        return int(reply["n"])
+    if "value" in reply:  # findAndModify
+        return 1 if reply["value"] is not None else 0
+    return 0
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    Records per-collection and per-command latency, failures and document counts.
+    Registered on the client in MongoClient.connect_db.
+    """
+
+    def __init__(self):
+        # (connection, request id) -> (collection, command), the success and failure events only carry the name
+        self._pending: Dict[Tuple, Tuple[str, str]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self._pending[(event.connection_id, event.request_id)] = (
+            _collection(event.command_name, event.command), event.command_name
+        )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        labels = self._pending.pop((event.connection_id, event.request_id), ("-", event.command_name))
+        MONGO_COMMAND_SECONDS.labels(*labels).observe(event.duration_micros / 1_000_000)
+        documents = _documents(event.reply)
+        if documents:
+            MONGO_COMMAND_DOCUMENTS.labels(*labels).inc(documents)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        labels = self._pending.pop((event.connection_id, event.request_id), ("-", event.command_name))
+        MONGO_COMMAND_SECONDS.labels(*labels).observe(event.duration_micros / 1_000_000)
+        MONGO_COMMAND_FAILURES.labels(*labels).inc()
+
+
+command_metrics = MongoCommandMetrics()
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class ImportJobStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
@@ -4,3 +4,11 @@ from enum import Enum
 class ReminderState(str, Enum):
     NOT_PAST = "NOT_PAST"
     PAST = "PAST"
+
+
+class ReminderWindow(str, Enum):
+    """
+    Due-date windows accepted by the reminder listing
+    """
+    OVERDUE = "overdue"
+    UPCOMING = "upcoming"
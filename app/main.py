@@ -1,16 +1,43 @@
+import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.db import client
+from app.db.indexes import ensure_indexes
+from app.repositories.company import CompanyRepository
+from app.utils.company.company_excel_util import shutdown_import_executor
+from app.services.changelog_sink import changelog_sink
+from app.services.reminder_scheduler import reminder_scheduler
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from app.utils.fast_json import FAST_JSON, ORJSONResponse
+from app.utils.metrics import MetricsMiddleware, metrics_response
 from app.routers.auth_router import router as authorized_router
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await client.connect_db()
+    if os.environ.get("ENSURE_INDEXES_ON_STARTUP", "true").lower() == "true":
+        # Older companies need their import matching key before the unique index on it can be built
+        backfilled = await CompanyRepository.backfill_legal_name_keys(client)
+        if backfilled:
+            print(f"Legal name keys backfilled on {backfilled} companies.")
+        report = await ensure_indexes(client)
+        print(f"Indexes: {len(report.created)} created, {len(report.updated)} updated, {len(report.dropped)} dropped, {len(report.drifted)} drifted, {len(report.failed)} failed.")
+    changelog_sink.start(client)
+    if os.environ.get("REMINDER_SCHEDULER_ENABLED", "true").lower() == "true":
+        await reminder_scheduler.start(client)
     yield
+    await reminder_scheduler.stop()
+    shutdown_import_executor()
+    # Write out queued changelog entries before the connection goes away
+    await changelog_sink.stop()
     await client.disconnect_db()
 
-app = FastAPI(lifespan=lifespan)  # Remove 'strict_slashes'
+app = FastAPI(
+    lifespan=lifespan,
+    # FAST_JSON renders every response with orjson
+    default_response_class=ORJSONResponse if FAST_JSON else JSONResponse
+)  # Remove 'strict_slashes'
 
 # Enable CORS
 app.add_middleware(
@@ -21,10 +48,17 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
+app.add_middleware(MetricsMiddleware)
+
 # Include API routers
 app.include_router(authorized_router)
 
 # Healthcheck route
 @app.get("/", status_code=200, include_in_schema=False)
 async def healthcheck():
-    return {"status": "App is online"}
+    return {"status": "App is online", "changelog": changelog_sink.stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return metrics_response()
@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from app.enums.operation import LogType
-from typing import Any
+from typing import Any, Optional
+from .pyobject_id import PyObjectId
 
 
 class Changelog(BaseModel):
@@ -9,3 +10,8 @@ class Changelog(BaseModel):
     updates: Any
     date: datetime
     user: str
+    company_id: Optional[str] = Field(None, serialization_alias="companyId")
+
+
+class ChangelogEntry(Changelog):
+    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id", serialization_alias="id")
@@ -1,7 +1,15 @@
+from typing import Generic, List, Optional, TypeVar
 from pydantic import BaseModel, Field, ConfigDict
 from .pyobject_id import PyObjectId
 
+T = TypeVar("T")
+
 
 class FlexiblePyObjectDoc(BaseModel):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id", serialization_alias="id")
     model_config = ConfigDict(extra="allow")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = Field(None, serialization_alias="nextCursor")
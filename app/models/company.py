@@ -7,6 +7,7 @@ from .comment import Comment
 from .news import News
 from .contacts import Contact
 from .financials import Financials
+from .email import EmailSummary
 from datetime import date
 
 class CompanyBase(BaseModel):
@@ -19,6 +20,7 @@ class CompanyBase(BaseModel):
     contact_name: Optional[str] = Field(None, serialization_alias="contactName")
     latest_email_datetime: Optional[str] = Field(None, serialization_alias="latestEmailDatetime")
     latest_email_template: Optional[str] = Field(None, serialization_alias="latestEmailTemplate")
+    email_summary: Optional[EmailSummary] = Field(None, serialization_alias="emailSummary")
 
     model_config = ConfigDict(
         arbitrary_types_allowed=True, 
@@ -3,9 +3,9 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import List, Optional
 from .contacts import Contact
+from .common import CursorPage
 
-class Email(BaseModel):
-    id: str
+class EmailBase(BaseModel):
     datetime: datetime
     sender: str
     recipient: Contact
@@ -16,6 +16,37 @@ class Email(BaseModel):
 
     class Config:
         arbitrary_types_allowed = True  # Allow ObjectId type
+
+
+class Email(EmailBase):
+    id: str
+
+
+class EmailBulkItemError(BaseModel):
+    index: int  # Position of the item in the request
+    detail: str
+
+
+class EmailBulkResult(BaseModel):
+    inserted: int = 0
+    failed: int = 0
+    errors: List[EmailBulkItemError] = []
+
+
+class EmailSummary(BaseModel):
+    """
+    Per-company email rollup kept on the company document by EmailRepository.
+    """
+    latest_datetime: Optional[datetime] = Field(None, serialization_alias="latestDatetime")
+    latest_template: Optional[str] = Field(None, serialization_alias="latestTemplate")
+    count: int = 0
+    sent_count: int = Field(0, serialization_alias="sentCount")
+    answered_count: int = Field(0, serialization_alias="answeredCount")
+
+
+
+class CompanyEmailPage(CursorPage[Email]):
+    stats: EmailSummary
         
         
 class EmlRequest(BaseModel):
@@ -24,4 +55,18 @@ class EmlRequest(BaseModel):
     html_body: str
     images: List[str]  # Base64-encoded images
 
-    
\ No newline at end of file
+    
+
+
+class EmlBatchRequest(BaseModel):
+    """
+    One EML per recipient, rendered from string.Template placeholders:
+    $first_name, $last_name, $email and $legal_name.
+    """
+    subject: str
+    html_body: str
+    template: str  # Template name recorded on the created Email documents
+    sender: Optional[str] = None
+    contact_ids: List[str] = []
+    company_ids: List[str] = []  # Every contact with an email, except dont_bother ones
+    images: List[str] = []  # Base64-encoded images shared by every message
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field, computed_field
+from datetime import datetime
+from typing import Optional
+from app.enums.import_job import ImportJobStatus
+
+
+class ImportSummary(BaseModel):
+    rows_processed: int = Field(0, serialization_alias="rowsProcessed")
+    matched: int = 0
+    inserted: int = 0
+    failed: int = 0
+
+
+class ImportJob(ImportSummary):
+    """
+    Progress of a background company import. Counters are updated in place as batches are written.
+    """
+    id: str
+    status: ImportJobStatus = ImportJobStatus.PENDING
+    started_at: datetime = Field(default_factory=datetime.now, serialization_alias="startedAt")
+    finished_at: Optional[datetime] = Field(None, serialization_alias="finishedAt")
+    error: Optional[str] = None
+
+    @computed_field
+    @property
+    def updated(self) -> int:
+        # Rows that matched an existing company had their financials appended
+        return self.matched
+
+    @computed_field(alias="elapsedSeconds")
+    @property
+    def elapsed_seconds(self) -> float:
+        return ((self.finished_at or datetime.now()) - self.started_at).total_seconds()
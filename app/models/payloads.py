@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional
 from app.models.action import ActionBase
 from datetime import datetime
+from app.utils.dates import to_utc
 
 
 class FinancialsUpdatePayload(BaseModel):
@@ -53,3 +54,16 @@ class CreateReminderPayload(BaseModel):
     company_id: str = Field(..., serialization_alias="companyId", alias="companyId")
     action_id: str = Field(..., serialization_alias="actionId", alias="actionId")
     due_date: datetime = Field(..., serialization_alias="dueDate", alias="dueDate")
+
+
+class UpdateReminderPayload(BaseModel):
+    due_date: Optional[datetime] = Field(None, alias="dueDate")
+    completed: Optional[bool] = Field(None, alias="isCompleted")
+    company_id: Optional[str] = Field(None, alias="companyId")
+    action_id: Optional[str] = Field(None, alias="actionId")
+
+    @field_validator("due_date")
+    @classmethod
+    def _due_date_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Due dates are stored and compared as naive UTC
+        return to_utc(value) if value is not None else None
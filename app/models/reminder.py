@@ -1,9 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from app.enums.reminder import ReminderState
 from app.models.action import Action
-from typing import Optional
+from typing import Optional, List
 from .pyobject_id import PyObjectId
+from app.utils.dates import to_utc
 
 
 class ReminderBase(BaseModel):
@@ -11,6 +12,12 @@ class ReminderBase(BaseModel):
     action_id: str = Field(..., serialization_alias="actionId")
     due_date: datetime = Field(..., serialization_alias="dueDate")
 
+    @field_validator("due_date")
+    @classmethod
+    def _due_date_utc(cls, value: datetime) -> datetime:
+        # Due dates are stored and compared as naive UTC
+        return to_utc(value)
+
 
 class Reminder(ReminderBase):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id", serialization_alias="id")
@@ -26,3 +33,18 @@ class ReminderDisplay(BaseModel):
     created_at: datetime = Field(..., serialization_alias="createdAt")
     due_date: datetime = Field(..., serialization_alias="dueDate")
     action: Action
+
+
+class ReminderCounts(BaseModel):
+    overdue: int = 0
+    due_today: int = Field(0, serialization_alias="dueToday")
+    upcoming: int = 0
+
+
+class CompanyReminderCounts(ReminderCounts):
+    company_id: str = Field(..., serialization_alias="companyId")
+    company_name: Optional[str] = Field(None, serialization_alias="companyName")
+
+
+class ReminderSummary(ReminderCounts):
+    by_company: List[CompanyReminderCounts] = Field([], serialization_alias="byCompany")
@@ -1,7 +1,8 @@
-from typing import List
+from typing import List, Optional
 from app.db.database import MongoClient
 from app.models.action import Action
 from bson import ObjectId
+from pymongo import ReturnDocument
 
 
 collection = "company"
@@ -10,12 +11,17 @@ collection = "company"
 class ActionRepository:
 
     @staticmethod
-    async def create(client: MongoClient, company_id: str, action: Action) -> bool:
-        result = await client.collection(collection).update_one(
+    async def create(client: MongoClient, company_id: str, action: Action) -> Optional[List[Action]]:
+        """
+        Push the action and return the company's updated actions, or None if the company does not exist.
+        """
+        doc = await client.collection(collection).find_one_and_update(
             {"_id": ObjectId(company_id)},
-            {"$push": {"actions": action.model_dump()}}
+            {"$push": {"actions": action.model_dump()}},
+            projection={'actions': 1, '_id': 0},
+            return_document=ReturnDocument.AFTER
         )
-        return result.modified_count > 0
+        return None if doc is None else [Action(**action) for action in doc.get('actions', [])]
 
     @staticmethod
     async def list(client: MongoClient, company_id: str) -> List[Action]:
@@ -23,10 +29,15 @@ class ActionRepository:
         return [Action(**action) async for doc in cursor for action in doc.get('actions', [])]
 
     @staticmethod
-    async def delete(client: MongoClient, company_id: str, action_id: str) -> bool:
+    async def delete(client: MongoClient, company_id: str, action_id: str) -> Optional[List[Action]]:
+        """
+        Pull the action and return the company's remaining actions, or None if no such action exists.
+        """
         # todo - on delete action delete all of its reminders
-        result = await client.collection(collection).update_one(
-            {'_id': ObjectId(company_id)},
-            {'$pull': {'actions': {'id': action_id}}}
+        doc = await client.collection(collection).find_one_and_update(
+            {'_id': ObjectId(company_id), 'actions.id': action_id},
+            {'$pull': {'actions': {'id': action_id}}},
+            projection={'actions': 1, '_id': 0},
+            return_document=ReturnDocument.AFTER
         )
-        return result.modified_count > 0
+        return None if doc is None else [Action(**action) for action in doc.get('actions', [])]
@@ -1,12 +1,24 @@
+from typing import Dict, List
 from app.db import MongoClient
-from app.models.changelog import Changelog
+from app.models.changelog import Changelog, ChangelogEntry
+from app.models.common import CursorPage
+from app.utils.pagination import find_page
 
 
 collection = "changelog"
 
+# Newest first, with _id breaking ties between logs written in the same millisecond
+PAGE_SORT = [("date", -1), ("_id", -1)]
+
 
 class ChangelogRepository:
 
     @staticmethod
-    async def insert(client: MongoClient, payload: Changelog) -> str | None:
-        return (await client.collection(collection).insert_one(payload.model_dump())).inserted_id
+    async def insert_many(client: MongoClient, payloads: List[Changelog]) -> int:
+        result = await client.collection(collection).insert_many([payload.model_dump() for payload in payloads], ordered=False)
+        return len(result.inserted_ids)
+
+    @staticmethod
+    async def page(client: MongoClient, filter: Dict, limit: int, cursor: str = "") -> CursorPage[ChangelogEntry]:
+        docs, next_cursor = await find_page(client.collection(collection), filter, PAGE_SORT, limit, cursor)
+        return CursorPage[ChangelogEntry](items=[ChangelogEntry(**doc) for doc in docs], next_cursor=next_cursor)
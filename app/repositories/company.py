@@ -1,26 +1,95 @@
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import AsyncIterator, List, Optional, Dict, Iterable, Set
 from bson import ObjectId
 from app.db.database import MongoClient
 from app.models.company import Company, CompanyBase
+from app.models.email import EmailSummary
 from app.models.common import FlexiblePyObjectDoc
-from pymongo.results import InsertManyResult
+from app.models.common import CursorPage
+from app.utils.pagination import with_keyset, split_page
+from app.utils.company.legal_name import legal_name_key
+from pymongo import UpdateOne, ReturnDocument
+from pymongo.results import InsertManyResult, BulkWriteResult
 
 collection = "company"
 
+# Stable keyset order for the company listing
+LISTING_SORT = [("legal_name", 1), ("_id", 1)]
+
 
 class CompanyRepository:
 
     @staticmethod
     async def create(client: MongoClient, company: Company) -> Company:
         company_dict = company.dict(exclude={"id"})
+        company_dict["legal_name_key"] = legal_name_key(company_dict["legal_name"])
         result = await client.collection(collection).insert_one(company_dict)
         company_dict["id"] = result.inserted_id
         return Company(**company_dict)
 
     @staticmethod
     async def create_many(client: MongoClient, companies: list) -> InsertManyResult:
-        return await client.collection(collection).insert_many(companies)
+        return await client.collection(collection).insert_many(companies, ordered=False)
+
+    @staticmethod
+    async def bulk_append_financials(client: MongoClient, appends: List[tuple]) -> BulkWriteResult:
+        """
+        Push one financials snapshot per (legal_name_key, financials) pair in a single unordered bulk write.
+        """
+        return await client.collection(collection).bulk_write(
+            [UpdateOne({"legal_name_key": key}, {"$push": {"financials": financials}}) for key, financials in appends],
+            ordered=False
+        )
+
+    @staticmethod
+    async def backfill_legal_name_keys(client: MongoClient, batch_size: int = 1000) -> int:
+        """
+        Set legal_name_key on companies that do not have one yet. Idempotent: once every company
+        has a key this is a single empty index lookup.
+        """
+        companies = client.collection(collection)
+        updated = 0
+        ops = []
+        async for doc in companies.find({"legal_name_key": {"$exists": False}}, {"legal_name": 1}):
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"legal_name_key": legal_name_key(doc.get("legal_name", ""))}}))
+            if len(ops) >= batch_size:
+                updated += (await companies.bulk_write(ops, ordered=False)).modified_count
+                ops = []
+        if ops:
+            updated += (await companies.bulk_write(ops, ordered=False)).modified_count
+        return updated
+
+    @staticmethod
+    async def find_existing_legal_name_keys(client: MongoClient, keys: Iterable[str]) -> Set[str]:
+        """
+        Return which of the given normalized legal names already exist, using the legal_name_key index.
+        """
+        cursor = client.collection(collection).find({"legal_name_key": {"$in": list(keys)}}, {"legal_name_key": 1, "_id": 0})
+        return {doc["legal_name_key"] async for doc in cursor}
+
+    @staticmethod
+    async def iter_recipients(client: MongoClient, contact_ids: List[str], company_ids: List[str]) -> AsyncIterator[tuple]:
+        """
+        Yield (company_id, legal_name, contact) for the given contacts plus every contact of the given
+        companies that has an email and does not have dont_bother set. Uses the contacts.id index.
+        """
+        wanted = set(contact_ids)
+        company_oids = {ObjectId(company_id) for company_id in company_ids}
+        clauses = []
+        if wanted:
+            clauses.append({"contacts.id": {"$in": list(wanted)}})
+        if company_oids:
+            clauses.append({"_id": {"$in": list(company_oids)}})
+        if not clauses:
+            return
+        cursor = client.collection(collection).find({"$or": clauses}, {"legal_name": 1, "contacts": 1})
+        async for doc in cursor:
+            whole_company = doc["_id"] in company_oids
+            for contact in doc.get("contacts") or []:
+                if not contact.get("email"):
+                    continue
+                if contact.get("id") in wanted or (whole_company and not contact.get("dont_bother")):
+                    yield doc["_id"], doc.get("legal_name"), contact
 
     @staticmethod
     async def list(client: MongoClient, skip: int = 0, limit: int = 10) -> List[CompanyBase]:
@@ -40,37 +109,57 @@ class CompanyRepository:
         }
 
     @staticmethod
-    async def get(client: MongoClient, company_id: str) -> Optional[Company]:
+    async def get_action_summary(client: MongoClient, company_id: str, action_id: str) -> Optional[FlexiblePyObjectDoc]:
+        """
+        Legal name plus `actions` holding only the matching action (empty if it no longer exists).
+        """
+        doc = await client.collection(collection).find_one(
+            {"_id": ObjectId(company_id)},
+            {"legal_name": 1, "actions": {"$elemMatch": {"id": action_id}}}
+        )
+        return FlexiblePyObjectDoc(**doc) if doc else None
+
+    @staticmethod
+    async def get_email_summary(client: MongoClient, company_id: str) -> Optional[EmailSummary]:
+        """
+        The email_summary kept on the company document; empty if it was never computed, None if the company does not exist.
+        """
+        doc = await client.collection(collection).find_one({"_id": ObjectId(company_id)}, {"email_summary": 1})
+        if doc is None:
+            return None
+        return EmailSummary(**(doc.get("email_summary") or {}))
+
+    @staticmethod
+    def _detail_projection() -> Dict:
         model_fields = Company.model_fields.keys()  # Ensure only model fields are included
         projection = {field: 1 for field in model_fields}
         projection["financials"] = {"$arrayElemAt": ["$financials", -1]}  # Get the latest financial entry
+        # Reformat the contacts array to use camelCase
+        projection["contacts"] = {
+            "$map": {
+                "input": "$contacts",
+                "as": "contact",
+                "in": {
+                    "id": "$$contact.id",
+                    "firstName": "$$contact.first_name",
+                    "lastName": "$$contact.last_name",
+                    "gender": "$$contact.gender",
+                    "email": "$$contact.email",
+                    "potential": "$$contact.potential",
+                    "dontBother": "$$contact.dont_bother",
+                    "phoneNumber": "$$contact.phone_number",
+                    "isPrimary": "$$contact.is_primary",
+                    "notes": "$$contact.notes",
+                },
+            }
+        }
+        return projection
 
+    @staticmethod
+    async def get(client: MongoClient, company_id: str) -> Optional[Company]:
         pipeline = [
             {"$match": {"_id": ObjectId(company_id)}},
-            {"$project": projection},
-            # Reformat the contacts array to use camelCase
-            {
-                "$addFields": {
-                    "contacts": {
-                        "$map": {
-                            "input": "$contacts",
-                            "as": "contact",
-                            "in": {
-                                "id": "$$contact.id",
-                                "firstName": "$$contact.first_name",
-                                "lastName": "$$contact.last_name",
-                                "gender": "$$contact.gender",
-                                "email": "$$contact.email",
-                                "potential": "$$contact.potential",
-                                "dontBother": "$$contact.dont_bother",
-                                "phoneNumber": "$$contact.phone_number",
-                                "isPrimary": "$$contact.is_primary",
-                                "notes": "$$contact.notes",
-                            },
-                        }
-                    }
-                }
-            },
+            {"$project": CompanyRepository._detail_projection()},
         ]
 
         company = [c async for c in client.collection(collection).aggregate(pipeline)]
@@ -78,6 +167,31 @@ class CompanyRepository:
             return Company(**company[0])  # Pydantic will handle serialization
         return None
 
+    @staticmethod
+    async def update_detail(client: MongoClient, company_id: str, updates: dict, financials: Optional[dict] = None) -> Optional[Company]:
+        """
+        Apply top-level field updates and an optional financials snapshot append in one
+        find_one_and_update, returning the company in its detail shape.
+        """
+        pipeline = []
+        if updates:
+            # Keep the import matching key in step with the legal name
+            if "legal_name" in updates:
+                updates = {**updates, "legal_name_key": legal_name_key(updates["legal_name"])}
+            pipeline.append({"$set": {k: {"$literal": v} for k, v in updates.items()}})
+        if financials is not None:
+            pipeline.extend(CompanyRepository._append_financials_pipeline(financials))
+        if not pipeline:
+            return await CompanyRepository.get(client, company_id)
+
+        doc = await client.collection(collection).find_one_and_update(
+            {"_id": ObjectId(company_id)},
+            pipeline,
+            projection=CompanyRepository._detail_projection(),
+            return_document=ReturnDocument.AFTER
+        )
+        return Company(**doc) if doc else None
+
 
     @staticmethod
     async def update(client: MongoClient, updates: dict, company_id: Optional[str] = None, legal_name: Optional[str] = None) -> bool:
@@ -87,53 +201,59 @@ class CompanyRepository:
             filter_criteria = {"legal_name": legal_name}
         else:
             raise ValueError("Either 'company_id' or 'legal_name' must be provided.")
+        # Keep the import matching key in step with the legal name
+        if "legal_name" in updates.get("$set", {}):
+            updates["$set"]["legal_name_key"] = legal_name_key(updates["$set"]["legal_name"])
         result = await client.collection(collection).update_one(filter_criteria, updates)
         return result.matched_count > 0
+
     @staticmethod
-    
-    @staticmethod
-    async def get_last_financials_snapshot(client: MongoClient, company_id: str) -> Optional[dict]:
+    def _append_financials_pipeline(partial_data: dict) -> List[Dict]:
         """
-        Returns the *last* snapshot in the 'financials' array, or None if empty.
+        Update pipeline appending a snapshot made of the last snapshot with the non-null fields of
+        `partial_data` merged over it. The merge runs server-side, so concurrent appends cannot
+        drop each other's fields.
         """
-        doc = await client.collection("company").find_one(
-            {"_id": ObjectId(company_id)},
-            {"financials": 1}
-        )
-        if not doc or "financials" not in doc or not doc["financials"]:
-            return None
-        # The last item
-        return doc["financials"][-1]
-    
+        now = datetime.utcnow().isoformat()
+        # $literal keeps string values such as "$5" from being read as field paths
+        changes = {k: {"$literal": v} for k, v in partial_data.items() if v is not None}
+        # Older documents may hold a single snapshot object instead of an array
+        history = {
+            "$cond": [
+                {"$isArray": "$financials"},
+                "$financials",
+                {"$cond": [{"$eq": [{"$type": "$financials"}, "object"]}, ["$financials"], []]}
+            ]
+        }
+        merged = {"$mergeObjects": [{"$ifNull": [{"$arrayElemAt": ["$$history", -1]}, {}]}, changes]}
+        return [
+            {
+                "$set": {
+                    "financials": {
+                        "$let": {
+                            "vars": {"history": history},
+                            "in": {
+                                "$concatArrays": ["$$history", [{
+                                    "$let": {
+                                        "vars": {"merged": merged},
+                                        "in": {"$mergeObjects": ["$$merged", {
+                                            "timestamp": {"$ifNull": ["$$merged.timestamp", now]},
+                                            "datetime": now,
+                                        }]}
+                                    }
+                                }]]
+                            }
+                        }
+                    }
+                }
+            }
+        ]
+
     @staticmethod
     async def append_financials_snapshot(client: MongoClient, company_id: str, partial_data: dict) -> bool:
-        # 1) Load the last snapshot
-        last_snapshot = await CompanyRepository.get_last_financials_snapshot(client, company_id)
-
-        # 2) If there's no existing snapshot, start from an empty dict
-        if not last_snapshot:
-            last_snapshot = {}
-
-        # 3) Make a copy to avoid mutating the old snapshot
-        new_snapshot = {**last_snapshot}
-
-        # 4) Merge only the non-null fields from partial_data
-        for k, v in partial_data.items():
-            if v is not None:
-                new_snapshot[k] = v
-        # That way, if partial_data had "checking_account": None, it won't overwrite the old value.
-
-        # 5) Ensure a timestamp
-        if "timestamp" not in new_snapshot or new_snapshot["timestamp"] is None:
-            new_snapshot["timestamp"] = datetime.utcnow().isoformat()
-
-        # Optionally store "datetime" or any other field
-        new_snapshot["datetime"] = datetime.utcnow().isoformat()
-
-        # 6) Append this new snapshot
-        result = await client.collection("company").update_one(
+        result = await client.collection(collection).update_one(
             {"_id": ObjectId(company_id)},
-            {"$push": {"financials": new_snapshot}}
+            CompanyRepository._append_financials_pipeline(partial_data)
         )
         return result.modified_count > 0
 
@@ -143,91 +263,87 @@ class CompanyRepository:
         return result.deleted_count > 0
 
     @staticmethod
-    async def list_with_latest_email(client: MongoClient, skip: int = 0, limit: int = 10) -> List[CompanyBase]:
-        pipeline = [
-            # Join emails with companies
-            {
-                "$lookup": {
-                    "from": "emails",
-                    "localField": "_id",
-                    "foreignField": "company_id",
-                    "as": "emails"
-                }
-            },
-            # Sort emails by datetime in descending order
-            {
-                "$addFields": {
-                    "emails": {"$sortArray": {"input": "$emails", "sortBy": {"datetime": -1}}}
-                }
-            },
-            # Add latest email details
-            {
-                "$addFields": {
-                    "latest_email_datetime": {"$ifNull": [{"$arrayElemAt": ["$emails.datetime", 0]}, None]},
-                    "latest_email_template": {"$ifNull": [{"$arrayElemAt": ["$emails.template", 0]}, None]}
-                }
-            },
-            # Project all required fields for CompanyBase
-            {
-                "$project": {
-                    "_id": 1,
-                    "legal_name": 1,
-                    "is_active": 1,
-                    "is_existing_client": 1,
-                    "addedDate": 1,
-                    "financials": {"$arrayElemAt": ["$financials", -1]},  # Get the latest financial entry
-                    "contacts": 1,
-                    "contact_name": {
-                        "$reduce": {
-                            "input": {
-                                "$map": {
-                                    "input": {
-                                        "$filter": {
-                                            "input": "$contacts",
-                                            "as": "contact",
-                                            "cond": {
-                                                "$and": [
-                                                    {"$ne": ["$$contact.first_name", ""]},
-                                                    {"$ne": ["$$contact.first_name", None]},
-                                                    {"$ne": ["$$contact.last_name", ""]},
-                                                    {"$ne": ["$$contact.last_name", None]},
-                                                    {"$ne": ["$$contact.email", ""]},
-                                                    {"$ne": ["$$contact.email", None]}
-                                                ]
-                                            }
+    def _listing_projection() -> Dict:
+        # Project all required fields for CompanyBase
+        return {
+            "$project": {
+                "_id": 1,
+                "legal_name": 1,
+                "is_active": 1,
+                "is_existing_client": 1,
+                "addedDate": 1,
+                "financials": {"$arrayElemAt": ["$financials", -1]},  # Get the latest financial entry
+                "contacts": 1,
+                "contact_name": {
+                    "$reduce": {
+                        "input": {
+                            "$map": {
+                                "input": {
+                                    "$filter": {
+                                        "input": "$contacts",
+                                        "as": "contact",
+                                        "cond": {
+                                            "$and": [
+                                                {"$ne": ["$$contact.first_name", ""]},
+                                                {"$ne": ["$$contact.first_name", None]},
+                                                {"$ne": ["$$contact.last_name", ""]},
+                                                {"$ne": ["$$contact.last_name", None]},
+                                                {"$ne": ["$$contact.email", ""]},
+                                                {"$ne": ["$$contact.email", None]}
+                                            ]
                                         }
-                                    },
-                                    "as": "contact",
-                                    "in": {
-                                        "$concat": [
-                                            "$$contact.first_name",
-                                            " ",
-                                            "$$contact.last_name"
-                                        ]
                                     }
+                                },
+                                "as": "contact",
+                                "in": {
+                                    "$concat": [
+                                        "$$contact.first_name",
+                                        " ",
+                                        "$$contact.last_name"
+                                    ]
                                 }
-                            },
-                            "initialValue": "",
-                            "in": {
-                                "$cond": {
-                                    "if": {"$eq": ["$$value", ""]},
-                                    "then": "$$this",
-                                    "else": {
-                                        "$concat": ["$$value", ", ", "$$this"]
-                                    }
+                            }
+                        },
+                        "initialValue": "",
+                        "in": {
+                            "$cond": {
+                                "if": {"$eq": ["$$value", ""]},
+                                "then": "$$this",
+                                "else": {
+                                    "$concat": ["$$value", ", ", "$$this"]
                                 }
                             }
                         }
-                    },
-                    "latest_email_datetime": {"$dateToString": {"format": "%Y-%m-%dT%H:%M:%S.%LZ", "date": "$latest_email_datetime"}},
-                    "latest_email_template": 1
-                }
-            },
-            # Pagination
+                    }
+                },
+                # Latest email details come from the summary maintained by EmailRepository
+                "latest_email_datetime": {"$dateToString": {"format": "%Y-%m-%dT%H:%M:%S.%LZ", "date": "$email_summary.latest_datetime"}},
+                "latest_email_template": "$email_summary.latest_template",
+                "email_summary": 1
+            }
+        }
+
+    @staticmethod
+    async def list_with_latest_email(client: MongoClient, skip: int = 0, limit: int = 10) -> List[CompanyBase]:
+        pipeline = [
+            # Paginate first so the projection below only runs for the requested page
             {"$skip": skip},
-            {"$limit": limit}
+            {"$limit": limit},
+            CompanyRepository._listing_projection(),
         ]
 
         return [
             CompanyBase(**doc) async for doc in client.collection(collection).aggregate(pipeline)
         ]
+
+    @staticmethod
+    async def page_with_latest_email(client: MongoClient, limit: int = 10, cursor: str = "") -> CursorPage[CompanyBase]:
+        pipeline = [
+            {"$match": with_keyset(None, LISTING_SORT, cursor)},
+            {"$sort": dict(LISTING_SORT)},
+            {"$limit": limit + 1},
+            CompanyRepository._listing_projection(),
+        ]
+        docs = await client.collection(collection).aggregate(pipeline).to_list(None)
+        docs, next_cursor = split_page(docs, LISTING_SORT, limit)
+        return CursorPage[CompanyBase](items=[CompanyBase(**doc) for doc in docs], next_cursor=next_cursor)
@@ -1,22 +1,77 @@
-from typing import List
+from typing import List, Iterable, Dict
 from bson import ObjectId
+from pymongo import UpdateOne
 from app.db.database import MongoClient
-from app.models.email import Email
+from app.models.email import Email, EmailBase, EmailSummary
+from app.models.common import CursorPage
+from app.utils.pagination import find_page
 
 collection = "emails"
+company_collection = "company"
+
+# Stable keyset order for email pages
+PAGE_SORT = [("_id", 1)]
+# Newest-first order of a company's email history, backed by the (company_id, datetime, _id) index
+COMPANY_PAGE_SORT = [("datetime", -1), ("_id", -1)]
+
+# Email fields that feed the per-company email_summary
+SUMMARY_FIELDS = {"company_id", "datetime", "template", "sent", "answered"}
+
+
+def _email_from_doc(doc: Dict) -> Email:
+    return Email(**{**doc, "id": str(doc["_id"]), "company_id": str(doc["company_id"])})
+
+
+def email_to_doc(email: EmailBase) -> Dict:
+    """
+    Storage shape of a validated email: no id field and company_id as an ObjectId.
+    """
+    email_dict = email.model_dump(exclude={"id"})
+    email_dict["company_id"] = ObjectId(email_dict["company_id"])
+    return email_dict
+
+
+def _summary_pipeline(match: Dict) -> List[Dict]:
+    """
+    Group the matched emails by company into the EmailSummary shape.
+    Backed by the (company_id, datetime, _id) index.
+    """
+    return [
+        {"$match": match},
+        {"$sort": {"company_id": 1, "datetime": -1}},
+        {
+            "$group": {
+                "_id": "$company_id",
+                "latest_datetime": {"$first": "$datetime"},
+                "latest_template": {"$first": "$template"},
+                "count": {"$sum": 1},
+                "sent_count": {"$sum": {"$cond": [{"$ifNull": ["$sent", False]}, 1, 0]}},
+                "answered_count": {"$sum": {"$cond": [{"$ifNull": ["$answered", False]}, 1, 0]}},
+            }
+        },
+    ]
 
 
 class EmailRepository:
 
     @staticmethod
     async def create(client: MongoClient, email: Email) -> Email:
-        # Convert company_id from string to ObjectId for insertion
-        email_dict = email.dict(exclude={"id"})
-        email_dict["company_id"] = ObjectId(email_dict["company_id"])  # Convert to ObjectId
+        email_dict = email_to_doc(email)
         result = await client.collection(collection).insert_one(email_dict)
-        email_dict["id"] = str(result.inserted_id)  # Add the inserted ID as a string
-        email_dict["company_id"] = str(email_dict["company_id"])  # Convert ObjectId back to string for the response
-        return Email(**email_dict)  # Use Pydantic to validate the returned data
+        await EmailRepository.refresh_company_summaries(client, [email_dict["company_id"]])
+        # The input is already validated, only the generated id changes
+        return email.model_copy(update={"id": str(result.inserted_id)})
+
+    @staticmethod
+    async def create_many(client: MongoClient, email_docs: List[Dict]) -> List[ObjectId]:
+        """
+        Insert ready-made email documents in one unordered insert_many. The caller refreshes the
+        company summaries once its batch is complete, see refresh_company_summaries.
+        """
+        if not email_docs:
+            return []
+        result = await client.collection(collection).insert_many(email_docs, ordered=False)
+        return result.inserted_ids
 
     @staticmethod
     async def list(client: MongoClient, skip: int = 0, limit: int = 10) -> List[Email]:
@@ -46,20 +101,90 @@ class EmailRepository:
         # Convert company_id in updates if it exists
         if "company_id" in updates:
             updates["company_id"] = ObjectId(updates["company_id"])
-        result = await client.collection(collection).update_one({"_id": ObjectId(email_id)}, {"$set": updates})
-        return result.matched_count > 0
+        # The pre-image tells us which company the email belonged to before a possible move
+        previous = await client.collection(collection).find_one_and_update(
+            {"_id": ObjectId(email_id)},
+            {"$set": updates},
+            projection={"company_id": 1}
+        )
+        if previous is None:
+            return False
+        if SUMMARY_FIELDS & updates.keys():
+            await EmailRepository.refresh_company_summaries(
+                client, [previous.get("company_id"), updates.get("company_id")]
+            )
+        return True
 
     @staticmethod
     async def delete(client: MongoClient, email_id: str) -> bool:
-        result = await client.collection(collection).delete_one({"_id": ObjectId(email_id)})
-        return result.deleted_count > 0
+        deleted = await client.collection(collection).find_one_and_delete(
+            {"_id": ObjectId(email_id)},
+            projection={"company_id": 1}
+        )
+        if deleted is None:
+            return False
+        await EmailRepository.refresh_company_summaries(client, [deleted.get("company_id")])
+        return True
 
     @staticmethod
     async def get_emails_by_company_id(client: MongoClient, company_id: str, skip: int = 0, limit: int = 10) -> List[Email]:
         # Convert `company_id` to `ObjectId` for querying MongoDB
-        documents = client.collection(collection).find({"company_id": ObjectId(company_id)}).skip(skip).limit(limit)
+        documents = client.collection(collection).find({"company_id": ObjectId(company_id)}).sort(COMPANY_PAGE_SORT).skip(skip).limit(limit)
         emails = [
             Email(**{**doc, "id": str(doc["_id"]), "company_id": str(doc["company_id"])})
             async for doc in documents
         ]
         return emails
+
+    @staticmethod
+    async def page(client: MongoClient, limit: int = 10, cursor: str = "") -> CursorPage[Email]:
+        docs, next_cursor = await find_page(client.collection(collection), None, PAGE_SORT, limit, cursor)
+        return CursorPage[Email](items=[_email_from_doc(doc) for doc in docs], next_cursor=next_cursor)
+
+    @staticmethod
+    async def page_by_company_id(client: MongoClient, company_id: str, limit: int = 10, cursor: str = "") -> CursorPage[Email]:
+        docs, next_cursor = await find_page(
+            client.collection(collection), {"company_id": ObjectId(company_id)}, COMPANY_PAGE_SORT, limit, cursor
+        )
+        return CursorPage[Email](items=[_email_from_doc(doc) for doc in docs], next_cursor=next_cursor)
+
+    @staticmethod
+    async def refresh_company_summaries(client: MongoClient, company_ids: Iterable) -> None:
+        """
+        Recompute the email_summary of the given companies in one aggregation plus one bulk write.
+        Companies left without emails are reset to an empty summary.
+        """
+        ids = list({ObjectId(company_id) for company_id in company_ids if company_id is not None})
+        if not ids:
+            return
+        summaries = {
+            doc.pop("_id"): doc
+            async for doc in client.collection(collection).aggregate(_summary_pipeline({"company_id": {"$in": ids}}))
+        }
+        empty = EmailSummary().model_dump()
+        await client.collection(company_collection).bulk_write(
+            [UpdateOne({"_id": company_id}, {"$set": {"email_summary": summaries.get(company_id, empty)}}) for company_id in ids],
+            ordered=False
+        )
+
+    @staticmethod
+    async def backfill_company_summaries(client: MongoClient) -> None:
+        """
+        Rebuild email_summary for every company. Every summary is reset first, so companies whose
+        emails were all deleted end up empty; companies with emails are then merged server-side.
+        """
+        await client.collection(company_collection).update_many(
+            {},
+            {"$set": {"email_summary": EmailSummary().model_dump()}}
+        )
+        pipeline = _summary_pipeline({}) + [
+            {"$project": {"_id": 1, "email_summary": {
+                "latest_datetime": "$latest_datetime",
+                "latest_template": "$latest_template",
+                "count": "$count",
+                "sent_count": "$sent_count",
+                "answered_count": "$answered_count",
+            }}},
+            {"$merge": {"into": company_collection, "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}},
+        ]
+        await client.collection(collection).aggregate(pipeline).to_list(None)
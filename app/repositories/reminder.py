@@ -1,9 +1,16 @@
 from app.db import MongoClient
 from app.models.reminder import Reminder
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from bson import ObjectId
+from datetime import datetime
+from pymongo import ReturnDocument
+from app.utils.pagination import with_keyset, split_page
 
 collection = "reminders"
+company_collection = "company"
+
+# Reminder pages are ordered by due date, _id breaks ties; backed by the (completed, due_date, _id) index
+PAGE_SORT = [("due_date", 1), ("_id", 1)]
 
 class ReminderRepository:
     @staticmethod
@@ -46,6 +53,104 @@ class ReminderRepository:
         docs = client.collection(collection).find(_filter).limit(limit)
         return [Reminder(**doc) async for doc in docs]
 
+    @staticmethod
+    async def list_upcoming(client: MongoClient, after: datetime, limit: int) -> List[Reminder]:
+        """
+        Open reminders due after `after`, soonest first.
+        """
+        docs = client.collection(collection).find({"completed": False, "due_date": {"$gt": after}}).sort(PAGE_SORT).limit(limit)
+        return [Reminder(**doc) async for doc in docs]
+
+    @staticmethod
+    async def summary(client: MongoClient, now: datetime, end_of_day: datetime, max_companies: int) -> Dict:
+        """
+        Open reminder counts (overdue, due today, upcoming) overall and per company in one $facet aggregation.
+        The leading $match uses the (completed, due_date, _id) index.
+        """
+        counts = {
+            "overdue": {"$sum": {"$cond": [{"$lt": ["$due_date", now]}, 1, 0]}},
+            "due_today": {"$sum": {"$cond": [{"$and": [{"$gte": ["$due_date", now]}, {"$lt": ["$due_date", end_of_day]}]}, 1, 0]}},
+            "upcoming": {"$sum": {"$cond": [{"$gte": ["$due_date", end_of_day]}, 1, 0]}},
+        }
+        pipeline = [
+            {"$match": {"completed": False}},
+            {"$project": {"_id": 0, "company_id": 1, "due_date": 1}},
+            {
+                "$facet": {
+                    "totals": [{"$group": {"_id": None, **counts}}],
+                    "by_company": [
+                        {"$group": {"_id": "$company_id", **counts}},
+                        {"$sort": {"overdue": -1, "due_today": -1, "upcoming": -1, "_id": 1}},
+                        {"$limit": max_companies},
+                        {
+                            "$lookup": {
+                                "from": company_collection,
+                                "let": {"company_id": {"$convert": {"input": "$_id", "to": "objectId", "onError": None, "onNull": None}}},
+                                "pipeline": [
+                                    {"$match": {"$expr": {"$eq": ["$_id", "$$company_id"]}}},
+                                    {"$project": {"_id": 0, "legal_name": 1}},
+                                ],
+                                "as": "company",
+                            }
+                        },
+                        {"$project": {
+                            "_id": 0,
+                            "company_id": "$_id",
+                            "company_name": {"$arrayElemAt": ["$company.legal_name", 0]},
+                            "overdue": 1,
+                            "due_today": 1,
+                            "upcoming": 1,
+                        }},
+                    ],
+                }
+            },
+        ]
+        result = await client.collection(collection).aggregate(pipeline).to_list(None)
+        facets = result[0] if result else {}
+        totals = facets.get("totals") or [{}]
+        return {**totals[0], "by_company": facets.get("by_company", [])}
+
+    @staticmethod
+    async def page_with_company(client: MongoClient, limit: int, cursor: str = "", filter: Optional[Dict] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        One aggregation returning a page of reminders, each with `company` set to the company's
+        legal_name and the single action the reminder points at (resolved server-side with $filter).
+        `company` is missing when the company no longer exists.
+        """
+        pipeline = [
+            {"$match": with_keyset(filter, PAGE_SORT, cursor)},
+            {"$sort": dict(PAGE_SORT)},
+            {"$limit": limit + 1},
+            {
+                "$lookup": {
+                    "from": company_collection,
+                    "let": {
+                        "company_id": {"$convert": {"input": "$company_id", "to": "objectId", "onError": None, "onNull": None}},
+                        "action_id": "$action_id",
+                    },
+                    "pipeline": [
+                        {"$match": {"$expr": {"$eq": ["$_id", "$$company_id"]}}},
+                        {
+                            "$project": {
+                                "_id": 0,
+                                "legal_name": 1,
+                                "action": {
+                                    "$arrayElemAt": [
+                                        {"$filter": {"input": "$actions", "as": "action", "cond": {"$eq": ["$$action.id", "$$action_id"]}}},
+                                        0
+                                    ]
+                                },
+                            }
+                        },
+                    ],
+                    "as": "company",
+                }
+            },
+            {"$unwind": {"path": "$company", "preserveNullAndEmptyArrays": True}},
+        ]
+        docs = await client.collection(collection).aggregate(pipeline).to_list(None)
+        return split_page(docs, PAGE_SORT, limit)
+
     # NEW: partial update by reminderId
     @staticmethod
     async def update_partial(client: MongoClient, reminder_id: str, updates: Dict) -> Optional[Reminder]:
@@ -53,35 +158,15 @@ class ReminderRepository:
         Perform a partial update on the reminder identified by `reminder_id`,
         returning the updated document as a Reminder object.
         """
-        # Map front-end fields to DB fields if needed.
-        # For example, 'dueDate' -> 'due_date', 'isCompleted' -> 'completed'
-        field_map = {
-            "dueDate": "due_date",
-            "isCompleted": "completed",
-            # If you want to allow partial updates of 'companyId', 'actionId', etc.,
-            # you can add them here as well.
-            "companyId": "company_id",
-            "actionId": "action_id",
-        }
-
-        update_doc = {}
-        for key, value in updates.items():
-            mapped_key = field_map.get(key)
-            if mapped_key:
-                update_doc[mapped_key] = value
-
-        if not update_doc:
+        # `updates` holds validated DB fields, see UpdateReminderPayload
+        if not updates:
             # No valid fields to update
             return None
 
-        res = await client.collection(collection).update_one(
+        # Update and read back in one round trip; None means the reminder was not found
+        updated_doc = await client.collection(collection).find_one_and_update(
             {"_id": ObjectId(reminder_id)},
-            {"$set": update_doc}
+            {"$set": updates},
+            return_document=ReturnDocument.AFTER
         )
-        # If no reminder was modified (i.e., reminder not found), return None
-        if res.matched_count == 0:
-            return None
-
-        # Now, fetch the updated doc
-        updated_doc = await client.collection(collection).find_one({"_id": ObjectId(reminder_id)})
         return Reminder(**updated_doc) if updated_doc else None
@@ -4,6 +4,7 @@ from .action import router as action_router
 from .contact import router as contact_router
 from .reminder import router as reminder_router
 from .email import router as email_router
+from .changelog import router as changelog_router
 
 
 router = APIRouter(
@@ -15,3 +16,4 @@ router.include_router(action_router)
 router.include_router(contact_router)
 router.include_router(reminder_router)
 router.include_router(email_router)
+router.include_router(changelog_router)
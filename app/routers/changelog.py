@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query
+from datetime import datetime
+from typing import Optional
+from app.db import MongoClient, get_mongo_client
+from app.enums.operation import LogType
+from app.models.changelog import ChangelogEntry
+from app.models.common import CursorPage
+from app.services.change_log import ChangelogService
+
+
+router = APIRouter(
+    prefix="/changelog",
+    tags=["Changelog"]
+)
+
+
+@router.get("", response_model=CursorPage[ChangelogEntry])
+async def list_changelog(
+    operation: Optional[LogType] = Query(None),
+    company_id: Optional[str] = Query(None, alias="companyId"),
+    user: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str = Query(""),
+    client: MongoClient = Depends(get_mongo_client)
+):
+    """
+    Newest-first changelog entries, optionally filtered by operation, company, user and [from, to) date range.
+    Pass the returned nextCursor as `cursor` to get the following page.
+    """
+    return await ChangelogService.list_logs(client, limit, cursor, operation, company_id, user, date_from, date_to)
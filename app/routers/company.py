@@ -1,22 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from typing import List, Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
+from typing import List, Dict, Optional
 from app.models.company import Company, CompanyBase
+from app.models.common import CursorPage
+from app.models.imports import ImportJob
 from app.services.company import CompanyService
 from .dependencies import get_company_service
 from app.db import MongoClient, get_mongo_client
 from app.models.payloads import UpdateCompanyPayload
+from app.utils.fast_json import FAST_JSON, model_response
+from pydantic import TypeAdapter
 
 router = APIRouter(prefix="/companies", tags=["companies"])
 
+# FAST_JSON read paths render the repository models directly, see model_response
+company_adapter = TypeAdapter(Company)
+company_list_adapter = TypeAdapter(List[CompanyBase])
+company_page_adapter = TypeAdapter(CursorPage[CompanyBase])
+
 
 @router.post("/", response_model=Company)
 async def create_company(company: Company, service: CompanyService = Depends(get_company_service), client: MongoClient = Depends(get_mongo_client)):
     return await service.create_company(client, company)
 
 
-@router.get("/", response_model=List[CompanyBase])
-async def list_companies(skip: int = 0, limit: int = 10, service: CompanyService = Depends(get_company_service), client: MongoClient = Depends(get_mongo_client)):
-    return await service.list_companies_with_latest_email(client, skip, limit)
+@router.get("/", response_model=List[CompanyBase] | CursorPage[CompanyBase])
+async def list_companies(skip: int = Query(0, ge=0), limit: int = Query(10, ge=1, le=100), cursor: Optional[str] = None, service: CompanyService = Depends(get_company_service), client: MongoClient = Depends(get_mongo_client)):
+    # Passing `cursor` (empty for the first page) switches to keyset pagination ordered by (legal_name, _id)
+    if cursor is not None:
+        page = await service.page_companies_with_latest_email(client, limit, cursor)
+        return model_response(company_page_adapter, page) if FAST_JSON else page
+    companies = await service.list_companies_with_latest_email(client, skip, limit)
+    return model_response(company_list_adapter, companies) if FAST_JSON else companies
 
 
 @router.get("/{company_id}", response_model=Company)
@@ -24,7 +38,7 @@ async def get_company(company_id: str, service: CompanyService = Depends(get_com
     company = await service.get_company(client, company_id)
     if company is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company not found")
-    return company
+    return model_response(company_adapter, company) if FAST_JSON else company
 
 
 @router.patch("/{company_id}", response_model=Company)
@@ -43,6 +57,14 @@ async def delete_company(company_id: str, service: CompanyService = Depends(get_
     return {"message": "Company deleted successfully"}
 
 
-@router.post("/import", status_code=status.HTTP_201_CREATED, response_model=List[CompanyBase])
+@router.post("/import", status_code=status.HTTP_202_ACCEPTED, response_model=ImportJob)
 async def import_companies(file: UploadFile = File(...), service: CompanyService = Depends(get_company_service), client: MongoClient = Depends(get_mongo_client)):
     return await service.import_companies(client, file)
+
+
+@router.get("/import/{job_id}", response_model=ImportJob)
+async def get_import_job(job_id: str, service: CompanyService = Depends(get_company_service)):
+    job = service.get_import_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return job
@@ -1,28 +1,45 @@
 # routers/email.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Any, List, Optional
 from app.models.email import Email
+from app.models.common import CursorPage
 from app.services.email import EmailService
 from .dependencies import get_email_service
 from app.db import MongoClient, get_mongo_client
-from fastapi.responses import FileResponse
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.image import MIMEImage
-import base64
-from pathlib import Path
-from models.email import EmlRequest
+from fastapi import Body, Response
+from fastapi.responses import StreamingResponse
+from app.models.email import EmlRequest, EmlBatchRequest, EmailSummary, CompanyEmailPage, EmailBulkResult
+from app.utils.email.eml_util import generate_eml_bytes
+from app.utils.fast_json import FAST_JSON, model_response
+from pydantic import TypeAdapter
 
 
 router = APIRouter(prefix="/emails", tags=["emails"])
 
+# FAST_JSON read paths render the repository models directly, see model_response
+email_list_adapter = TypeAdapter(List[Email])
+email_page_adapter = TypeAdapter(CursorPage[Email])
+company_email_page_adapter = TypeAdapter(CompanyEmailPage)
+
 @router.post("/", response_model=Email)
 async def create_email(email: Email, service: EmailService = Depends(get_email_service), client: MongoClient = Depends(get_mongo_client)):
     return await service.create_email(client, email)
 
-@router.get("/", response_model=List[Email])
-async def list_emails(skip: int = 0, limit: int = 10, service: EmailService = Depends(get_email_service), client: MongoClient = Depends(get_mongo_client)):
-    return await service.list_emails(client, skip, limit)
+@router.post("/bulk", response_model=EmailBulkResult)
+async def create_emails_bulk(items: List[Any] = Body(...), service: EmailService = Depends(get_email_service), client: MongoClient = Depends(get_mongo_client)):
+    """
+    Record many emails at once. Items are validated individually; invalid ones are reported by index
+    and do not prevent the others from being written.
+    """
+    return await service.create_emails_bulk(client, items)
+
+@router.get("/", response_model=List[Email] | CursorPage[Email])
+async def list_emails(skip: int = Query(0, ge=0), limit: int = Query(10, ge=1, le=100), cursor: Optional[str] = None, service: EmailService = Depends(get_email_service), client: MongoClient = Depends(get_mongo_client)):
+    if cursor is not None:
+        page = await service.page_emails(client, limit, cursor)
+        return model_response(email_page_adapter, page) if FAST_JSON else page
+    emails = await service.list_emails(client, skip, limit)
+    return model_response(email_list_adapter, emails) if FAST_JSON else emails
 
 @router.get("/{email_id}", response_model=Email)
 async def get_email(email_id: str, service: EmailService = Depends(get_email_service), client: MongoClient = Depends(get_mongo_client)):
@@ -45,62 +62,52 @@ async def delete_email(email_id: str, service: EmailService = Depends(get_email_
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Email not found")
     return {"message": "Email deleted successfully"}
 
-@router.get("/company/{company_id}", response_model=List[Email])
+@router.get("/company/{company_id}", response_model=List[Email] | CompanyEmailPage)
 async def get_emails_by_company_id(
     company_id: str,
-    skip: int = 0,
-    limit: int = 10,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
     service: EmailService = Depends(get_email_service),
     client: MongoClient = Depends(get_mongo_client)
 ):
+    if cursor is not None:
+        page = await service.page_emails_by_company_id(client, company_id, limit, cursor)
+        return model_response(company_email_page_adapter, page) if FAST_JSON else page
     emails = await service.get_emails_by_company_id(client, company_id, skip, limit)
-    return emails
+    return model_response(email_list_adapter, emails) if FAST_JSON else emails
+
+@router.get("/company/{company_id}/stats", response_model=EmailSummary)
+async def get_company_email_stats(company_id: str, service: EmailService = Depends(get_email_service), client: MongoClient = Depends(get_mongo_client)):
+    stats = await service.get_company_email_stats(client, company_id)
+    if stats is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company not found")
+    return stats
 
 @router.post("/generate-eml/")
 async def generate_eml(request: EmlRequest):
     try:
-        print("Received payload:", request)  # Log payload
-        # Extract request data
-        subject = request.subject
-        to_email = request.to_email
-        html_body = request.html_body
-        images = request.images
-
-        # Debug print image base64 data
-        print(f"Number of images: {len(images)}")
-        for idx, image in enumerate(images):
-            print(f"Image {idx}: {image[:30]}...")  # Print the first 30 characters of the base64 string
-
-        # Existing logic
-        msg = MIMEMultipart("related")
-        msg["Subject"] = subject
-        msg["To"] = to_email
-        msg["From"] = "sender@example.com"
-
-        # Add HTML content
-        html_content = MIMEText(html_body, "html")
-        msg.attach(html_content)
-
-        # Attach inline images
-        for idx, image_base64 in enumerate(images):
-            try:
-                img_data = base64.b64decode(image_base64)
-                mime_img = MIMEImage(img_data)
-                mime_img.add_header("Content-ID", f"<image{idx}>")
-                mime_img.add_header("Content-Disposition", "inline", filename=f"image{idx}.png")
-                msg.attach(mime_img)
-            except Exception as e:
-                print(f"Error decoding image {idx}: {e}")
-                raise HTTPException(status_code=400, detail=f"Invalid image data at index {idx}")
-
-        # Write the .eml file
-        eml_path = Path("output_email.eml")
-        with eml_path.open("wb") as f:
-            f.write(msg.as_bytes())
-
-        print("EML file generated successfully.")
-        return FileResponse(eml_path, filename="generated_email.eml")
-
+        content = await generate_eml_bytes(request)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error generating EML: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    return Response(
+        content=content,
+        media_type="message/rfc822",
+        headers={"Content-Disposition": 'attachment; filename="generated_email.eml"'}
+    )
+
+
+@router.post("/generate-eml/batch")
+async def generate_eml_batch(request: EmlBatchRequest, service: EmailService = Depends(get_email_service), client: MongoClient = Depends(get_mongo_client)):
+    """
+    One EML per recipient, streamed back as a zip while the matching Email documents are recorded.
+    """
+    stream = await service.generate_campaign(client, request)
+    return StreamingResponse(
+        stream,
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="campaign.zip"'}
+    )
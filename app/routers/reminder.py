@@ -1,10 +1,15 @@
 from fastapi import APIRouter, Depends, Query, HTTPException, status, Path
 from app.db import MongoClient, get_mongo_client
-from app.models.reminder import ReminderDisplay, ReminderBase, Reminder
+from app.models.reminder import ReminderDisplay, ReminderBase, Reminder, ReminderSummary
 from app.services.reminder import ReminderService
+from app.services.reminder_scheduler import reminder_scheduler, sse_notifier
+from fastapi.responses import StreamingResponse
 from typing import Optional, List
+from datetime import datetime
+from app.enums.reminder import ReminderWindow
 from .dependencies import get_company_service
-from app.models.payloads import CreateReminderPayload
+from app.models.payloads import CreateReminderPayload, UpdateReminderPayload
+from app.models.common import CursorPage
 
 router = APIRouter(
     prefix="/reminders",
@@ -12,13 +17,43 @@ router = APIRouter(
 )
 
 
-@router.get("", response_model=List[ReminderDisplay])
+@router.get("", response_model=List[ReminderDisplay] | CursorPage[ReminderDisplay])
 async def list_reminders(
-    limit: Optional[int] = Query(20), 
-    client: MongoClient = Depends(get_mongo_client),
-    company_service = Depends(get_company_service)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    state: Optional[ReminderWindow] = Query(None),
+    client: MongoClient = Depends(get_mongo_client)
 ):
-    return await ReminderService.list_reminders_with_company(client, company_service, limit)
+    """
+    Open reminders ordered by due date, optionally limited to a [from, to) window and to
+    overdue or upcoming ones. Pass `cursor` (empty for the first page) to page with nextCursor.
+    """
+    if cursor is not None:
+        return await ReminderService.page_reminders_with_company(client, limit, cursor, date_from, date_to, state)
+    return await ReminderService.list_reminders_with_company(client, limit, date_from, date_to, state)
+
+
+@router.get("/summary", response_model=ReminderSummary)
+async def reminder_summary(client: MongoClient = Depends(get_mongo_client)):
+    """
+    Open reminder counts per state, overall and per company, for the dashboard header.
+    """
+    return await ReminderService.summary(client)
+
+
+@router.get("/stream")
+async def stream_due_reminders():
+    """
+    Server-sent events for reminders as they come due (requires the "sse" reminder notifier).
+    """
+    if not reminder_scheduler.running or sse_notifier not in reminder_scheduler.notifiers:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reminder stream is not enabled."
+        )
+    return StreamingResponse(sse_notifier.subscribe(), media_type="text/event-stream")
 
 
 @router.post("", response_model=Reminder, status_code=status.HTTP_201_CREATED)
@@ -57,7 +92,7 @@ async def complete_reminder(
 @router.patch("/{reminder_id}", response_model=ReminderDisplay)
 async def update_reminder(
     reminder_id: str,
-    updates: dict,  # read raw JSON body as dict
+    payload: UpdateReminderPayload,
     client: MongoClient = Depends(get_mongo_client),
     company_service=Depends(get_company_service)
 ):
@@ -65,7 +100,8 @@ async def update_reminder(
     Partially update the reminder (e.g. dueDate, isCompleted).
     Returns the updated object as a ReminderDisplay.
     """
-    updated_reminder = await ReminderService.update_partial(client, reminder_id, updates)
+    # Malformed fields (e.g. an unparseable dueDate) are rejected with 422 by the payload model
+    updated_reminder = await ReminderService.update_partial(client, reminder_id, payload.model_dump(exclude_none=True))
     if not updated_reminder:
         raise HTTPException(
             status_code=404, 
@@ -0,0 +1,21 @@
+"""
+Rebuild the email_summary kept on every company from the emails collection.
+
+Usage: python -m app.scripts.backfill_email_summary
+"""
+import asyncio
+from app.db import client
+from app.repositories.email import EmailRepository
+
+
+async def main():
+    await client.connect_db()
+    try:
+        await EmailRepository.backfill_company_summaries(client)
+        print("Email summaries backfilled.")
+    finally:
+        await client.disconnect_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
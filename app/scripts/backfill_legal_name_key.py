@@ -0,0 +1,22 @@
+"""
+Set legal_name_key on companies created before it was maintained, so imports can match them.
+The app also runs this on startup unless ENSURE_INDEXES_ON_STARTUP=false.
+
+Usage: python -m app.scripts.backfill_legal_name_key
+"""
+import asyncio
+from app.db import client
+from app.repositories.company import CompanyRepository
+
+
+async def main():
+    await client.connect_db()
+    try:
+        updated = await CompanyRepository.backfill_legal_name_keys(client)
+        print(f"Legal name keys backfilled on {updated} companies.")
+    finally:
+        await client.disconnect_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -21,23 +21,23 @@ class ActionService:
     async def create_action(self, client: MongoClient, company_id: str, payload: CreateActionPayload) -> List[Action] | None:
         now = datetime.now()
         action_id = generate_uuid_v4_without_special_chars()
-        result = await self.repository.create(client, company_id, Action(**payload.model_dump(), user=user, date=now,id=action_id))
-        if result:
+        actions = await self.repository.create(client, company_id, Action(**payload.model_dump(), user=user, date=now,id=action_id))
+        if actions is not None:
             if payload.reminder:
                 try:
                     await ReminderService.create(client, ReminderBase(company_id=company_id, action_id=action_id, due_date=payload.reminder))
                 except Exception as ex:
                     print(ex)
-            await ChangelogService.create_log(client, ChangelogService.generate_log(LogType.CREATE_ACTION, payload, now, user))
-            return await self.repository.list(client, company_id)
+            ChangelogService.schedule_log(ChangelogService.generate_log(LogType.CREATE_ACTION, payload, now, user, company_id))
+            return actions
         return None
 
     async def delete_action(self, client: MongoClient, company_id: str, action_id: str) -> List[Action] | None:
-        result = await self.repository.delete(client, company_id, action_id)
-        if result:
+        actions = await self.repository.delete(client, company_id, action_id)
+        if actions is not None:
             await ReminderService.delete(client, company_id, action_id)
-            await ChangelogService.create_log(client, ChangelogService.generate_log(LogType.DELETE_ACTION, {"company_id": company_id, "action_id": action_id}, datetime.now(), user))
-            return await self.repository.list(client, company_id)
+            ChangelogService.schedule_log(ChangelogService.generate_log(LogType.DELETE_ACTION, {"company_id": company_id, "action_id": action_id}, datetime.now(), user, company_id))
+            return actions
         return None
 
     async def list_actions(self, client: MongoClient, company_id: str) -> List[Action]:
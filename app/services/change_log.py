@@ -1,19 +1,51 @@
 from app.repositories.changelog import ChangelogRepository
 from app.db import MongoClient
-from app.models.changelog import Changelog
+from app.models.changelog import Changelog, ChangelogEntry
+from app.models.common import CursorPage
 from app.enums.operation import LogType
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
+from .changelog_sink import changelog_sink
 
 
 class ChangelogService:
     @staticmethod
-    async def create_log(client: MongoClient, log: Changelog):
-        try:
-            return await ChangelogRepository.insert(client, log)
-        except Exception as ex:
-            print(ex)
+    def schedule_log(log: Changelog) -> bool:
+        """
+        Queue the log on the background changelog sink instead of awaiting a write on the request path.
+        Returns False if the log was dropped because the queue is full.
+        """
+        return changelog_sink.submit(log)
 
     @staticmethod
-    def generate_log(operation: LogType, updates: Any, date: datetime, user: str):
-        return Changelog(operation=operation, updates=updates, date=date, user=user)
+    def generate_log(operation: LogType, updates: Any, date: datetime, user: str, company_id: Optional[str] = None):
+        return Changelog(operation=operation, updates=updates, date=date, user=user, company_id=company_id)
+
+    @staticmethod
+    async def list_logs(
+        client: MongoClient,
+        limit: int,
+        cursor: str = "",
+        operation: Optional[LogType] = None,
+        company_id: Optional[str] = None,
+        user: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> CursorPage[ChangelogEntry]:
+        """
+        Newest-first page of logs. Each filter combination is served by one of the changelog indexes.
+        """
+        _filter = {}
+        if operation is not None:
+            _filter["operation"] = operation.value
+        if company_id is not None:
+            _filter["company_id"] = company_id
+        if user is not None:
+            _filter["user"] = user
+        if date_from is not None or date_to is not None:
+            _filter["date"] = {}
+            if date_from is not None:
+                _filter["date"]["$gte"] = date_from
+            if date_to is not None:
+                _filter["date"]["$lt"] = date_to
+        return await ChangelogRepository.page(client, _filter, limit, cursor)
@@ -0,0 +1,107 @@
+import asyncio
+import os
+from typing import Dict, List, Optional
+from pymongo.errors import BulkWriteError
+from app.db import MongoClient
+from app.models.changelog import Changelog
+from app.repositories.changelog import ChangelogRepository
+
+# Logs waiting to be written; new logs are dropped (and counted) once the queue is full
+CHANGELOG_QUEUE_SIZE = int(os.environ.get("CHANGELOG_QUEUE_SIZE", 10000))
+# A batch is written once it reaches this size...
+CHANGELOG_BATCH_SIZE = int(os.environ.get("CHANGELOG_BATCH_SIZE", 200))
+# ...or this many seconds after its first log, whichever comes first
+CHANGELOG_FLUSH_INTERVAL = float(os.environ.get("CHANGELOG_FLUSH_INTERVAL", 1.0))
+
+
+class ChangelogSink:
+    """
+    Background changelog writer. Requests enqueue logs without waiting and a single task
+    writes them with insert_many. Started and drained by the lifespan hook in app/main.py.
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, flush_interval: float):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self._client: Optional[MongoClient] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def start(self, client: MongoClient) -> None:
+        self._client = client
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop accepting logs and wait until everything already queued is written.
+        """
+        if self._task is None:
+            return
+        self._closing = True
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    def submit(self, log: Changelog) -> bool:
+        if self._task is None or self._closing:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(log)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            log = await self._queue.get()
+            if log is None:
+                break
+            batch = [log]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    log = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if log is None:
+                    closing = True
+                    break
+                batch.append(log)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Changelog]) -> None:
+        try:
+            self.written += await ChangelogRepository.insert_many(self._client, batch)
+        except BulkWriteError as ex:
+            inserted = ex.details.get("nInserted", 0)
+            self.written += inserted
+            self.failed += len(batch) - inserted
+            print(f"Changelog batch partially failed: {len(batch) - inserted} of {len(batch)} logs not written")
+        except Exception as ex:
+            self.failed += len(batch)
+            print(f"Changelog batch of {len(batch)} logs failed: {ex}")
+
+
+changelog_sink = ChangelogSink(CHANGELOG_QUEUE_SIZE, CHANGELOG_BATCH_SIZE, CHANGELOG_FLUSH_INTERVAL)
@@ -1,13 +1,18 @@
-from fastapi import UploadFile
+from fastapi import HTTPException, UploadFile, status
+from pymongo.errors import DuplicateKeyError
 from typing import List, Optional, Dict
 from app.models.company import Company, CompanyBase
+from app.models.common import CursorPage, FlexiblePyObjectDoc
 from app.repositories.company import CompanyRepository
 from app.db.database import MongoClient
 from app.models.payloads import UpdateCompanyPayload
 from app.enums.operation import LogType
 from .change_log import ChangelogService
 from datetime import datetime
-from app.utils.company.company_excel_util import CompanyExcelUtil
+from app.utils.company.company_excel_util import CompanyExcelUtil, spool_upload
+from app.models.imports import ImportJob, ImportSummary
+from .import_job import ImportJobService
+import os
 
 user = "<example user>"
 
@@ -17,7 +22,10 @@ class CompanyService:
         self.repository = repository
 
     async def create_company(self, client: MongoClient, company: Company) -> Company:
-        return await self.repository.create(client, company)
+        try:
+            return await self.repository.create(client, company)
+        except DuplicateKeyError:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A company with this legal name already exists.")
 
     async def list_companies(self, client: MongoClient, skip: int = 0, limit: int = 10) -> List[CompanyBase]:
         return await self.repository.list(client, skip, limit)
@@ -29,58 +37,66 @@ class CompanyService:
     async def get_company(self, client: MongoClient, company_id: str) -> Optional[Company]:
         return await self.repository.get(client, company_id)
 
+    async def get_action_summary(self, client: MongoClient, company_id: str, action_id: str) -> Optional[FlexiblePyObjectDoc]:
+        return await self.repository.get_action_summary(client, company_id, action_id)
+
     async def update_company(self, client: MongoClient, company_id: str, payload: UpdateCompanyPayload) -> Optional[Company]:
-        # 1) Convert the payload into a dict
-        fields = payload.model_dump().items()
+        # 1) Split the payload into top-level updates and the partial financials snapshot
         updates = {}
-        print(fields)
-
-        # 2) Extract "financials" separately from the rest
         new_financials_data = None
-        for name, value in fields:
+        for name, value in payload.model_dump().items():
             if value is not None:
                 if name == "financials":
-                    # This is your partial (or entire) financial object
-                    new_financials_data = value  # e.g. {"checkingAccount": 5000, ...}
+                    new_financials_data = value  # e.g. {"checking_account": 5000, ...}
                 else:
                     updates[name] = value
 
-        # 3) If there ARE top-level updates, do a normal "$set"
-        if updates:
-            result = await self.repository.update(client, {"$set": updates}, company_id=company_id)
-            if not result:
-                return None
-
-        # 4) If new_financials_data is present, handle it specially
         if new_financials_data is not None:
             if "timestamp" not in new_financials_data or new_financials_data["timestamp"] is None:
                 new_financials_data["timestamp"] = datetime.utcnow().isoformat()
-            # EITHER append a new snapshot to the array:
-            await self.repository.append_financials_snapshot(
-                client,
-                company_id,
-                new_financials_data
-            )
-            # Or update the last entry instead of appending, depending on your needs
-
-        # 5) Return the updated company
-        await ChangelogService.create_log(
-            client,
-            ChangelogService.generate_log(LogType.UPDATE_DETAIL, updates={"company_id": company_id, "updates":updates}, date=datetime.now(), user=user)
+
+        # 2) Set the fields, append the snapshot and read back the detail view in one round trip
+        try:
+            company = await self.repository.update_detail(client, company_id, updates, new_financials_data)
+        except DuplicateKeyError:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A company with this legal name already exists.")
+        if company is None:
+            return None
+
+        # 3) Record the change without holding up the response
+        ChangelogService.schedule_log(
+            ChangelogService.generate_log(LogType.UPDATE_DETAIL, updates={"company_id": company_id, "updates":updates}, date=datetime.now(), user=user, company_id=company_id)
         )
-        return await self.repository.get(client, company_id)
+        return company
 
 
     async def delete_company(self, client: MongoClient, company_id: str) -> bool:
         return await self.repository.delete(client, company_id)
 
-    async def import_companies(self, client: MongoClient, file: UploadFile) -> List[CompanyBase]:
-        companies = await self.list_with_projection(client, {}, {"legal_name": 1}, None)
-        await CompanyExcelUtil(client, self.repository).parse_imported_data(file, companies)
-        await ChangelogService.create_log(client, ChangelogService.generate_log(LogType.IMPORT_COMPANIES, {}, datetime.now(), "TEST USER"))
-        # arbitrary large limit until pagination
-        return await self.repository.list(client, 0, 10000000)
+    async def import_companies(self, client: MongoClient, file: UploadFile) -> ImportJob:
+        """
+        Spool the upload and process it in the background. Progress is available from get_import_job.
+        """
+        # The upload is closed once the response is sent, so it must be on disk before returning
+        path = await spool_upload(file)
+        job = ImportJobService.create()
+
+        async def run(job: ImportJob):
+            try:
+                await CompanyExcelUtil(client, self.repository).parse_imported_data(path, job)
+            finally:
+                os.remove(path)
+            ChangelogService.schedule_log(ChangelogService.generate_log(LogType.IMPORT_COMPANIES, job.model_dump(include=set(ImportSummary.model_fields)), datetime.now(), "TEST USER"))
+
+        ImportJobService.start(job, run)
+        return job
+
+    def get_import_job(self, job_id: str) -> Optional[ImportJob]:
+        return ImportJobService.get(job_id)
     
     async def list_companies_with_latest_email(self, client: MongoClient, skip: int = 0, limit: int = 10) -> List[CompanyBase]:
         return await self.repository.list_with_latest_email(client, skip, limit)
 
+    async def page_companies_with_latest_email(self, client: MongoClient, limit: int = 10, cursor: str = "") -> CursorPage[CompanyBase]:
+        return await self.repository.page_with_latest_email(client, limit, cursor)
+
@@ -1,22 +1,90 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, List, Optional
 from bson import ObjectId
+from datetime import datetime
+from fastapi import HTTPException, status
+from email.mime.image import MIMEImage
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from string import Template
+import asyncio
+import html
+import os
+import re
 from app.db.database import MongoClient
-from app.models.email import Email
-from app.repositories.email import EmailRepository
+from app.models.contacts import Contact
+from app.models.email import Email, EmailBase, EmlBatchRequest, EmailSummary, CompanyEmailPage, EmailBulkResult, EmailBulkItemError
+from app.models.common import CursorPage
+from app.repositories.email import EmailRepository, email_to_doc
+from app.repositories.company import CompanyRepository
+from app.utils.email.eml_util import (
+    EML_BATCH_CHUNK_SIZE, EML_SENDER, ZipStream, check_payload_size, decode_images, zip_emls
+)
+
+# Largest list accepted by POST /emails/bulk
+EMAIL_BULK_MAX_ITEMS = int(os.environ.get("EMAIL_BULK_MAX_ITEMS", 10000))
+
+
+def _validation_detail(ex: Exception) -> str:
+    if isinstance(ex, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+            for error in ex.errors()
+        )
+    return str(ex)
 
 
 class EmailService:
-    def __init__(self, repository: EmailRepository):
+    def __init__(self, repository: EmailRepository, company_repository: CompanyRepository = CompanyRepository()):
         self.repository = repository
+        self.company_repository = company_repository
 
     async def create_email(self, client: MongoClient, email: Email) -> Email:
-        # Convert company_id to ObjectId
-        email.company_id = ObjectId(email.company_id)
         return await self.repository.create(client, email)
 
+    async def create_emails_bulk(self, client: MongoClient, items: List[Any]) -> EmailBulkResult:
+        """
+        Validate every item, write the valid ones with one unordered insert_many and refresh the
+        summaries of the companies involved in one pass. Failures are reported per request index.
+        """
+        if len(items) > EMAIL_BULK_MAX_ITEMS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {EMAIL_BULK_MAX_ITEMS} emails per request."
+            )
+        result = EmailBulkResult()
+        docs = []
+        positions = []  # Request index of each entry in docs
+        for idx, item in enumerate(items):
+            try:
+                email = EmailBase.model_validate(item)
+                if not ObjectId.is_valid(email.company_id):
+                    raise ValueError("company_id: not a valid ObjectId")
+                docs.append(email_to_doc(email))
+                positions.append(idx)
+            except ValueError as ex:
+                result.errors.append(EmailBulkItemError(index=idx, detail=_validation_detail(ex)))
+
+        if docs:
+            try:
+                await self.repository.create_many(client, docs)
+                result.inserted = len(docs)
+            except BulkWriteError as ex:
+                result.inserted = ex.details.get("nInserted", 0)
+                for error in ex.details.get("writeErrors", []):
+                    result.errors.append(EmailBulkItemError(index=positions[error["index"]], detail=error.get("errmsg", "Write failed.")))
+            company_ids = {doc["company_id"] for doc in docs}
+            await self.repository.refresh_company_summaries(client, company_ids)
+
+        result.failed = len(items) - result.inserted
+        result.errors.sort(key=lambda error: error.index)
+        return result
+
     async def list_emails(self, client: MongoClient, skip: int = 0, limit: int = 10) -> List[Email]:
         return await self.repository.list(client, skip, limit)
 
+    async def page_emails(self, client: MongoClient, limit: int = 10, cursor: str = "") -> CursorPage[Email]:
+        return await self.repository.page(client, limit, cursor)
+
     async def get_email(self, client: MongoClient, email_id: str) -> Optional[Email]:
         return await self.repository.get(client, email_id)
 
@@ -33,3 +101,90 @@ class EmailService:
         # Convert company_id to ObjectId
         company_id_obj = ObjectId(company_id)
         return await self.repository.get_emails_by_company_id(client, company_id_obj, skip, limit)
+
+    async def page_emails_by_company_id(self, client: MongoClient, company_id: str, limit: int = 10, cursor: str = "") -> CompanyEmailPage:
+        """
+        Newest-first page of the company's emails together with its email stats.
+        """
+        page = await self.repository.page_by_company_id(client, company_id, limit, cursor)
+        stats = await self.company_repository.get_email_summary(client, company_id)
+        return CompanyEmailPage(items=page.items, next_cursor=page.next_cursor, stats=stats or EmailSummary())
+
+    async def get_company_email_stats(self, client: MongoClient, company_id: str) -> Optional[EmailSummary]:
+        # Read from the email_summary every email write keeps current on the company document
+        return await self.company_repository.get_email_summary(client, company_id)
+
+    async def generate_campaign(self, client: MongoClient, request: EmlBatchRequest) -> AsyncIterator[bytes]:
+        """
+        Validate the batch and decode its images once, then return the zip stream.
+        Everything that can fail with a 4xx happens here, before the response starts.
+        """
+        if not request.contact_ids and not request.company_ids:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No contact_ids or company_ids given.")
+        invalid = [company_id for company_id in request.company_ids if not ObjectId.is_valid(company_id)]
+        if invalid:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid company ids: {', '.join(invalid)}")
+        check_payload_size(len(request.subject) + len(request.html_body) + sum(len(image) for image in request.images))
+        images = await asyncio.to_thread(decode_images, request.images)
+        return self._stream_campaign(client, request, images)
+
+    async def _stream_campaign(self, client: MongoClient, request: EmlBatchRequest, images: List[MIMEImage]) -> AsyncIterator[bytes]:
+        """
+        Render EML_BATCH_CHUNK_SIZE recipients at a time into the zip, record their Email documents
+        with one insert_many, and yield the zip bytes of that chunk.
+        """
+        zip_stream = ZipStream()
+        company_ids = set()
+        chunk = []
+        count = 0
+        try:
+            async for company_id, legal_name, contact in self.company_repository.iter_recipients(
+                client, request.contact_ids, request.company_ids
+            ):
+                count += 1
+                chunk.append((count, company_id, legal_name, contact))
+                company_ids.add(company_id)
+                if len(chunk) >= EML_BATCH_CHUNK_SIZE:
+                    yield await self._write_campaign_chunk(client, zip_stream, request, images, chunk)
+                    chunk = []
+            if chunk:
+                yield await self._write_campaign_chunk(client, zip_stream, request, images, chunk)
+            yield zip_stream.close()
+        finally:
+            # Runs even if the client disconnects part way, so recorded emails always show in the summaries
+            await self.repository.refresh_company_summaries(client, company_ids)
+            print(f"Campaign '{request.template}': {count} emails generated.")
+
+    async def _write_campaign_chunk(self, client: MongoClient, zip_stream: ZipStream, request: EmlBatchRequest,
+                                    images: List[MIMEImage], chunk: List[tuple]) -> bytes:
+        sender = request.sender or EML_SENDER
+        subject = Template(request.subject)
+        body = Template(request.html_body)
+        now = datetime.now()
+        messages = []
+        email_docs = []
+        for idx, company_id, legal_name, contact in chunk:
+            values = {
+                "first_name": contact.get("first_name") or "",
+                "last_name": contact.get("last_name") or "",
+                "email": contact["email"],
+                "legal_name": legal_name or "",
+            }
+            messages.append((
+                f"{idx:05d}_{re.sub(r'[^A-Za-z0-9@._-]', '_', contact['email'])}.eml",
+                subject.safe_substitute(values),
+                contact["email"],
+                body.safe_substitute({k: html.escape(v) for k, v in values.items()}),
+            ))
+            email_docs.append({
+                "datetime": now,
+                "sender": sender,
+                "recipient": {field: contact.get(field) for field in Contact.model_fields},
+                "template": request.template,
+                "sent": None,
+                "answered": None,
+                "company_id": company_id,
+            })
+        data = await asyncio.to_thread(zip_emls, zip_stream, messages, images, sender)
+        await self.repository.create_many(client, email_docs)
+        return data
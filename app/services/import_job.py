@@ -0,0 +1,67 @@
+import asyncio
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Optional, Set
+from app.enums.import_job import ImportJobStatus
+from app.models.imports import ImportJob
+from app.utils.id_gen import generate_uuid_v4_without_special_chars
+
+# Number of jobs kept for status lookups; the oldest finished jobs are evicted first
+MAX_IMPORT_JOBS = int(os.environ.get("MAX_IMPORT_JOBS", 100))
+
+
+class ImportJobService:
+    """
+    In-process registry of background imports. Jobs live in the memory of the worker that accepted
+    the upload, so status lookups must reach that same worker.
+    """
+    _jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+    _tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def create() -> ImportJob:
+        job = ImportJob(id=generate_uuid_v4_without_special_chars())
+        ImportJobService._jobs[job.id] = job
+        ImportJobService._evict()
+        return job
+
+    @staticmethod
+    def get(job_id: str) -> Optional[ImportJob]:
+        return ImportJobService._jobs.get(job_id)
+
+    @staticmethod
+    def start(job: ImportJob, run: Callable[[ImportJob], Awaitable]) -> None:
+        """
+        Run `run(job)` in the background, tracking its status. A reference to the task is kept
+        until it finishes so it is not garbage collected mid-import.
+        """
+        task = asyncio.create_task(ImportJobService._track(job, run))
+        ImportJobService._tasks.add(task)
+        task.add_done_callback(ImportJobService._tasks.discard)
+
+    @staticmethod
+    async def _track(job: ImportJob, run: Callable[[ImportJob], Awaitable]) -> None:
+        job.status = ImportJobStatus.RUNNING
+        try:
+            await run(job)
+            job.status = ImportJobStatus.COMPLETED
+        except Exception as ex:
+            print(f"Import job {job.id} failed: {ex}")
+            job.status = ImportJobStatus.FAILED
+            job.error = str(ex)
+        except asyncio.CancelledError:
+            job.status = ImportJobStatus.FAILED
+            job.error = "Import was cancelled."
+            raise
+        finally:
+            job.finished_at = datetime.now()
+
+    @staticmethod
+    def _evict() -> None:
+        jobs = ImportJobService._jobs
+        for job_id in list(jobs.keys()):
+            if len(jobs) <= MAX_IMPORT_JOBS:
+                break
+            if jobs[job_id].status in (ImportJobStatus.COMPLETED, ImportJobStatus.FAILED):
+                del jobs[job_id]
@@ -1,17 +1,28 @@
 from fastapi import HTTPException, status
 from app.repositories.reminder import ReminderRepository
-from app.models.reminder import ReminderBase, Reminder, ReminderDisplay, ReminderState
-from datetime import datetime
+from app.models.reminder import ReminderBase, Reminder, ReminderDisplay, ReminderState, ReminderSummary
+from app.utils.cache import TTLCache
+from app.enums.reminder import ReminderWindow
+from app.models.common import CursorPage
+from datetime import datetime, timedelta
+from app.utils.dates import to_utc, utc_now
 from app.db import MongoClient
 from .company import CompanyService
-from bson import ObjectId
+from .reminder_scheduler import reminder_scheduler
 from typing import List, Optional
+import os
+
+# Dashboard summary is cached briefly; reminder writes on this worker clear it right away
+REMINDER_SUMMARY_TTL_SECONDS = float(os.environ.get("REMINDER_SUMMARY_TTL_SECONDS", 30))
+REMINDER_SUMMARY_MAX_COMPANIES = int(os.environ.get("REMINDER_SUMMARY_MAX_COMPANIES", 100))
+summary_cache = TTLCache(REMINDER_SUMMARY_TTL_SECONDS)
+
 
 class ReminderService:
 
     @staticmethod
     async def create(client: MongoClient, payload: ReminderBase) -> Reminder | None:
-        now = datetime.now()
+        now = utc_now()
         if payload.due_date <= now:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, 
@@ -22,57 +33,126 @@ class ReminderService:
             Reminder(**payload.model_dump(), created_at=now)
         )
         if res:
-            return await ReminderRepository.get(client, payload.company_id, payload.action_id)
+            summary_cache.invalidate()
+            reminder = await ReminderRepository.get(client, payload.company_id, payload.action_id)
+            if reminder:
+                reminder_scheduler.schedule(reminder)
+            return reminder
         return None
 
     @staticmethod
     async def delete(client: MongoClient, company_id: str, action_id: str):
+        reminder_scheduler.unschedule(company_id, action_id)
+        summary_cache.invalidate()
         return await ReminderRepository.delete(client, company_id, action_id)
 
+    @staticmethod
+    def _window_filter(
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        window: Optional[ReminderWindow] = None
+    ) -> dict:
+        """
+        Filter for open reminders due in [date_from, date_to), optionally narrowed to overdue or upcoming ones.
+        """
+        # Due dates are stored as naive UTC; compare like with like
+        date_from = to_utc(date_from) if date_from is not None else None
+        date_to = to_utc(date_to) if date_to is not None else None
+        due_date = {}
+        if date_from is not None:
+            due_date["$gte"] = date_from
+        if date_to is not None:
+            due_date["$lt"] = date_to
+        if window is not None:
+            now = utc_now()
+            if window == ReminderWindow.OVERDUE:
+                due_date["$lt"] = min(due_date.get("$lt", now), now)
+            else:
+                due_date["$gte"] = max(due_date.get("$gte", now), now)
+        _filter = {"completed": False}
+        if due_date:
+            _filter["due_date"] = due_date
+        return _filter
+
     @staticmethod
     async def list_reminders_with_company(
         client: MongoClient, 
-        company_service: CompanyService, 
-        limit: int
+        limit: int,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        window: Optional[ReminderWindow] = None
     ) -> List[ReminderDisplay]:
-        now = datetime.now()
-        reminders = await ReminderRepository.list(client, limit, {"completed": False})
-        # Retrieve all relevant companies with projection
-        ids = [ObjectId(rem.company_id) for rem in reminders]
-        _filter = {'_id': {'$in': ids}}
-        projection = {"actions": 1, "legal_name": 1}
-        companies = await company_service.list_with_projection(client, _filter, projection, limit)
+        _filter = ReminderService._window_filter(date_from, date_to, window)
+        docs, _ = await ReminderRepository.page_with_company(client, limit, "", _filter)
+        return ReminderService._to_displays(docs)
+
+    @staticmethod
+    async def page_reminders_with_company(
+        client: MongoClient, 
+        limit: int,
+        cursor: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        window: Optional[ReminderWindow] = None
+    ) -> CursorPage[ReminderDisplay]:
+        _filter = ReminderService._window_filter(date_from, date_to, window)
+        docs, next_cursor = await ReminderRepository.page_with_company(client, limit, cursor, _filter)
+        return CursorPage[ReminderDisplay](items=ReminderService._to_displays(docs), next_cursor=next_cursor)
 
+    @staticmethod
+    def _to_displays(docs: List[dict]) -> List[ReminderDisplay]:
+        """
+        Build displays from reminders joined with their company. Reminders whose company
+        or action no longer exists are skipped.
+        """
+        now = utc_now()
         reminder_list = []
-        for reminder in reminders:
-            if reminder.company_id in companies:
-                reminder_action = [
-                    act for act in companies[reminder.company_id].actions 
-                    if act["id"] == reminder.action_id
-                ]
-                if len(reminder_action) == 1:
-                    reminder_list.append(
-                        ReminderDisplay(
-                            id=str(reminder.id),
-                            company_name=companies[reminder.company_id].legal_name,
-                            is_completed=reminder.completed,
-                            created_at=reminder.created_at,
-                            due_date=reminder.due_date,
-                            action=reminder_action[0],
-                            state=ReminderState.PAST 
-                                if now > reminder.due_date 
-                                else ReminderState.NOT_PAST
-                        )
-                    )
+        for doc in docs:
+            company = doc.get("company")
+            if not company or not company.get("action"):
+                continue
+            reminder = Reminder(**doc)
+            reminder_list.append(
+                ReminderDisplay(
+                    id=str(reminder.id),
+                    company_name=company["legal_name"],
+                    is_completed=reminder.completed,
+                    created_at=reminder.created_at,
+                    due_date=reminder.due_date,
+                    action=company["action"],
+                    state=ReminderState.PAST 
+                        if now > reminder.due_date 
+                        else ReminderState.NOT_PAST
+                )
+            )
         return reminder_list
 
+    @staticmethod
+    async def summary(client: MongoClient) -> ReminderSummary:
+        """
+        Overdue / due today / upcoming counts for the dashboard header, overall and per company.
+        "Today" is the current UTC day.
+        """
+        now = utc_now()
+        cached = summary_cache.get(now.date())
+        if cached is not None:
+            return cached
+        end_of_day = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        summary = ReminderSummary(**await ReminderRepository.summary(client, now, end_of_day, REMINDER_SUMMARY_MAX_COMPANIES))
+        summary_cache.set(now.date(), summary)
+        return summary
+
     @staticmethod
     async def list(client: MongoClient, limit: int):
         return await ReminderRepository.list(client, limit)
 
     @staticmethod
     async def complete(client: MongoClient, reminder_id: str) -> bool:
-        return await ReminderRepository.complete_reminder(client, reminder_id)
+        completed = await ReminderRepository.complete_reminder(client, reminder_id)
+        if completed:
+            reminder_scheduler.unschedule_id(reminder_id)
+            summary_cache.invalidate()
+        return completed
 
     # NEW: partial update
     @staticmethod
@@ -85,6 +165,10 @@ class ReminderService:
         Update fields in a reminder doc by ID. Return the updated doc as a Reminder object.
         """
         updated = await ReminderRepository.update_partial(client, reminder_id, updates)
+        if updated:
+            # Moves the reminder in the schedule, or drops it once completed
+            reminder_scheduler.schedule(updated)
+            summary_cache.invalidate()
         return updated
 
     @staticmethod
@@ -96,19 +180,16 @@ class ReminderService:
         """
         Build a single ReminderDisplay object for the given Reminder.
         """
-        now = datetime.now()
-        company = await company_service.get(client, reminder.company_id)
+        now = utc_now()
+        # Only the legal name and the reminder's action are read
+        company = await company_service.get_action_summary(client, reminder.company_id, reminder.action_id)
         if not company:
             raise HTTPException(
                 status_code=404, 
                 detail="Company not found for reminder."
             )
-        # Locate the relevant action
-        the_action = None
-        for act in company.actions:
-            if act["id"] == reminder.action_id:
-                the_action = act
-                break
+        actions = getattr(company, "actions", None) or []
+        the_action = actions[0] if actions else None
         if not the_action:
             raise HTTPException(
                 status_code=404, 
@@ -0,0 +1,256 @@
+import asyncio
+import heapq
+from abc import ABC, abstractmethod
+import json
+import os
+import urllib.request
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from app.db import MongoClient
+from app.models.reminder import Reminder
+from app.repositories.reminder import ReminderRepository
+from app.utils.dates import utc_now
+
+# Comma separated notifiers fired when a reminder comes due: log, webhook, sse
+REMINDER_NOTIFIERS = os.environ.get("REMINDER_NOTIFIERS", "log")
+REMINDER_WEBHOOK_URL = os.environ.get("REMINDER_WEBHOOK_URL")
+# Most upcoming reminders held in memory; the rest are picked up by the periodic reload
+REMINDER_SCHEDULER_MAX = int(os.environ.get("REMINDER_SCHEDULER_MAX", 10000))
+REMINDER_SCHEDULER_RELOAD_SECONDS = float(os.environ.get("REMINDER_SCHEDULER_RELOAD_SECONDS", 3600))
+# Each notification runs as its own task and is abandoned after this long
+REMINDER_NOTIFY_TIMEOUT_SECONDS = float(os.environ.get("REMINDER_NOTIFY_TIMEOUT_SECONDS", 10))
+# The heap is rebuilt once stale items (moved or removed reminders) outnumber live ones, and there are at least this many
+HEAP_COMPACT_MIN_STALE = 1000
+SSE_QUEUE_SIZE = 100
+
+# Reminders are unique per (company_id, action_id), see ReminderRepository.create
+ReminderKey = Tuple[str, str]
+
+
+class ReminderNotifier(ABC):
+    @abstractmethod
+    async def notify(self, reminder: Reminder) -> None:
+        ...
+
+
+class LogNotifier(ReminderNotifier):
+    async def notify(self, reminder: Reminder) -> None:
+        print(f"Reminder {reminder.id} for action {reminder.action_id} of company {reminder.company_id} is due.")
+
+
+class WebhookNotifier(ReminderNotifier):
+    def __init__(self, url: str):
+        self.url = url
+
+    def _post(self, body: bytes) -> None:
+        request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=REMINDER_NOTIFY_TIMEOUT_SECONDS):
+            pass
+
+    async def notify(self, reminder: Reminder) -> None:
+        body = json.dumps(reminder.model_dump(mode="json", by_alias=True)).encode()
+        await asyncio.to_thread(self._post, body)
+
+
+class SSENotifier(ReminderNotifier):
+    """
+    Fans due reminders out to every connected GET /reminders/stream client.
+    Slow clients whose queue is full miss events rather than holding up the scheduler.
+    """
+
+    def __init__(self):
+        self._subscribers: Set[asyncio.Queue] = set()
+
+    async def notify(self, reminder: Reminder) -> None:
+        event = f"event: reminder\ndata: {json.dumps(reminder.model_dump(mode='json', by_alias=True))}\n\n"
+        for subscriber in self._subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except asyncio.QueueFull:
+                pass
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        subscriber = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+        self._subscribers.add(subscriber)
+        try:
+            while True:
+                yield await subscriber.get()
+        finally:
+            self._subscribers.discard(subscriber)
+
+
+class ReminderScheduler:
+    """
+    Keeps open upcoming reminders in a min-heap keyed by due date and fires the notifiers when
+    each one comes due. ReminderService keeps it in sync on create, update, complete and delete.
+    Each worker process runs its own scheduler, so with several workers every one of them notifies.
+    Until start() has run (or after stop()) scheduling calls are ignored, so a disabled scheduler holds nothing.
+    """
+
+    def __init__(self, notifiers: List[ReminderNotifier]):
+        self.notifiers = notifiers
+        self._heap: List[Tuple[datetime, int, ReminderKey]] = []
+        # Current entry per key; heap items whose sequence number no longer matches are stale
+        self._entries: Dict[ReminderKey, Tuple[int, Reminder]] = {}
+        self._keys_by_id: Dict[str, ReminderKey] = {}
+        self._stale = 0
+        self._sequence = 0
+        self._wakeup = asyncio.Event()
+        self._client: Optional[MongoClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loaded_at: Optional[datetime] = None
+        self._running = False
+        self._notifications: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    async def start(self, client: MongoClient) -> None:
+        self._client = client
+        self._wakeup = asyncio.Event()
+        self._running = True
+        await self._load()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._running = False
+        tasks = list(self._notifications)
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._heap, self._entries, self._keys_by_id = [], {}, {}
+        self._stale = 0
+
+    def schedule(self, reminder: Reminder) -> None:
+        """
+        Add or move a reminder. Completed or past reminders are dropped instead. Once
+        REMINDER_SCHEDULER_MAX reminders are held, the latest one is evicted to make room, or the
+        new one is left to a later reload if it is due last.
+        """
+        if not self._running:
+            return
+        # The previous entry may sit under another key if an update changed the company or action
+        self.unschedule_id(str(reminder.id))
+        key = (reminder.company_id, reminder.action_id)
+        self.unschedule(*key)
+        if reminder.completed or reminder.due_date <= utc_now():
+            return
+        if len(self._entries) >= REMINDER_SCHEDULER_MAX:
+            latest_key, (_, latest) = max(self._entries.items(), key=lambda item: item[1][1].due_date)
+            if reminder.due_date >= latest.due_date:
+                return
+            self.unschedule(*latest_key)
+        self._sequence += 1
+        self._entries[key] = (self._sequence, reminder)
+        self._keys_by_id[str(reminder.id)] = key
+        heapq.heappush(self._heap, (reminder.due_date, self._sequence, key))
+        self._wakeup.set()
+
+    def unschedule(self, company_id: str, action_id: str) -> None:
+        if self._drop((company_id, action_id)) is None:
+            return
+        # The heap item is left behind and skipped as stale when it surfaces, or dropped by a compaction
+        self._stale += 1
+        if self._stale >= HEAP_COMPACT_MIN_STALE and self._stale * 2 > len(self._heap):
+            self._compact()
+
+    def unschedule_id(self, reminder_id: str) -> None:
+        key = self._keys_by_id.get(reminder_id)
+        if key is not None:
+            self.unschedule(*key)
+
+    def _drop(self, key: ReminderKey) -> Optional[Tuple[int, Reminder]]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._keys_by_id.pop(str(entry[1].id), None)
+        return entry
+
+    def _compact(self) -> None:
+        """
+        Rebuild the heap from the live entries only.
+        """
+        self._heap = [(reminder.due_date, sequence, key) for key, (sequence, reminder) in self._entries.items()]
+        heapq.heapify(self._heap)
+        self._stale = 0
+
+    async def _load(self) -> None:
+        now = utc_now()
+        reminders = await ReminderRepository.list_upcoming(self._client, now, REMINDER_SCHEDULER_MAX)
+        self._reset()
+        for reminder in reminders:
+            self.schedule(reminder)
+        self._loaded_at = now
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            if (utc_now() - self._loaded_at).total_seconds() >= REMINDER_SCHEDULER_RELOAD_SECONDS:
+                try:
+                    await self._load()
+                except Exception as ex:
+                    print(f"Could not reload reminders: {ex}")
+                    self._loaded_at = utc_now()
+            timeout = REMINDER_SCHEDULER_RELOAD_SECONDS
+            while self._heap:
+                due_date, sequence, key = self._heap[0]
+                entry = self._entries.get(key)
+                if entry is None or entry[0] != sequence:
+                    heapq.heappop(self._heap)
+                    self._stale = max(self._stale - 1, 0)
+                    continue
+                delay = (due_date - utc_now()).total_seconds()
+                if delay > 0:
+                    timeout = min(timeout, delay)
+                    break
+                heapq.heappop(self._heap)
+                self._drop(key)
+                self._fire(entry[1])
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _fire(self, reminder: Reminder) -> None:
+        """
+        Dispatch the notifications in the background so a slow notifier cannot delay other due reminders.
+        """
+        for notifier in self.notifiers:
+            task = asyncio.create_task(self._notify(notifier, reminder))
+            self._notifications.add(task)
+            task.add_done_callback(self._notifications.discard)
+
+    @staticmethod
+    async def _notify(notifier: ReminderNotifier, reminder: Reminder) -> None:
+        try:
+            await asyncio.wait_for(notifier.notify(reminder), REMINDER_NOTIFY_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            print(f"Reminder notifier {type(notifier).__name__} timed out for reminder {reminder.id}.")
+        except Exception as ex:
+            print(f"Reminder notifier {type(notifier).__name__} failed: {ex}")
+
+
+sse_notifier = SSENotifier()
+
+
+def _build_notifiers() -> List[ReminderNotifier]:
+    notifiers = []
+    for name in [n.strip() for n in REMINDER_NOTIFIERS.split(",") if n.strip()]:
+        if name == "log":
+            notifiers.append(LogNotifier())
+        elif name == "webhook" and REMINDER_WEBHOOK_URL:
+            notifiers.append(WebhookNotifier(REMINDER_WEBHOOK_URL))
+        elif name == "sse":
+            notifiers.append(sse_notifier)
+        else:
+            print(f"Ignoring reminder notifier '{name}'.")
+    return notifiers
+
+
+reminder_scheduler = ReminderScheduler(_build_notifiers())
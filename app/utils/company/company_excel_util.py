@@ -3,9 +3,217 @@ from app.repositories.company import CompanyRepository
 from fastapi import UploadFile
 from app.utils.math import safe_float
 from datetime import datetime
-import io
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+import asyncio
+import functools
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
 from openpyxl import load_workbook
+from pymongo.errors import BulkWriteError
+from app.models.imports import ImportSummary
 from app.utils.id_gen import generate_uuid_v4_without_special_chars
+from app.utils.company.legal_name import legal_name_key
+
+# Number of new companies inserted per create_many call
+IMPORT_CHUNK_SIZE = int(os.environ.get("IMPORT_CHUNK_SIZE", 1000))
+# Size of the reads used to spool an upload to disk
+SPOOL_READ_SIZE = 1024 * 1024
+# Workbook parsing runs off the event loop in a "thread" or "process" pool
+IMPORT_EXECUTOR = os.environ.get("IMPORT_EXECUTOR", "thread")
+IMPORT_WORKERS = int(os.environ.get("IMPORT_WORKERS", 2))
+# Parsed batches buffered between the parser and the writer; bounds memory if Mongo is slower than parsing
+IMPORT_QUEUE_SIZE = int(os.environ.get("IMPORT_QUEUE_SIZE", 4))
+QUEUE_POLL_SECONDS = 0.5
+DUPLICATE_KEY = 11000
+
+# (normalized legal name, financials snapshot, new company document)
+ParsedRow = Tuple[str, Dict, Dict]
+
+_executor: Executor | None = None
+_manager = None
+
+
+async def spool_upload(file: UploadFile) -> str:
+    """
+    Copy the upload to a temp file in fixed-size reads so it is never held in memory at once.
+    Writes run in a worker thread. The caller is responsible for removing the returned path;
+    if spooling fails the partial file is removed here.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp:
+        try:
+            while chunk := await file.read(SPOOL_READ_SIZE):
+                await asyncio.to_thread(tmp.write, chunk)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    return tmp.name
+
+
+def iter_rows(path: str) -> Iterator[Dict]:
+    """
+    Lazily yield every data row of the active sheet as a {header: value} dict.
+    The workbook is opened read-only, so cells are streamed instead of built up front.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        headers = next(rows, None)
+        if headers is None:
+            return
+        for row in rows:
+            yield {headers[i]: cell for i, cell in enumerate(row) if i < len(headers)}
+    finally:
+        wb.close()
+
+
+def row_to_financials(row_data: Dict) -> Dict:
+    return {
+        'checking_account': safe_float(row_data.get('Encaisse - Comptes bancaires')),
+        'long_term_investments': safe_float(row_data.get('Placements long terme')),
+        'total_investments': safe_float(row_data.get('Placements totaux')),
+        'physical_assets': safe_float(row_data.get('Terrain et immeubles')),
+        'total_actives': safe_float(row_data.get('Total actif')),
+        'loans': safe_float(row_data.get('Hypothèques ou crédit potentiel')),
+        'total_passives': safe_float(row_data.get('Total Passif')),
+        'total_donations': safe_float(row_data.get('Total dons')),
+        'federal_revenue': safe_float(row_data.get('Revenus fédéraux')),
+        'provincial_revenue': safe_float(row_data.get('Revenus provinciaux')),
+        'municipal_revenue': safe_float(row_data.get('Revenus municipaux')),
+        'interest_and_banking_fees': safe_float(row_data.get('Intérêts et frais bancaires')),
+        'occupation_cost': safe_float(row_data.get("Coûts d'occupation")),
+        'professional_fees': safe_float(row_data.get('Honoraires professionnels')),
+        'salaries': safe_float(row_data.get('Salaires')),
+        'fixed_asset_depreciation': safe_float(row_data.get('Amortissement immobilisations')),
+        'others': safe_float(row_data.get('Autres')),
+        'total_expenses': safe_float(row_data.get('Total dépenses')),
+        'total_revenue': safe_float(row_data.get('Total des revenus')),
+        'timestamp': datetime.now()
+    }
+
+
+def row_to_company(row_data: Dict, financials: Dict) -> Dict:
+    email = row_data['Contact Email'] if row_data['Contact Email'] is not None and isinstance(row_data['Contact Email'], str) else ''
+    return {
+        'legal_name': row_data.get('Legal name'),
+        'legal_name_key': legal_name_key(row_data.get('Legal name')),
+        "is_existing_client": bool(row_data['IND_BNC']),
+        "is_active": bool(row_data['CLIENT_ACTIF']),
+        'company_phone_number': str(row_data['Contact Phone']) if row_data['Contact Phone'] is not None else '',
+        'company_email': email,
+        'company_website': '',
+        'description': '',
+        'fcc': 1 if row_data['FCC'] is not None else 0,
+        'street_address': row_data['Mailing address'] if row_data['Mailing address'] is not None else '',
+        'city': row_data['City'] if row_data['City'] is not None else '',
+        'state_or_province': row_data['Province'] if row_data['Province'] is not None else '',
+        'postal_code': row_data['Postal code'] if row_data['Postal code'] is not None else '',
+        'country': 'CA',
+        'contacts': [] if 'Contact Email' not in row_data else [
+            {
+                "id": generate_uuid_v4_without_special_chars(),
+                "name": str(row_data['Directeur de compte']) if row_data['Directeur de compte'] is not None else '',
+                "email": email,
+                "phone_number": str(row_data['Contact Phone']) if row_data['Contact Phone'] is not None else ''
+            }
+        ],
+        'actions': [],
+        'comments': [],
+        'news': [],
+        'financials': [financials]
+    }
+
+
+def produce_batches(path: str, batch_size: int, out_queue, stop_event) -> None:
+    """
+    Parse the workbook and put lists of ParsedRow on `out_queue`, followed by a None sentinel.
+    Runs inside the import executor, so it must stay a picklable module-level function.
+    """
+    def put(item) -> bool:
+        while not stop_event.is_set():
+            try:
+                out_queue.put(item, timeout=QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        batch = []
+        for row_data in iter_rows(path):
+            if not row_data.get('Legal name'):
+                continue
+            financials = row_to_financials(row_data)
+            company = row_to_company(row_data, financials)
+            batch.append((company['legal_name_key'], financials, company))
+            if len(batch) >= batch_size:
+                if not put(batch):
+                    return
+                batch = []
+        if batch:
+            put(batch)
+    finally:
+        put(None)
+
+
+def get_import_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if IMPORT_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=IMPORT_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=IMPORT_WORKERS, thread_name_prefix="import")
+    return _executor
+
+
+def shutdown_import_executor() -> None:
+    global _executor, _manager
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    if _manager is not None:
+        _manager.shutdown()
+        _manager = None
+
+
+def _make_channel():
+    """
+    Queue and stop flag shared with the parser; process workers need manager proxies.
+    """
+    global _manager
+    if IMPORT_EXECUTOR == "process":
+        if _manager is None:
+            _manager = multiprocessing.Manager()
+        return _manager.Queue(maxsize=IMPORT_QUEUE_SIZE), _manager.Event()
+    return queue.Queue(maxsize=IMPORT_QUEUE_SIZE), threading.Event()
+
+
+async def parse_in_executor(path: str, batch_size: int) -> AsyncIterator[List[ParsedRow]]:
+    """
+    Stream parsed row batches from the import executor back to the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    out_queue, stop_event = _make_channel()
+    producer = loop.run_in_executor(get_import_executor(), produce_batches, path, batch_size, out_queue, stop_event)
+    try:
+        while True:
+            try:
+                batch = await loop.run_in_executor(None, functools.partial(out_queue.get, timeout=QUEUE_POLL_SECONDS))
+            except queue.Empty:
+                if producer.done():
+                    break
+                continue
+            if batch is None:
+                break
+            yield batch
+    finally:
+        # Unblocks the producer if the consumer stopped early
+        stop_event.set()
+        await producer
 
 
 class CompanyExcelUtil:
@@ -13,83 +221,57 @@ class CompanyExcelUtil:
         self.client = mongo_client
         self.repository = repository
 
-    async def parse_imported_data(self, file: UploadFile, companies: dict) -> bool:
+    async def parse_imported_data(self, path: str, summary: Optional[ImportSummary] = None) -> ImportSummary:
         """
-        Read in the CSV file and extract the fields. If the Company already exists, just append the new financials.
-        If it is a new company, add it to a list to then insert at once.
-        :param client: Mongo Client
-        :param file: File to upload
-        :return:
+        Read in the spooled Excel file and extract the fields. If the Company already exists, just append the new financials.
+        Existing companies are resolved per batch with an indexed lookup on the normalized legal name.
+        The workbook is parsed in the import executor (IMPORT_EXECUTOR) and streamed back in batches of
+        IMPORT_CHUNK_SIZE rows, each written with one insert_many and one bulk_write, so the event loop stays
+        free, memory stays flat and a refresh costs a handful of round trips regardless of file size.
+        :param path: Spooled upload, see spool_upload
+        :param summary: Counters to update in place as batches are written, e.g. an ImportJob
+        :return: Matched, inserted and failed row counts
         """
+        summary = ImportSummary() if summary is None else summary
+        # Parsing happens in the import executor; this loop only classifies and writes each batch
+        async for batch in parse_in_executor(path, IMPORT_CHUNK_SIZE):
+            s = await self.repository.find_existing_legal_name_keys(self.client, {key for key, _, _ in batch})
+            new_companies_to_add = []
+            financials_to_append = []
+            for key, financials, company in batch:
+                summary.rows_processed += 1
+                if key not in s:
+                    new_companies_to_add.append(company)
+                    # Later rows for the same company in this batch append to the one inserted here
+                    s.add(key)
+                else:
+                    financials_to_append.append((key, financials))
+            await self._flush(new_companies_to_add, financials_to_append, summary)
+        return summary
+
+    async def _flush(self, new_companies: List[Dict], appends: List[tuple], summary: ImportSummary):
+        """
+        Write one chunk: a single unordered insert_many for new companies and a single unordered
+        bulk_write for financials appends. Failed writes are counted instead of aborting the import.
+        """
+        if new_companies:
+            try:
+                result = await self.repository.create_many(self.client, new_companies)
+                summary.inserted += len(result.inserted_ids)
+            except BulkWriteError as ex:
+                summary.inserted += ex.details.get("nInserted", 0)
+                # Rows another import inserted in the meantime (unique legal_name_key) get their snapshot appended instead
+                duplicates = [e["index"] for e in ex.details.get("writeErrors", []) if e.get("code") == DUPLICATE_KEY]
+                appends = appends + [
+                    (new_companies[i]["legal_name_key"], new_companies[i]["financials"][-1]) for i in duplicates
+                ]
+                summary.failed += len(new_companies) - ex.details.get("nInserted", 0) - len(duplicates)
+        if appends:
+            try:
+                result = await self.repository.bulk_append_financials(self.client, appends)
+                matched = result.matched_count
+            except BulkWriteError as ex:
+                matched = ex.details.get("nMatched", 0)
+            summary.matched += matched
+            summary.failed += len(appends) - matched
 
-        f = await file.read()
-        xlsx = io.BytesIO(f)
-        wb = load_workbook(xlsx)
-        ws = wb.active
-
-        headers = [cell.value for cell in ws[1]]
-        s = set()
-        for key, value in companies.items():
-            s.add(value.legal_name)
-        new_companies_to_add = []
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            row_data = {headers[i]: cell for i, cell in enumerate(row)}
-            if not row_data.get('Legal name'):
-                continue
-            financials = {
-                'checking_account': safe_float(row_data.get('Encaisse - Comptes bancaires')),
-                'long_term_investments': safe_float(row_data.get('Placements long terme')),
-                'total_investments': safe_float(row_data.get('Placements totaux')),
-                'physical_assets': safe_float(row_data.get('Terrain et immeubles')),
-                'total_actives': safe_float(row_data.get('Total actif')),
-                'loans': safe_float(row_data.get('Hypothèques ou crédit potentiel')),
-                'total_passives': safe_float(row_data.get('Total Passif')),
-                'total_donations': safe_float(row_data.get('Total dons')),
-                'federal_revenue': safe_float(row_data.get('Revenus fédéraux')),
-                'provincial_revenue': safe_float(row_data.get('Revenus provinciaux')),
-                'municipal_revenue': safe_float(row_data.get('Revenus municipaux')),
-                'interest_and_banking_fees': safe_float(row_data.get('Intérêts et frais bancaires')),
-                'occupation_cost': safe_float(row_data.get("Coûts d'occupation")),
-                'professional_fees': safe_float(row_data.get('Honoraires professionnels')),
-                'salaries': safe_float(row_data.get('Salaires')),
-                'fixed_asset_depreciation': safe_float(row_data.get('Amortissement immobilisations')),
-                'others': safe_float(row_data.get('Autres')),
-                'total_expenses': safe_float(row_data.get('Total dépenses')),
-                'total_revenue': safe_float(row_data.get('Total des revenus')),
-                'timestamp': datetime.now()
-            }
-            if row_data.get('Legal name') not in s:
-                email = row_data['Contact Email'] if row_data['Contact Email'] is not None and isinstance(row_data['Contact Email'], str) else ''
-                company = {
-                    'legal_name': row_data.get('Legal name'),
-                    "is_existing_client": bool(row_data['IND_BNC']),
-                    "is_active": bool(row_data['CLIENT_ACTIF']),
-                    'company_phone_number': str(row_data['Contact Phone']) if row_data['Contact Phone'] is not None else '',
-                    'company_email': email,
-                    'company_website': '',
-                    'description': '',
-                    'fcc': 1 if row_data['FCC'] is not None else 0,
-                    'street_address': row_data['Mailing address'] if row_data['Mailing address'] is not None else '',
-                    'city': row_data['City'] if row_data['City'] is not None else '',
-                    'state_or_province': row_data['Province'] if row_data['Province'] is not None else '',
-                    'postal_code': row_data['Postal code'] if row_data['Postal code'] is not None else '',
-                    'country': 'CA',
-                    'contacts': [] if 'Contact Email' not in row_data else [
-                        {
-                            "id": generate_uuid_v4_without_special_chars(),
-                            "name": str(row_data['Directeur de compte']) if row_data['Directeur de compte'] is not None else '',
-                            "email": email,
-                            "phone_number": str(row_data['Contact Phone']) if row_data['Contact Phone'] is not None else ''
-                        }
-                    ],
-                    'actions': [],
-                    'comments': [],
-                    'news': [],
-                    'financials': [financials]
-                }
-                new_companies_to_add.append(company)
-            else:
-                await self.repository.update(self.client, {"$push": {"financials": financials}}, legal_name=row_data.get('Legal name'))
-        if len(new_companies_to_add) > 0:
-            await self.repository.create_many(self.client, new_companies_to_add)
-        return True
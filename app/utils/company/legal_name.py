@@ -0,0 +1,12 @@
+import unicodedata
+from typing import Any
+
+
+def legal_name_key(legal_name: Any) -> str:
+    """
+    Normalized legal name used to match imported rows against existing companies:
+    unicode-normalized, case-folded and with whitespace collapsed.
+    :param legal_name: Legal name as stored or read from a sheet
+    :return: matching key
+    """
+    return " ".join(unicodedata.normalize("NFKC", str(legal_name)).casefold().split())
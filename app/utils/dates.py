@@ -0,0 +1,17 @@
+from datetime import datetime, timezone
+
+
+def utc_now() -> datetime:
+    """
+    Current time as a naive UTC datetime, the form pymongo returns stored dates in.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def to_utc(value: datetime) -> datetime:
+    """
+    Normalize to naive UTC. Aware datetimes are converted; naive ones are taken to already be UTC.
+    """
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -0,0 +1,127 @@
+from fastapi import HTTPException, status
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.mime.image import MIMEImage
+from typing import List, Tuple
+import asyncio
+import base64
+import binascii
+import io
+import os
+import zipfile
+from app.models.email import EmlRequest
+
+EML_SENDER = os.environ.get("EML_SENDER", "sender@example.com")
+# Largest message accepted, measured as html body plus base64 image payloads
+EML_MAX_BYTES = int(os.environ.get("EML_MAX_BYTES", 10 * 1024 * 1024))
+# Messages above this size are built in a worker thread so decoding does not stall the event loop
+EML_OFFLOAD_BYTES = int(os.environ.get("EML_OFFLOAD_BYTES", 256 * 1024))
+# Recipients rendered, zipped and recorded per step of a batch
+EML_BATCH_CHUNK_SIZE = int(os.environ.get("EML_BATCH_CHUNK_SIZE", 50))
+
+
+def payload_size(request: EmlRequest) -> int:
+    return len(request.html_body) + sum(len(image) for image in request.images)
+
+
+def check_payload_size(size: int) -> None:
+    if size > EML_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Email payload of {size} bytes exceeds the {EML_MAX_BYTES} byte limit."
+        )
+
+
+def decode_image(idx: int, image_base64: str) -> MIMEImage:
+    """
+    Decode one base64 image into an inline part referenced as cid:image{idx} from the html body.
+    """
+    try:
+        mime_img = MIMEImage(base64.b64decode(image_base64))
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid image data at index {idx}")
+    mime_img.add_header("Content-ID", f"<image{idx}>")
+    mime_img.add_header("Content-Disposition", "inline", filename=f"image{idx}.png")
+    return mime_img
+
+
+def build_eml(subject: str, to_email: str, html_body: str, images: List[MIMEImage], sender: str = EML_SENDER) -> bytes:
+    msg = MIMEMultipart("related")
+    msg["Subject"] = subject
+    msg["To"] = to_email
+    msg["From"] = sender
+    msg.attach(MIMEText(html_body, "html"))
+    for mime_img in images:
+        msg.attach(mime_img)
+    return msg.as_bytes()
+
+
+def decode_images(images: List[str]) -> List[MIMEImage]:
+    return [decode_image(idx, image) for idx, image in enumerate(images)]
+
+
+def render_eml(request: EmlRequest) -> bytes:
+    return build_eml(request.subject, request.to_email, request.html_body, decode_images(request.images))
+
+
+async def generate_eml_bytes(request: EmlRequest) -> bytes:
+    """
+    Build the .eml in memory. Oversized payloads are rejected with 413 before any decoding.
+    """
+    size = payload_size(request)
+    check_payload_size(size)
+    if size > EML_OFFLOAD_BYTES:
+        return await asyncio.to_thread(render_eml, request)
+    return render_eml(request)
+
+
+class _ZipBuffer(io.RawIOBase):
+    """
+    Unseekable sink for ZipFile; whatever has been written since the last drain is handed out.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._data += b
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = bytes(self._data)
+        self._data.clear()
+        return data
+
+
+class ZipStream:
+    """
+    Incrementally built zip archive: add() and close() return the archive bytes produced by that call,
+    so entries can be streamed out without holding the whole archive.
+    """
+
+    def __init__(self):
+        self._buffer = _ZipBuffer()
+        self._zip = zipfile.ZipFile(self._buffer, "w", compression=zipfile.ZIP_DEFLATED)
+
+    def add(self, name: str, data: bytes) -> bytes:
+        self._zip.writestr(name, data)
+        return self._buffer.drain()
+
+    def close(self) -> bytes:
+        self._zip.close()
+        return self._buffer.drain()
+
+
+def zip_emls(zip_stream: ZipStream, messages: List[Tuple[str, str, str, str]], images: List[MIMEImage], sender: str) -> bytes:
+    """
+    Render (file name, subject, to, html) messages into `zip_stream` and return the bytes added.
+    The decoded image parts are shared by every message.
+    """
+    out = bytearray()
+    for name, subject, to_email, html_body in messages:
+        out += zip_stream.add(name, build_eml(subject, to_email, html_body, images, sender))
+    return bytes(out)
@@ -0,0 +1,34 @@
+from typing import Any
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+import orjson
+import os
+
+# Opt-in: render responses with orjson and let read routes serialize their models directly
+FAST_JSON = os.environ.get("FAST_JSON", "false").lower() == "true"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson; datetimes are encoded natively and ObjectIds as strings.
+    """
+
+    def render(self, content: Any) -> bytes:
+        # UTC_Z matches pydantic's "Z" suffix for UTC datetimes
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+def model_response(adapter: TypeAdapter, content: Any, status_code: int = 200) -> ORJSONResponse:
+    """
+    Render models built from database documents without FastAPI's response_model pass, which would
+    dump, validate and serialize them again. pydantic only applies aliases and field serializers here,
+    datetimes and the remaining encoding are left to orjson.
+    """
+    return ORJSONResponse(adapter.dump_python(content, by_alias=True), status_code=status_code)
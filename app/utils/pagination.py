@@ -0,0 +1,87 @@
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Tuple
+from bson import json_util
+from fastapi import HTTPException, status
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+# A sort key is an ordered list of (field, direction) pairs and must end with a unique field (usually _id)
+SortKey = List[Tuple[str, int]]
+
+
+def encode_cursor(doc: Dict, sort: SortKey) -> str:
+    """
+    Build an opaque cursor from the sort key values of the last document of a page.
+    """
+    values = [doc.get(field) for field, _ in sort]
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, sort: SortKey) -> Optional[List[Any]]:
+    """
+    Decode a cursor produced by encode_cursor. An empty cursor means the first page.
+    """
+    if not cursor:
+        return None
+    try:
+        values = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+    return values
+
+
+def keyset_filter(sort: SortKey, values: Optional[List[Any]]) -> Dict:
+    """
+    Filter matching the documents strictly after `values` in `sort` order, e.g. for
+    (legal_name, _id): {"$or": [{"legal_name": {"$gt": a}}, {"legal_name": a, "_id": {"$gt": b}}]}
+    """
+    if values is None:
+        return {}
+    branches = []
+    for i, (field, direction) in enumerate(sort):
+        branch = {sort[j][0]: values[j] for j in range(i)}
+        branch[field] = {"$gt" if direction > 0 else "$lt": values[i]}
+        branches.append(branch)
+    return branches[0] if len(branches) == 1 else {"$or": branches}
+
+
+def with_keyset(filter: Optional[Dict], sort: SortKey, cursor: str) -> Dict:
+    """
+    Combine a base filter with the keyset filter for the given cursor.
+    """
+    after = keyset_filter(sort, decode_cursor(cursor, sort))
+    base = filter or {}
+    if not after:
+        return base
+    if not base:
+        return after
+    return {"$and": [base, after]}
+
+
+def split_page(docs: List[Dict], sort: SortKey, limit: int) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Given up to limit + 1 documents, return the page and the cursor of the next one (if any).
+    """
+    if limit < 1:
+        raise ValueError(f"Page limit must be at least 1, got {limit}.")
+    if len(docs) > limit:
+        docs = docs[:limit]
+        return docs, encode_cursor(docs[-1], sort)
+    return docs, None
+
+
+async def find_page(
+    collection: AsyncIOMotorCollection,
+    filter: Optional[Dict],
+    sort: SortKey,
+    limit: int,
+    cursor: str,
+    projection: Optional[Dict] = None
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Fetch one keyset page. Every page costs the same index range scan, no matter how deep it is.
+    """
+    docs = await collection.find(with_keyset(filter, sort, cursor), projection).sort(sort).limit(limit + 1).to_list(None)
+    return split_page(docs, sort, limit)
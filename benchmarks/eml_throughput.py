@@ -0,0 +1,69 @@
+"""
+Throughput of POST /api/v1/emails/generate-eml/ at 10 and 100 concurrent requests.
+
+Runs the app in-process through httpx's ASGI transport (no server, no database needed). From the repository root:
+
+    python -m benchmarks.eml_throughput --requests 500 --image-kb 4 512
+
+Each --image-kb value is benchmarked separately; payloads above EML_OFFLOAD_BYTES are built in a
+worker thread. Requires httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import base64
+import os
+import statistics
+import time
+import httpx
+from app.main import app
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def build_payload(image_kb: int, images: int) -> dict:
+    # The PNG signature lets MIMEImage detect the subtype; the rest is filler
+    image = base64.b64encode(PNG_SIGNATURE + os.urandom(image_kb * 1024)).decode()
+    return {
+        "subject": "Benchmark",
+        "to_email": "someone@example.com",
+        "html_body": "".join(f'<p>Hello</p><img src="cid:image{i}">' for i in range(images)),
+        "images": [image] * images,
+    }
+
+
+async def run_level(http: httpx.AsyncClient, payload: dict, concurrency: int, total: int) -> tuple:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await http.post("/api/v1/emails/generate-eml/", json=payload)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return total / (time.perf_counter() - start), latencies
+
+
+async def run(total: int, image_sizes: list, images: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        for image_kb in image_sizes:
+            payload = build_payload(image_kb, images)
+            for concurrency in (10, 100):
+                rps, latencies = await run_level(http, payload, concurrency, total)
+                print(
+                    f"{images}x{image_kb}KiB images, concurrency={concurrency}: {rps:.0f} req/s "
+                    f"p50={statistics.median(latencies):.1f}ms max={max(latencies):.1f}ms"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--images", type=int, default=2)
+    parser.add_argument("--image-kb", type=int, nargs="+", default=[4, 512])
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.image_kb, args.images))
@@ -0,0 +1,149 @@
+"""
+Latency of GET /api/v1/companies/ while a large import runs on the same worker.
+
+Start the API (single uvicorn worker) against a scratch database, then from the repository root:
+
+    python -m benchmarks.import_latency --base-url http://localhost:8000 --rows 50000
+
+Compare IMPORT_EXECUTOR=thread and IMPORT_EXECUTOR=process on the server side.
+Requires httpx (pip install httpx).
+
+Without a server or database, --parse-only measures how long the event loop stalls while the
+workbook is parsed inline on the loop (the old import path), in the thread pool and in the process pool:
+
+    python -m benchmarks.import_latency --parse-only --rows 50000
+"""
+import argparse
+import asyncio
+import queue
+import statistics
+import tempfile
+import threading
+import time
+import httpx
+from openpyxl import Workbook
+from app.utils.company import company_excel_util
+
+HEADERS = [
+    "Legal name", "Contact Email", "Contact Phone", "IND_BNC", "CLIENT_ACTIF", "FCC", "Mailing address",
+    "City", "Province", "Postal code", "Directeur de compte", "Total actif", "Total Passif", "Total dons",
+]
+
+
+def build_workbook(rows: int) -> str:
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(HEADERS)
+    for i in range(rows):
+        ws.append([
+            f"Benchmark Co {i}", f"contact{i}@example.com", "5145550000", 1, 1, None, f"{i} Main St",
+            "Montreal", "QC", "H0H 0H0", "Manager", i * 10.0, i * 5.0, i * 1.0,
+        ])
+    path = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False).name
+    wb.save(path)
+    return path
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+async def poll_listing(http: httpx.AsyncClient, until: asyncio.Event, samples: list):
+    while not until.is_set():
+        start = time.perf_counter()
+        await http.get("/api/v1/companies/", params={"limit": 20})
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.01)
+
+
+async def run(base_url: str, rows: int, baseline_seconds: float):
+    path = build_workbook(rows)
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as http:
+        done = asyncio.Event()
+        baseline = []
+        poller = asyncio.create_task(poll_listing(http, done, baseline))
+        await asyncio.sleep(baseline_seconds)
+        done.set()
+        await poller
+
+        done = asyncio.Event()
+        during = []
+        poller = asyncio.create_task(poll_listing(http, done, during))
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            job = (await http.post("/api/v1/companies/import", files={"file": ("bench.xlsx", f)})).json()
+        # The import runs as a background job; poll until it finishes
+        while job["status"] in ("PENDING", "RUNNING"):
+            await asyncio.sleep(0.5)
+            job = (await http.get(f"/api/v1/companies/import/{job['id']}")).json()
+        import_seconds = time.perf_counter() - start
+        done.set()
+        await poller
+
+    print(f"import of {rows} rows: {job['status']} in {import_seconds:.1f}s "
+          f"(inserted={job['inserted']} updated={job['updated']} failed={job['failed']})")
+    for label, samples in (("idle", baseline), ("during import", during)):
+        if samples:
+            print(
+                f"GET /companies/ {label}: n={len(samples)} "
+                f"p50={statistics.median(samples):.1f}ms p99={percentile(samples, 99):.1f}ms max={max(samples):.1f}ms"
+            )
+
+
+async def probe_loop(until: asyncio.Event, samples: list, interval: float = 0.01):
+    """
+    Record how late each `interval` sleep wakes up; a blocked loop shows up as lag.
+    """
+    while not until.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def parse_with(mode: str, path: str) -> tuple:
+    done = asyncio.Event()
+    lag = []
+    prober = asyncio.create_task(probe_loop(done, lag))
+    await asyncio.sleep(0.1)
+    start = time.perf_counter()
+    rows = 0
+    if mode == "inline":
+        out_queue = queue.Queue()
+        company_excel_util.produce_batches(path, company_excel_util.IMPORT_CHUNK_SIZE, out_queue, threading.Event())
+        while (batch := out_queue.get()) is not None:
+            rows += len(batch)
+    else:
+        company_excel_util.IMPORT_EXECUTOR = mode
+        try:
+            async for batch in company_excel_util.parse_in_executor(path, company_excel_util.IMPORT_CHUNK_SIZE):
+                rows += len(batch)
+        finally:
+            company_excel_util.shutdown_import_executor()
+    seconds = time.perf_counter() - start
+    done.set()
+    await prober
+    return rows, seconds, lag
+
+
+async def run_parse_only(rows: int):
+    path = build_workbook(rows)
+    for mode in ("inline", "thread", "process"):
+        parsed, seconds, lag = await parse_with(mode, path)
+        print(
+            f"parse {parsed} rows {mode:>7}: {seconds:.1f}s, event loop lag n={len(lag)} "
+            f"p50={statistics.median(lag):.1f}ms p99={percentile(lag, 99):.1f}ms max={max(lag):.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--baseline-seconds", type=float, default=5.0)
+    parser.add_argument("--parse-only", action="store_true")
+    args = parser.parse_args()
+    if args.parse_only:
+        asyncio.run(run_parse_only(args.rows))
+    else:
+        asyncio.run(run(args.base_url, args.rows, args.baseline_seconds))
@@ -0,0 +1,87 @@
+"""
+Serialization CPU for one 1,000-company listing page, from built CompanyBase models to response bytes.
+From the repository root:
+
+    python -m benchmarks.json_serialization --companies 1000 --repeat 100
+
+Compares FastAPI's response_model path (serialize_response + JSONResponse), the same path rendered
+with ORJSONResponse, and the FAST_JSON route path (model_response). Runs in-process, no database needed.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import List
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+from app.models.company import CompanyBase
+from app.utils.fast_json import ORJSONResponse, model_response
+
+
+def build_docs(count: int) -> List[dict]:
+    now = datetime.now()
+    return [
+        {
+            "_id": ObjectId(),
+            "legal_name": f"Benchmark Co {i}",
+            "is_active": True,
+            "is_existing_client": i % 2 == 0,
+            "financials": {"timestamp": now, "total_actives": i * 10.0, "total_passives": i * 5.0, "loans": 1.0},
+            "contact_name": "Jane Doe",
+            "latest_email_datetime": "2026-01-01T00:00:00.000Z",
+            "latest_email_template": "follow-up",
+            "email_summary": {"latest_datetime": now, "latest_template": "follow-up", "count": 3, "sent_count": 2, "answered_count": 1},
+        }
+        for i in range(count)
+    ]
+
+
+def cpu_ms(fn, repeat: int) -> float:
+    """
+    Best-of-`repeat` process CPU time of one call, in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        samples.append((time.process_time() - start) * 1000)
+    return min(samples)
+
+
+def run(count: int, repeat: int):
+    models = [CompanyBase(**doc) for doc in build_docs(count)]
+    field = create_response_field(name="Response_list_companies", type_=List[CompanyBase])
+    adapter = TypeAdapter(List[CompanyBase])
+    loop = asyncio.new_event_loop()
+
+    def fastapi_default():
+        return JSONResponse(loop.run_until_complete(serialize_response(field=field, response_content=models))).body
+
+    def fastapi_orjson():
+        return ORJSONResponse(loop.run_until_complete(serialize_response(field=field, response_content=models))).body
+
+    def fast_path():
+        return model_response(adapter, models).body
+
+    assert json.loads(fastapi_default()) == json.loads(fastapi_orjson()) == json.loads(fast_path())
+    results = [
+        (label, cpu_ms(fn, repeat))
+        for label, fn in (("response_model + JSONResponse", fastapi_default),
+                          ("response_model + ORJSONResponse", fastapi_orjson),
+                          ("model_response (FAST_JSON)", fast_path))
+    ]
+    baseline = results[0][1]
+    for label, ms in results:
+        print(f"{label:34} {ms:7.2f} ms per {count}-company page ({baseline / ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--companies", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+    run(args.companies, args.repeat)
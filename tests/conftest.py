@@ -0,0 +1,15 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db import get_mongo_client
+
+
+@pytest.fixture
+def api():
+    """
+    Test client with the database dependency stubbed out. The lifespan is not run, so nothing
+    connects to Mongo; tests override the services they need through app.dependency_overrides.
+    """
+    app.dependency_overrides[get_mongo_client] = lambda: None
+    yield TestClient(app)
+    app.dependency_overrides.clear()
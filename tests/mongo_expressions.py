@@ -0,0 +1,128 @@
+"""
+Minimal evaluator for the aggregation expressions the repositories build, so update pipelines and
+$lookup projections can be checked against documents without a MongoDB server. Only the operators
+used in app/repositories are implemented; anything else raises.
+"""
+import copy
+from typing import Any, Dict, List
+from bson import ObjectId
+
+BSON_TYPES = {dict: "object", list: "array", str: "string", int: "int", float: "double", bool: "bool", type(None): "null"}
+
+
+def _path(value: Any, parts: List[str]) -> Any:
+    for part in parts:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def evaluate(expr: Any, doc: Dict, variables: Dict = None) -> Any:
+    variables = variables or {}
+    if isinstance(expr, str):
+        if expr.startswith("$$"):
+            name, *parts = expr[2:].split(".")
+            return _path(variables[name], parts)
+        if expr.startswith("$"):
+            return _path(doc, expr[1:].split("."))
+        return expr
+    if isinstance(expr, list):
+        return [evaluate(item, doc, variables) for item in expr]
+    if not isinstance(expr, dict):
+        return expr
+    if len(expr) == 1 and next(iter(expr)).startswith("$"):
+        op, args = next(iter(expr.items()))
+        return _operator(op, args, doc, variables)
+    return {key: evaluate(value, doc, variables) for key, value in expr.items()}
+
+
+def _operator(op: str, args: Any, doc: Dict, variables: Dict) -> Any:
+    def ev(e):
+        return evaluate(e, doc, variables)
+
+    if op == "$literal":
+        return copy.deepcopy(args)
+    if op == "$cond":
+        condition, then, otherwise = args
+        return ev(then) if ev(condition) else ev(otherwise)
+    if op == "$isArray":
+        return isinstance(ev(args[0] if isinstance(args, list) else args), list)
+    if op == "$eq":
+        left, right = ev(args)
+        return left == right
+    if op == "$type":
+        value = ev(args)
+        return "missing" if value is None and isinstance(args, str) and _missing(args, doc) else BSON_TYPES.get(type(value), "unknown")
+    if op == "$ifNull":
+        *candidates, fallback = args
+        for candidate in candidates:
+            value = ev(candidate)
+            if value is not None:
+                return value
+        return ev(fallback)
+    if op == "$arrayElemAt":
+        array, index = ev(args)
+        if not isinstance(array, list) or not -len(array) <= index < len(array):
+            return None
+        return array[index]
+    if op == "$mergeObjects":
+        merged = {}
+        for part in ev(args):
+            merged.update(part or {})
+        return merged
+    if op == "$concatArrays":
+        return [item for part in ev(args) for item in part]
+    if op == "$let":
+        scope = {**variables, **{name: ev(value) for name, value in args["vars"].items()}}
+        return evaluate(args["in"], doc, scope)
+    if op == "$filter":
+        name = args.get("as", "this")
+        return [
+            item for item in (ev(args["input"]) or [])
+            if evaluate(args["cond"], doc, {**variables, name: item})
+        ]
+    if op == "$map":
+        name = args.get("as", "this")
+        return [evaluate(args["in"], doc, {**variables, name: item}) for item in (ev(args["input"]) or [])]
+    if op == "$convert":
+        value = ev(args["input"])
+        if value is None:
+            return ev(args.get("onNull"))
+        assert args["to"] == "objectId"
+        return value if isinstance(value, ObjectId) else ObjectId(value) if ObjectId.is_valid(value) else ev(args.get("onError"))
+    raise NotImplementedError(op)
+
+
+def _missing(path: str, doc: Dict) -> bool:
+    *parents, last = path[1:].split(".")
+    parent = _path(doc, parents) if parents else doc
+    return not isinstance(parent, dict) or last not in parent
+
+
+def project(doc: Dict, projection: Dict, variables: Dict = None) -> Dict:
+    """
+    Apply an inclusion projection whose values are 1 or expressions; _id is kept unless excluded.
+    """
+    out = {"_id": doc["_id"]} if projection.get("_id", 1) and "_id" in doc else {}
+    for field, spec in projection.items():
+        if field == "_id":
+            continue
+        if spec == 1:
+            if field in doc:
+                out[field] = doc[field]
+        else:
+            out[field] = evaluate(spec, doc, variables)
+    return out
+
+
+def apply_update_pipeline(doc: Dict, pipeline: List[Dict]) -> Dict:
+    """
+    Apply the $set stages of an update pipeline, each seeing the output of the previous one.
+    """
+    doc = copy.deepcopy(doc)
+    for stage in pipeline:
+        (name, fields), = stage.items()
+        assert name == "$set", name
+        doc.update({field: evaluate(expr, doc) for field, expr in fields.items()})
+    return doc
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from app.models.reminder import ReminderSummary
+from app.repositories.reminder import ReminderRepository
+from app.services import reminder as reminder_service
+from app.services.reminder import ReminderService
+from app.utils import cache
+from app.utils.cache import TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return clock
+
+
+def test_entries_expire_after_ttl(clock):
+    ttl = TTLCache(10)
+    ttl.set("a", 1)
+    clock.now += 9.9
+    assert ttl.get("a") == 1
+    clock.now += 0.2
+    assert ttl.get("a") is None
+
+
+def test_least_recently_set_entry_is_evicted(clock):
+    ttl = TTLCache(10, max_entries=2)
+    ttl.set("a", 1)
+    ttl.set("b", 2)
+    ttl.set("a", 3)
+    ttl.set("c", 4)
+    assert ttl.get("b") is None
+    assert (ttl.get("a"), ttl.get("c")) == (3, 4)
+
+
+def test_invalidate_one_or_all(clock):
+    ttl = TTLCache(10)
+    ttl.set("a", 1)
+    ttl.set("b", 2)
+    ttl.invalidate("a")
+    assert ttl.get("a") is None and ttl.get("b") == 2
+    ttl.invalidate()
+    assert ttl.get("b") is None
+
+
+def test_reminder_summary_is_cached_until_a_write(monkeypatch):
+    calls = []
+
+    async def summary(client, now, end_of_day, max_companies):
+        calls.append((now, end_of_day))
+        return {"overdue": 1, "due_today": 2, "upcoming": 3, "by_company": [{"company_id": "c", "overdue": 1}]}
+
+    monkeypatch.setattr(ReminderRepository, "summary", staticmethod(summary))
+    monkeypatch.setattr(reminder_service, "summary_cache", TTLCache(30))
+
+    first = asyncio.run(ReminderService.summary(None))
+    assert isinstance(first, ReminderSummary) and first.due_today == 2 and first.by_company[0].company_id == "c"
+    assert asyncio.run(ReminderService.summary(None)) is first
+    now, end_of_day = calls[0]
+    assert end_of_day.date() > now.date() and end_of_day.time().hour == 0
+
+    reminder_service.summary_cache.invalidate()
+    asyncio.run(ReminderService.summary(None))
+    assert len(calls) == 2
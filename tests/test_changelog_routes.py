@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+from bson import ObjectId
+from app.db import get_mongo_client
+
+COMPANY = str(ObjectId())
+OTHER = str(ObjectId())
+START = datetime(2026, 1, 1)
+
+
+def matches(doc, query):
+    for field, condition in query.items():
+        if field == "$and":
+            if not all(matches(doc, part) for part in condition):
+                return False
+        elif field == "$or":
+            if not any(matches(doc, part) for part in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = doc.get(field)
+            for op, operand in condition.items():
+                if value is None or not {
+                    "$gt": value > operand, "$gte": value >= operand,
+                    "$lt": value < operand, "$lte": value <= operand,
+                }[op]:
+                    return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, sort):
+        for field, direction in reversed(sort):
+            self.docs.sort(key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def limit(self, limit):
+        self.docs = self.docs[:limit]
+        return self
+
+    async def to_list(self, length):
+        return self.docs
+
+
+class InMemoryCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        return Cursor([dict(doc) for doc in self.docs if matches(doc, query)])
+
+
+class InMemoryClient:
+    def __init__(self, docs):
+        self.changelog = InMemoryCollection(docs)
+
+    def collection(self, name):
+        assert name == "changelog"
+        return self.changelog
+
+
+def log(minutes, operation, company_id=None, user="ann"):
+    return {"_id": ObjectId(), "operation": operation, "updates": {}, "date": START + timedelta(minutes=minutes),
+            "user": user, "company_id": company_id}
+
+
+# Two logs share a timestamp so cursor continuation has to break the tie on _id
+LOGS = [
+    log(0, "CREATE_CONTACT", COMPANY),
+    log(1, "UPDATE_DETAIL", COMPANY),
+    log(2, "CREATE_CONTACT", OTHER),
+    log(2, "CREATE_CONTACT", COMPANY),
+    log(3, "IMPORT_COMPANIES"),
+    log(4, "CREATE_CONTACT", COMPANY, user="bob"),
+]
+
+
+def newest_first(docs):
+    return [str(doc["_id"]) for doc in sorted(docs, key=lambda doc: (doc["date"], doc["_id"]), reverse=True)]
+
+
+def get_all(api, **params):
+    ids, cursor, pages = [], "", 0
+    while cursor is not None:
+        response = api.get("/api/v1/changelog", params={**params, "cursor": cursor})
+        assert response.status_code == 200
+        body = response.json()
+        ids += [item["id"] for item in body["items"]]
+        cursor = body["nextCursor"]
+        pages += 1
+    return ids, pages
+
+
+def use(api, docs):
+    client = InMemoryClient(docs)
+    api.app.dependency_overrides[get_mongo_client] = lambda: client
+    return client
+
+
+def test_filter_by_operation(api):
+    use(api, LOGS)
+    response = api.get("/api/v1/changelog", params={"operation": "CREATE_CONTACT"})
+    body = response.json()
+    assert [item["id"] for item in body["items"]] == newest_first(doc for doc in LOGS if doc["operation"] == "CREATE_CONTACT")
+    assert {item["operation"] for item in body["items"]} == {"CREATE_CONTACT"}
+    assert body["nextCursor"] is None
+
+
+def test_unknown_operation_is_rejected(api):
+    use(api, LOGS)
+    assert api.get("/api/v1/changelog", params={"operation": "NOPE"}).status_code == 422
+
+
+def test_filter_by_company(api):
+    client = use(api, LOGS)
+    response = api.get("/api/v1/changelog", params={"companyId": COMPANY, "operation": "CREATE_CONTACT"})
+    ids = [item["id"] for item in response.json()["items"]]
+    assert ids == newest_first(doc for doc in LOGS if doc["company_id"] == COMPANY and doc["operation"] == "CREATE_CONTACT")
+    assert client.changelog.queries[0] == {"operation": "CREATE_CONTACT", "company_id": COMPANY}
+
+
+def test_cursor_continues_without_gaps_or_repeats(api):
+    use(api, LOGS)
+    ids, pages = get_all(api, limit=2)
+    assert ids == newest_first(LOGS) and pages == 3
+
+
+def test_cursor_continues_within_a_filter(api):
+    use(api, LOGS)
+    ids, pages = get_all(api, limit=1, companyId=COMPANY)
+    assert ids == newest_first(doc for doc in LOGS if doc["company_id"] == COMPANY) and pages == 4
+
+
+def test_invalid_cursor_is_a_bad_request(api):
+    use(api, LOGS)
+    assert api.get("/api/v1/changelog", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from pymongo.errors import BulkWriteError
+from app.repositories.changelog import ChangelogRepository
+from app.services.changelog_sink import ChangelogSink
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    batches = []
+
+    async def insert_many(client, logs):
+        batches.append(list(logs))
+        return len(logs)
+
+    monkeypatch.setattr(ChangelogRepository, "insert_many", staticmethod(insert_many))
+    return batches
+
+
+def test_logs_are_written_in_batches_and_drained_on_stop(batches):
+    async def main():
+        sink = ChangelogSink(max_queue=100, batch_size=3, flush_interval=10)
+        sink.start(None)
+        for idx in range(7):
+            assert sink.submit(idx)
+        await sink.stop()
+        return sink
+
+    sink = asyncio.run(main())
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+    assert sink.stats() == {"queue_depth": 0, "dropped": 0, "written": 7, "failed": 0}
+
+
+def test_partial_batch_is_written_after_the_flush_interval(batches):
+    async def main():
+        sink = ChangelogSink(max_queue=100, batch_size=50, flush_interval=0.05)
+        sink.start(None)
+        sink.submit("a")
+        await asyncio.sleep(0.2)
+        written = list(batches)
+        await sink.stop()
+        return written
+
+    assert asyncio.run(main()) == [["a"]]
+
+
+def test_logs_are_dropped_when_stopped_or_full(batches):
+    async def main():
+        sink = ChangelogSink(max_queue=2, batch_size=10, flush_interval=10)
+        assert not sink.submit("before start")
+        sink.start(None)
+        # The writer task has not run yet, so the queue fills up
+        accepted = [sink.submit(idx) for idx in range(3)]
+        await sink.stop()
+        assert not sink.submit("after stop")
+        return sink, accepted
+
+    sink, accepted = asyncio.run(main())
+    assert accepted == [True, True, False]
+    assert sink.dropped == 3 and sink.written == 2
+
+
+def test_failed_writes_are_counted(monkeypatch):
+    async def insert_many(client, logs):
+        raise BulkWriteError({"nInserted": 1, "writeErrors": [{}]})
+
+    monkeypatch.setattr(ChangelogRepository, "insert_many", staticmethod(insert_many))
+
+    async def main():
+        sink = ChangelogSink(max_queue=10, batch_size=10, flush_interval=10)
+        sink.start(None)
+        sink.submit("a")
+        sink.submit("b")
+        await sink.stop()
+        return sink
+
+    sink = asyncio.run(main())
+    assert (sink.written, sink.failed) == (1, 1)
@@ -0,0 +1,63 @@
+import asyncio
+from bson import ObjectId
+from app.repositories.company import CompanyRepository
+from tests.mongo_expressions import apply_update_pipeline
+
+COMPANY_ID = ObjectId()
+FIRST = {"checking_account": 100.0, "loans": 50.0, "salaries": 10.0, "timestamp": "2025-01-01T00:00:00"}
+
+
+def append(doc, partial):
+    return apply_update_pipeline(doc, CompanyRepository._append_financials_pipeline(partial))
+
+
+def test_snapshot_merges_non_null_fields_over_the_last_one():
+    doc = append({"_id": COMPANY_ID, "financials": [{"checking_account": 1.0}, FIRST]}, {"checking_account": 200.0, "loans": None})
+    history = doc["financials"]
+    assert history[:2] == [{"checking_account": 1.0}, FIRST]
+    latest = history[2]
+    assert (latest["checking_account"], latest["loans"], latest["salaries"]) == (200.0, 50.0, 10.0)
+    assert latest["timestamp"] == FIRST["timestamp"] and latest["datetime"] > FIRST["timestamp"]
+
+
+def test_string_values_are_not_read_as_field_paths():
+    doc = append({"_id": COMPANY_ID, "financials": [FIRST], "salaries": 999}, {"notes": "$salaries"})
+    assert doc["financials"][-1]["notes"] == "$salaries"
+
+
+def test_legacy_single_snapshot_and_missing_history():
+    legacy = append({"_id": COMPANY_ID, "financials": FIRST}, {"loans": 75.0})
+    assert legacy["financials"][0] == FIRST and legacy["financials"][1]["loans"] == 75.0
+    fresh = append({"_id": COMPANY_ID}, {"loans": 75.0, "timestamp": "2026-01-01"})
+    assert len(fresh["financials"]) == 1 and fresh["financials"][0]["timestamp"] == "2026-01-01"
+
+
+class Collection:
+    def __init__(self, doc):
+        self.doc = doc
+        self.calls = 0
+
+    async def update_one(self, query, pipeline):
+        self.calls += 1
+        assert query == {"_id": COMPANY_ID} and isinstance(pipeline, list)
+        before = self.doc
+        self.doc = apply_update_pipeline(before, pipeline)
+
+        class Result:
+            modified_count = int(self.doc != before)
+        return Result()
+
+
+class Client:
+    def __init__(self, doc):
+        self.company = Collection(doc)
+
+    def collection(self, name):
+        return self.company
+
+
+def test_append_is_a_single_update():
+    client = Client({"_id": COMPANY_ID, "financials": [FIRST]})
+    assert asyncio.run(CompanyRepository.append_financials_snapshot(client, str(COMPANY_ID), {"loans": 1.0}))
+    assert client.company.calls == 1
+    assert [snapshot["loans"] for snapshot in client.company.doc["financials"]] == [50.0, 1.0]
@@ -0,0 +1,124 @@
+import asyncio
+import os
+import pytest
+from pymongo.errors import BulkWriteError
+from app.models.imports import ImportSummary
+from app.utils.company.company_excel_util import CompanyExcelUtil, row_to_company, row_to_financials, spool_upload
+from app.utils.company.legal_name import legal_name_key
+
+ROW = {
+    "Legal name": "  ACME   Société ", "Contact Email": "a@b.c", "Contact Phone": 5145550000, "IND_BNC": 1,
+    "CLIENT_ACTIF": 0, "FCC": None, "Mailing address": None, "City": "Montréal", "Province": "QC",
+    "Postal code": None, "Directeur de compte": "Jane", "Total actif": "12.5",
+}
+
+
+def test_legal_name_key_normalises_case_width_and_whitespace():
+    assert legal_name_key("  ACME   Société ") == legal_name_key("acme société") == "acme société"
+    assert legal_name_key("ＡＣＭＥ") == "acme"
+    assert legal_name_key(None) == "none"
+
+
+def test_row_to_company_sets_matching_key():
+    company = row_to_company(ROW, row_to_financials(ROW))
+    assert company["legal_name_key"] == "acme société"
+    assert company["financials"][0]["total_actives"] == 12.5
+    assert company["contacts"][0]["email"] == "a@b.c"
+
+
+class FakeRepository:
+    def __init__(self, duplicate_indexes=()):
+        self.duplicate_indexes = duplicate_indexes
+        self.appended = []
+
+    async def create_many(self, client, companies):
+        errors = [{"index": i, "code": 11000, "errmsg": "E11000"} for i in self.duplicate_indexes]
+        raise BulkWriteError({"nInserted": len(companies) - len(errors), "writeErrors": errors})
+
+    async def bulk_append_financials(self, client, appends):
+        self.appended.extend(appends)
+
+        class Result:
+            matched_count = len(appends)
+        return Result()
+
+
+def test_duplicate_inserts_fall_back_to_appending_financials():
+    repository = FakeRepository(duplicate_indexes=[1])
+    companies = [row_to_company({**ROW, "Legal name": name}, {"n": name}) for name in ("A", "B")]
+    summary = ImportSummary()
+    asyncio.run(CompanyExcelUtil(None, repository)._flush(companies, [], summary))
+    assert repository.appended == [("b", {"n": "B"})]
+    assert (summary.inserted, summary.matched, summary.failed) == (1, 1, 0)
+
+
+class BatchRepository:
+    def __init__(self, existing):
+        self.existing = set(existing)
+        self.inserted = []
+        self.appended = []
+
+    async def find_existing_legal_name_keys(self, client, keys):
+        return {key for key in keys if key in self.existing}
+
+    async def create_many(self, client, companies):
+        self.inserted.append([company["legal_name_key"] for company in companies])
+
+        class Result:
+            inserted_ids = list(range(len(companies)))
+        return Result()
+
+    async def bulk_append_financials(self, client, appends):
+        self.appended.append([key for key, _ in appends])
+
+        class Result:
+            matched_count = len(appends)
+        return Result()
+
+
+def test_import_writes_each_batch_with_one_insert_and_one_append(tmp_path, monkeypatch):
+    from openpyxl import Workbook
+    from app.utils.company import company_excel_util
+    monkeypatch.setattr(company_excel_util, "IMPORT_CHUNK_SIZE", 3)
+    wb = Workbook()
+    wb.active.append(list(ROW))
+    for name in ("Old", "New", "new ", "Other", None, "Old"):
+        wb.active.append(list({**ROW, "Legal name": name}.values()))
+    path = str(tmp_path / "import.xlsx")
+    wb.save(path)
+
+    repository = BatchRepository(existing={"old"})
+    summary = asyncio.run(CompanyExcelUtil(None, repository).parse_imported_data(path))
+    # Rows without a legal name are skipped; a repeated new company in a batch appends to the one inserted
+    assert repository.inserted == [["new"], ["other"]]
+    assert repository.appended == [["old", "new"], ["old"]]
+    assert (summary.rows_processed, summary.inserted, summary.matched, summary.failed) == (5, 2, 3, 0)
+
+
+class Upload:
+    def __init__(self, chunks, fail_after=None):
+        self.chunks = list(chunks)
+        self.fail_after = fail_after
+        self.reads = 0
+
+    async def read(self, size):
+        if self.fail_after is not None and self.reads >= self.fail_after:
+            raise ConnectionResetError("client went away")
+        self.reads += 1
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+def test_spool_upload_copies_the_upload():
+    path = asyncio.run(spool_upload(Upload([b"abc", b"def"])))
+    try:
+        with open(path, "rb") as f:
+            assert f.read() == b"abcdef"
+    finally:
+        os.remove(path)
+
+
+def test_spool_upload_removes_the_partial_file_on_failure(monkeypatch, tmp_path):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(spool_upload(Upload([b"abc", b"def"], fail_after=1)))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.models.payloads import UpdateCompanyPayload
+from app.repositories.company import CompanyRepository
+from app.db import get_mongo_client
+from app.services.company import CompanyService
+from tests.mongo_expressions import apply_update_pipeline, project
+
+COMPANY_ID = ObjectId()
+
+
+def company_doc():
+    return {
+        "_id": COMPANY_ID, "legal_name": "Acme", "legal_name_key": "acme", "is_active": True, "is_existing_client": False,
+        "financials": [{"checking_account": 100.0, "loans": 5.0, "timestamp": "2025-01-01T00:00:00"}],
+        "company_phone_number": "514", "company_email": "a@acme.test", "company_website": "acme.test",
+        "description": "", "fcc": 0, "street_address": "1 Main", "city": "Montreal", "state_or_province": "QC",
+        "postal_code": "H0H", "country": "CA",
+        "contacts": [{"id": "c1", "first_name": "Ann", "email": "ann@acme.test"}],
+        "actions": [], "comments": [], "news": [],
+    }
+
+
+class Collection:
+    def __init__(self, doc, error=None):
+        self.doc = doc
+        self.error = error
+        self.calls = []
+
+    async def find_one_and_update(self, query, pipeline, projection, return_document):
+        self.calls.append("find_one_and_update")
+        if self.error:
+            raise self.error
+        assert return_document == ReturnDocument.AFTER
+        if query["_id"] != self.doc["_id"]:
+            return None
+        self.doc = apply_update_pipeline(self.doc, pipeline)
+        return project(self.doc, projection)
+
+
+class Client:
+    def __init__(self, collection):
+        self.company = collection
+
+    def collection(self, name):
+        return self.company
+
+
+def test_fields_and_snapshot_are_written_and_read_back_in_one_call():
+    client = Client(Collection(company_doc()))
+    company = asyncio.run(CompanyRepository.update_detail(
+        client, str(COMPANY_ID), {"legal_name": "Acme Société", "city": "$city"}, {"loans": 7.0}
+    ))
+    assert client.company.calls == ["find_one_and_update"]
+    assert company.legal_name == "Acme Société" and company.city == "$city"
+    # The detail view carries the latest snapshot only, merged over the previous one
+    assert company.financials.loans == 7.0 and company.financials.checking_account == 100.0
+    assert company.contacts[0].first_name == "Ann"
+    stored = client.company.doc
+    assert stored["legal_name_key"] == "acme société" and len(stored["financials"]) == 2
+
+
+def test_unknown_company_is_none():
+    client = Client(Collection(company_doc()))
+    assert asyncio.run(CompanyRepository.update_detail(client, str(ObjectId()), {"city": "Laval"})) is None
+
+
+def test_patch_route_updates_in_one_round_trip(api):
+    collection = Collection(company_doc())
+    api.app.dependency_overrides[get_mongo_client] = lambda: Client(collection)
+    response = api.patch(f"/api/v1/companies/{COMPANY_ID}", json={"city": "Laval", "financials": {"loans": 9.0}})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["city"] == "Laval" and body["financials"]["loans"] == 9.0
+    assert collection.calls == ["find_one_and_update"]
+
+
+def test_duplicate_legal_name_is_a_conflict():
+    client = Client(Collection(company_doc(), error=DuplicateKeyError("E11000")))
+    with pytest.raises(HTTPException) as ex:
+        asyncio.run(CompanyService(CompanyRepository()).update_company(
+            client, str(COMPANY_ID), UpdateCompanyPayload(legalName="Taken")
+        ))
+    assert ex.value.status_code == 409
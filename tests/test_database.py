@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.db import database
+from app.db.database import MongoClient
+from app.db.monitoring import command_metrics
+
+
+def test_client_options_come_from_the_environment(monkeypatch):
+    monkeypatch.setattr(database, "MONGO_MAX_POOL_SIZE", 25)
+    monkeypatch.setattr(database, "MONGO_MIN_POOL_SIZE", 5)
+    monkeypatch.setattr(database, "MONGO_WAIT_QUEUE_TIMEOUT_MS", 2000)
+    monkeypatch.setattr(database, "MONGO_COMPRESSORS", "zstd,zlib")
+    # Building the client does not connect, so the options can be checked without a server
+    client = AsyncIOMotorClient("mongodb://localhost:1", **MongoClient._client_options())
+    try:
+        options = client.delegate.options
+        assert (options.pool_options.max_pool_size, options.pool_options.min_pool_size) == (25, 5)
+        assert options.pool_options.wait_queue_timeout == 2
+        assert options.server_selection_timeout == database.MONGO_SERVER_SELECTION_TIMEOUT_MS / 1000
+        assert set(options.pool_options._compression_settings.compressors) == {"zstd", "zlib"}
+        assert command_metrics in options.event_listeners
+    finally:
+        client.close()
+
+
+def test_compression_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(database, "MONGO_COMPRESSORS", "")
+    assert "compressors" not in MongoClient._client_options()
+
+
+class FakeAdmin:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.pings = 0
+
+    async def command(self, name):
+        assert name == "ping"
+        if self.fail:
+            raise ConnectionError("unreachable")
+        self.pings += 1
+        return {"ok": 1}
+
+
+class FakeMotor:
+    def __init__(self, uri, **options):
+        self.admin = FakeAdmin(fail="unreachable" in uri)
+        self.options = options
+
+
+def connect(monkeypatch, uri, warmup):
+    monkeypatch.setattr(database, "AsyncIOMotorClient", FakeMotor)
+    monkeypatch.setattr(database, "get_mongo_uri", lambda: uri)
+    monkeypatch.setattr(database, "MONGO_WARMUP", warmup)
+    monkeypatch.setattr(database, "MONGO_MIN_POOL_SIZE", 4)
+    client = MongoClient("test")
+    asyncio.run(client.connect_db())
+    return client
+
+
+def test_warm_up_opens_min_pool_size_connections(monkeypatch):
+    client = connect(monkeypatch, "mongodb://db", warmup=True)
+    assert client._client.admin.pings == 1 + 4
+    assert client._client.options["minPoolSize"] == 4
+
+
+def test_warm_up_can_be_skipped(monkeypatch):
+    assert connect(monkeypatch, "mongodb://db", warmup=False)._client.admin.pings == 0
+
+
+def test_unreachable_cluster_fails_startup(monkeypatch):
+    with pytest.raises(ConnectionError):
+        connect(monkeypatch, "mongodb://unreachable", warmup=True)
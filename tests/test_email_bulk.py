@@ -0,0 +1,80 @@
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from app.routers.dependencies import get_email_service
+from app.services import email as email_service
+from app.services.email import EmailService
+
+COMPANY_ID = ObjectId()
+
+
+def item(**overrides):
+    return {
+        "datetime": "2026-01-01T09:00:00",
+        "sender": "me@example.com",
+        "recipient": {"id": "c1", "email": "you@example.com"},
+        "template": "intro",
+        "company_id": str(COMPANY_ID),
+        **overrides,
+    }
+
+
+class FakeEmailRepository:
+    def __init__(self, write_errors=()):
+        self.write_errors = write_errors
+        self.created = []
+        self.refreshed = []
+
+    async def create_many(self, client, docs):
+        self.created.extend(docs)
+        if self.write_errors:
+            raise BulkWriteError({
+                "nInserted": len(docs) - len(self.write_errors),
+                "writeErrors": [{"index": i, "errmsg": "E11000 duplicate key"} for i in self.write_errors],
+            })
+
+    async def refresh_company_summaries(self, client, company_ids):
+        self.refreshed.append(set(company_ids))
+
+
+@pytest.fixture
+def bulk(api):
+    def post(items, repository=None):
+        repository = repository or FakeEmailRepository()
+        api.app.dependency_overrides[get_email_service] = lambda: EmailService(repository)
+        return api.post("/api/v1/emails/bulk", json=items), repository
+    return post
+
+
+def test_valid_items_are_written_in_one_batch(bulk):
+    response, repository = bulk([item(), item(template="follow-up")])
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 2, "failed": 0, "errors": []}
+    assert [doc["company_id"] for doc in repository.created] == [COMPANY_ID, COMPANY_ID]
+    assert repository.refreshed == [{COMPANY_ID}]
+
+
+def test_invalid_items_are_reported_by_index(bulk):
+    response, repository = bulk([item(), "not an object", item(company_id="nope"), {"template": "x"}])
+    body = response.json()
+    assert (body["inserted"], body["failed"]) == (1, 3)
+    errors = {error["index"]: error["detail"] for error in body["errors"]}
+    assert sorted(errors) == [1, 2, 3]
+    assert "company_id" in errors[2]
+    assert "sender" in errors[3] and "company_id: not a valid ObjectId" not in errors[3]
+    assert len(repository.created) == 1
+
+
+def test_write_errors_map_back_to_request_indexes(bulk):
+    # Index 1 is invalid, so the second valid item (request index 2) is docs[1]
+    response, _ = bulk([item(), item(sender=None), item()], FakeEmailRepository(write_errors=[1]))
+    body = response.json()
+    assert (body["inserted"], body["failed"]) == (1, 2)
+    assert [error["index"] for error in body["errors"]] == [1, 2]
+    assert body["errors"][1]["detail"].startswith("E11000")
+
+
+def test_too_many_items(bulk, monkeypatch):
+    monkeypatch.setattr(email_service, "EMAIL_BULK_MAX_ITEMS", 2)
+    response, repository = bulk([item()] * 3)
+    assert response.status_code == 413 and repository.created == []
@@ -0,0 +1,70 @@
+import asyncio
+from bson import ObjectId
+from app.db import get_mongo_client
+from app.models.common import CursorPage
+from app.models.email import EmailSummary
+from app.repositories.company import CompanyRepository
+from app.repositories.email import EmailRepository
+from app.services.email import EmailService
+
+COMPANY_ID = str(ObjectId())
+
+
+class FakeCompanies:
+    def __init__(self, doc):
+        self.doc = doc
+        self.calls = []
+
+    async def find_one(self, query, projection):
+        self.calls.append((query, projection))
+        return self.doc
+
+
+class FakeClient:
+    def __init__(self, doc):
+        self.companies = FakeCompanies(doc)
+
+    def collection(self, name):
+        assert name == "company"
+        return self.companies
+
+
+def test_summary_read_from_company_document():
+    client = FakeClient({"_id": ObjectId(COMPANY_ID), "email_summary": {"count": 3, "sent_count": 2, "answered_count": 1}})
+    summary = asyncio.run(CompanyRepository.get_email_summary(client, COMPANY_ID))
+    assert summary == EmailSummary(count=3, sent_count=2, answered_count=1)
+    assert client.companies.calls == [({"_id": ObjectId(COMPANY_ID)}, {"email_summary": 1})]
+
+
+def test_summary_missing_on_document_is_empty():
+    summary = asyncio.run(CompanyRepository.get_email_summary(FakeClient({"_id": ObjectId(COMPANY_ID)}), COMPANY_ID))
+    assert summary == EmailSummary()
+
+
+def test_summary_of_unknown_company_is_none():
+    assert asyncio.run(CompanyRepository.get_email_summary(FakeClient(None), COMPANY_ID)) is None
+
+
+def test_stats_route_404_for_unknown_company(api):
+    api.app.dependency_overrides[get_mongo_client] = lambda: FakeClient(None)
+    response = api.get(f"/api/v1/emails/company/{COMPANY_ID}/stats")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Company not found"
+
+
+def test_stats_route_serves_summary(api):
+    api.app.dependency_overrides[get_mongo_client] = lambda: FakeClient({"email_summary": {"count": 4, "latest_template": "intro"}})
+    response = api.get(f"/api/v1/emails/company/{COMPANY_ID}/stats")
+    assert response.status_code == 200
+    assert response.json()["count"] == 4 and response.json()["latestTemplate"] == "intro"
+
+
+def test_page_carries_summary(monkeypatch):
+    async def page_by_company_id(client, company_id, limit, cursor):
+        return CursorPage(items=[], next_cursor=None)
+    monkeypatch.setattr(EmailRepository, "page_by_company_id", staticmethod(page_by_company_id))
+    service = EmailService(EmailRepository(), CompanyRepository())
+    page = asyncio.run(service.page_emails_by_company_id(FakeClient({"email_summary": {"count": 7}}), COMPANY_ID, 10, ""))
+    assert page.stats.count == 7
+    page = asyncio.run(service.page_emails_by_company_id(FakeClient(None), COMPANY_ID, 10, ""))
+    assert page.stats == EmailSummary()
@@ -0,0 +1,134 @@
+import asyncio
+from datetime import datetime
+from bson import ObjectId
+from pymongo import UpdateOne
+from app.models.email import EmailSummary
+from app.repositories.email import EmailRepository, _summary_pipeline
+
+WITH_EMAILS = ObjectId()
+WITHOUT_EMAILS = ObjectId()
+
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in self.docs:
+            yield dict(doc)
+
+
+class FakeCollection:
+    def __init__(self, summaries=(), previous=None):
+        self.summaries = summaries
+        self.previous = previous
+        self.pipelines = []
+        self.writes = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return Cursor(self.summaries)
+
+    async def bulk_write(self, requests, ordered):
+        self.writes.extend(requests)
+
+    async def find_one_and_update(self, query, update, projection):
+        return self.previous
+
+
+class FakeClient:
+    def __init__(self, **kwargs):
+        self._collection = FakeCollection(**kwargs)
+
+    def collection(self, name):
+        return self._collection
+
+
+def test_pipeline_groups_newest_first_per_company():
+    pipeline = _summary_pipeline({"company_id": WITH_EMAILS})
+    assert pipeline[0] == {"$match": {"company_id": WITH_EMAILS}}
+    assert pipeline[1] == {"$sort": {"company_id": 1, "datetime": -1}}
+    group = pipeline[2]["$group"]
+    assert group["_id"] == "$company_id" and group["latest_datetime"] == {"$first": "$datetime"}
+    assert set(group) - {"_id"} == set(EmailSummary.model_fields)
+
+
+def test_refresh_sets_summaries_and_resets_companies_without_emails():
+    latest = datetime(2026, 1, 1)
+    client = FakeClient(summaries=[{"_id": WITH_EMAILS, "latest_datetime": latest, "latest_template": "intro", "count": 2, "sent_count": 1, "answered_count": 0}])
+    asyncio.run(EmailRepository.refresh_company_summaries(client, [str(WITH_EMAILS), WITHOUT_EMAILS, None]))
+    match = client._collection.pipelines[0][0]["$match"]["company_id"]["$in"]
+    assert set(match) == {WITH_EMAILS, WITHOUT_EMAILS}
+    summary = {"latest_datetime": latest, "latest_template": "intro", "count": 2, "sent_count": 1, "answered_count": 0}
+    writes = client._collection.writes
+    assert len(writes) == 2
+    assert UpdateOne({"_id": WITH_EMAILS}, {"$set": {"email_summary": summary}}) in writes
+    assert UpdateOne({"_id": WITHOUT_EMAILS}, {"$set": {"email_summary": EmailSummary().model_dump()}}) in writes
+
+
+def test_refresh_without_companies_does_nothing():
+    client = FakeClient()
+    asyncio.run(EmailRepository.refresh_company_summaries(client, [None]))
+    assert client._collection.pipelines == [] and client._collection.writes == []
+
+
+def test_update_refreshes_both_companies_of_a_moved_email():
+    client = FakeClient(previous={"_id": ObjectId(), "company_id": WITH_EMAILS})
+    asyncio.run(EmailRepository.update(client, str(ObjectId()), {"company_id": str(WITHOUT_EMAILS)}))
+    assert set(client._collection.pipelines[0][0]["$match"]["company_id"]["$in"]) == {WITH_EMAILS, WITHOUT_EMAILS}
+
+
+def test_update_of_other_fields_skips_the_refresh():
+    client = FakeClient(previous={"_id": ObjectId(), "company_id": WITH_EMAILS})
+    assert asyncio.run(EmailRepository.update(client, str(ObjectId()), {"sender": "x@example.com"}))
+    assert client._collection.pipelines == []
+
+
+class MergeCursor:
+    def __init__(self, run):
+        self.run = run
+
+    async def to_list(self, length):
+        self.run()
+        return []
+
+
+class BackfillClient:
+    """
+    Company documents in memory; the emails aggregation merges `merged` into them like $merge would.
+    """
+
+    def __init__(self, companies, merged):
+        self.companies = companies
+        self.merged = merged
+
+    def collection(self, name):
+        return self
+
+    async def update_many(self, query, update):
+        assert query == {}
+        for company in self.companies.values():
+            company.update(update["$set"])
+
+    def aggregate(self, pipeline):
+        assert pipeline[-1]["$merge"]["whenNotMatched"] == "discard"
+
+        def run():
+            for company_id, summary in self.merged.items():
+                self.companies[company_id]["email_summary"] = summary
+        return MergeCursor(run)
+
+
+def test_backfill_resets_companies_whose_emails_were_deleted():
+    fresh = {"latest_datetime": datetime(2026, 1, 2), "latest_template": "intro", "count": 1, "sent_count": 0, "answered_count": 0}
+    companies = {
+        WITH_EMAILS: {"email_summary": {**fresh, "count": 5}},
+        WITHOUT_EMAILS: {"email_summary": {**fresh, "count": 3}},
+        ObjectId(): {},
+    }
+    asyncio.run(EmailRepository.backfill_company_summaries(BackfillClient(companies, {WITH_EMAILS: fresh})))
+    assert companies[WITH_EMAILS]["email_summary"] == fresh
+    assert all(company["email_summary"] == EmailSummary().model_dump() for key, company in companies.items() if key != WITH_EMAILS)
@@ -0,0 +1,55 @@
+import asyncio
+import base64
+import email
+import io
+import zipfile
+import pytest
+from fastapi import HTTPException
+from app.models.email import EmlRequest
+from app.utils.email import eml_util
+from app.utils.email.eml_util import ZipStream, build_eml, decode_images, generate_eml_bytes
+
+PNG = base64.b64encode(b"\x89PNG\r\n\x1a\n" + b"\0" * 64).decode()
+
+
+def test_zip_stream_bytes_form_a_valid_archive():
+    zip_stream = ZipStream()
+    data = zip_stream.add("a.eml", b"first") + zip_stream.add("b.eml", b"second") + zip_stream.close()
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.namelist() == ["a.eml", "b.eml"]
+    assert archive.read("b.eml") == b"second"
+
+
+def test_build_eml_inlines_images():
+    message = email.message_from_bytes(build_eml("Hi", "to@example.com", '<img src="cid:image0">', decode_images([PNG]), "from@example.com"))
+    assert (message["Subject"], message["To"], message["From"]) == ("Hi", "to@example.com", "from@example.com")
+    parts = message.get_payload()
+    assert parts[0].get_content_type() == "text/html"
+    assert parts[1].get_content_type() == "image/png" and parts[1]["Content-ID"] == "<image0>"
+
+
+def test_oversized_payload_is_rejected_before_decoding(monkeypatch):
+    monkeypatch.setattr(eml_util, "EML_MAX_BYTES", 10)
+    request = EmlRequest(subject="s", to_email="t@example.com", html_body="x" * 11, images=["not base64"])
+    with pytest.raises(HTTPException) as ex:
+        asyncio.run(generate_eml_bytes(request))
+    assert ex.value.status_code == 413
+
+
+def test_invalid_image_is_a_bad_request():
+    request = EmlRequest(subject="s", to_email="t@example.com", html_body="", images=[PNG, "@@@"])
+    with pytest.raises(HTTPException) as ex:
+        asyncio.run(generate_eml_bytes(request))
+    assert ex.value.status_code == 400 and "index 1" in ex.value.detail
+
+
+def test_large_payload_is_built_in_a_thread(monkeypatch):
+    monkeypatch.setattr(eml_util, "EML_OFFLOAD_BYTES", 0)
+    request = EmlRequest(subject="s", to_email="t@example.com", html_body="<p>x</p>", images=[PNG])
+    assert email.message_from_bytes(asyncio.run(generate_eml_bytes(request)))["To"] == "t@example.com"
+
+
+def test_generate_eml_route_returns_rfc822(api):
+    response = api.post("/api/v1/emails/generate-eml/", json={"subject": "s", "to_email": "t@example.com", "html_body": "<p>x</p>", "images": [PNG]})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("message/rfc822")
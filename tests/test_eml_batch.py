@@ -0,0 +1,55 @@
+import email
+import io
+import zipfile
+from bson import ObjectId
+from app.routers.dependencies import get_email_service
+from app.services.email import EmailService
+
+COMPANY_ID = ObjectId()
+
+
+class FakeCompanyRepository:
+    async def iter_recipients(self, client, contact_ids, company_ids):
+        for idx in range(3):
+            yield COMPANY_ID, "Acme & Sons", {"id": f"c{idx}", "first_name": f"<Ann{idx}>", "email": f"ann{idx}@example.com"}
+
+
+class FakeEmailRepository:
+    def __init__(self):
+        self.created = []
+        self.refreshed = []
+
+    async def create_many(self, client, docs):
+        self.created.append(docs)
+
+    async def refresh_company_summaries(self, client, company_ids):
+        self.refreshed.append(set(company_ids))
+
+
+def test_batch_route_streams_one_eml_per_recipient(api, monkeypatch):
+    monkeypatch.setattr("app.services.email.EML_BATCH_CHUNK_SIZE", 2)
+    repository = FakeEmailRepository()
+    api.app.dependency_overrides[get_email_service] = lambda: EmailService(repository, FakeCompanyRepository())
+    response = api.post("/api/v1/emails/generate-eml/batch", json={
+        "subject": "Hello $first_name",
+        "html_body": "<p>Dear $first_name of $legal_name</p>",
+        "template": "intro",
+        "company_ids": [str(COMPANY_ID)],
+    })
+    assert response.status_code == 200 and response.headers["content-type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.namelist() == ["00001_ann0@example.com.eml", "00002_ann1@example.com.eml", "00003_ann2@example.com.eml"]
+    message = email.message_from_bytes(archive.read("00001_ann0@example.com.eml"))
+    assert message["Subject"] == "Hello <Ann0>"
+    assert message.get_payload()[0].get_payload(decode=True).decode() == "<p>Dear &lt;Ann0&gt; of Acme &amp; Sons</p>"
+    # Recorded per chunk, summaries refreshed once at the end
+    assert [len(docs) for docs in repository.created] == [2, 1]
+    assert repository.created[0][0]["template"] == "intro" and repository.created[0][0]["company_id"] == COMPANY_ID
+    assert repository.refreshed == [{COMPANY_ID}]
+
+
+def test_batch_route_rejects_empty_and_invalid_targets(api):
+    api.app.dependency_overrides[get_email_service] = lambda: EmailService(FakeEmailRepository(), FakeCompanyRepository())
+    body = {"subject": "s", "html_body": "b", "template": "t"}
+    assert api.post("/api/v1/emails/generate-eml/batch", json=body).status_code == 400
+    assert api.post("/api/v1/emails/generate-eml/batch", json={**body, "company_ids": ["nope"]}).status_code == 400
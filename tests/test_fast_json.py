@@ -0,0 +1,59 @@
+import json
+from datetime import datetime, timezone
+from bson import ObjectId
+from pydantic import TypeAdapter
+from typing import List
+from app.models.company import CompanyBase
+from app.models.common import CursorPage
+from app.routers import company as company_router
+from app.routers.dependencies import get_company_service
+from app.utils.fast_json import ORJSONResponse, model_response
+
+
+def companies():
+    return [
+        CompanyBase(
+            _id=ObjectId(), legal_name=f"Co {i}", is_active=True, is_existing_client=bool(i % 2),
+            financials=[{"checking_account": 1.5 * i, "timestamp": "2026-01-01T00:00:00"}],
+            latest_email_datetime="2026-01-02T03:04:05.000Z",
+            email_summary={"latest_datetime": datetime(2026, 1, 2, 3, 4, 5), "count": i},
+        )
+        for i in range(3)
+    ]
+
+
+class FakeCompanyService:
+    def __init__(self, items):
+        self.items = items
+
+    async def list_companies_with_latest_email(self, client, skip, limit):
+        return self.items
+
+    async def page_companies_with_latest_email(self, client, limit, cursor):
+        return CursorPage[CompanyBase](items=self.items, next_cursor="next")
+
+
+def test_fast_path_renders_the_same_json_as_response_model(api, monkeypatch):
+    service = FakeCompanyService(companies())
+    api.app.dependency_overrides[get_company_service] = lambda: service
+    for params in ({}, {"cursor": ""}):
+        monkeypatch.setattr(company_router, "FAST_JSON", False)
+        default = api.get("/api/v1/companies/", params=params)
+        monkeypatch.setattr(company_router, "FAST_JSON", True)
+        fast = api.get("/api/v1/companies/", params=params)
+        assert fast.status_code == default.status_code == 200
+        assert fast.json() == default.json()
+
+
+def test_model_response_applies_aliases():
+    items = companies()
+    body = json.loads(model_response(TypeAdapter(List[CompanyBase]), items).body)
+    assert body[0]["id"] == str(items[0].id) and body[0]["legalName"] == "Co 0"
+    assert body[1]["emailSummary"] == {"latestDatetime": "2026-01-02T03:04:05", "latestTemplate": None, "count": 1,
+                                       "sentCount": 0, "answeredCount": 0}
+
+
+def test_orjson_response_encodes_object_ids_and_utc_datetimes():
+    oid = ObjectId()
+    body = ORJSONResponse({"id": oid, "at": datetime(2026, 1, 1, tzinfo=timezone.utc), 1: "non-str key"}).body
+    assert json.loads(body) == {"id": str(oid), "at": "2026-01-01T00:00:00Z", "1": "non-str key"}
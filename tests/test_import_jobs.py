@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from app.enums.import_job import ImportJobStatus
+from app.services import import_job
+from app.services.import_job import ImportJobService
+
+
+@pytest.fixture(autouse=True)
+def jobs(monkeypatch):
+    monkeypatch.setattr(ImportJobService, "_jobs", type(ImportJobService._jobs)())
+    return ImportJobService._jobs
+
+
+def run_job(run):
+    async def main():
+        job = ImportJobService.create()
+        ImportJobService.start(job, run)
+        assert job.status == ImportJobStatus.PENDING
+        await asyncio.gather(*ImportJobService._tasks, return_exceptions=True)
+        return job
+    return asyncio.run(main())
+
+
+def test_successful_job_completes():
+    async def run(job):
+        assert job.status == ImportJobStatus.RUNNING
+        job.inserted = 3
+
+    job = run_job(run)
+    assert job.status == ImportJobStatus.COMPLETED and job.inserted == 3
+    assert job.finished_at is not None and job.error is None
+    assert ImportJobService.get(job.id) is job
+
+
+def test_failing_job_records_the_error():
+    async def run(job):
+        raise ValueError("bad workbook")
+
+    job = run_job(run)
+    assert job.status == ImportJobStatus.FAILED and job.error == "bad workbook"
+
+
+def test_cancelled_job_is_failed():
+    async def run(job):
+        await asyncio.sleep(10)
+
+    async def main():
+        job = ImportJobService.create()
+        ImportJobService.start(job, run)
+        await asyncio.sleep(0)
+        for task in list(ImportJobService._tasks):
+            task.cancel()
+        await asyncio.gather(*ImportJobService._tasks, return_exceptions=True)
+        return job
+
+    job = asyncio.run(main())
+    assert job.status == ImportJobStatus.FAILED and job.error == "Import was cancelled."
+    assert job.finished_at is not None
+
+
+def test_only_finished_jobs_are_evicted(monkeypatch):
+    monkeypatch.setattr(import_job, "MAX_IMPORT_JOBS", 2)
+    running = ImportJobService.create()
+    running.status = ImportJobStatus.RUNNING
+    finished = ImportJobService.create()
+    finished.status = ImportJobStatus.COMPLETED
+    latest = ImportJobService.create()
+    assert ImportJobService.get(finished.id) is None
+    assert ImportJobService.get(running.id) is running and ImportJobService.get(latest.id) is latest
+
+
+def test_status_route(api):
+    job = ImportJobService.create()
+    response = api.get(f"/api/v1/companies/import/{job.id}")
+    assert response.status_code == 200
+    assert response.json()["status"] == "PENDING" and "elapsedSeconds" in response.json()
+    assert api.get("/api/v1/companies/import/unknown").status_code == 404
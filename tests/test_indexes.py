@@ -0,0 +1,98 @@
+import asyncio
+from app.db.indexes import IndexSpec, _drift, _find_existing, ensure_indexes
+
+SPEC = IndexSpec(collection="company", keys=[("legal_name", 1), ("_id", 1)], name="legal_name_id")
+
+
+class FakeCollection:
+    def __init__(self, indexes):
+        self.indexes = indexes
+        self.created = []
+        self.dropped = []
+
+    async def index_information(self):
+        return self.indexes
+
+    async def create_index(self, keys, name, **options):
+        self.created.append(name)
+
+    async def drop_index(self, name):
+        self.dropped.append(name)
+
+
+class FakeClient:
+    def __init__(self, indexes):
+        self._collection = FakeCollection(indexes)
+
+    def collection(self, name):
+        return self._collection
+
+
+def test_numeric_directions_are_normalised():
+    existing = {"legal_name_1__id_1": {"key": [("legal_name", 1.0), ("_id", 1)]}}
+    assert _find_existing(SPEC, existing)[0] == "legal_name_1__id_1"
+
+
+def test_non_numeric_directions_do_not_break_matching():
+    existing = {
+        "_id_": {"key": [("_id", 1)]},
+        "name_text": {"key": [("_fts", "text"), ("_ftsx", 1)]},
+        "id_hashed": {"key": [("company_id", "hashed")]},
+        "geo": {"key": [("location", "2dsphere")]},
+    }
+    assert _find_existing(SPEC, existing) is None
+
+
+def test_ensure_indexes_creates_missing_next_to_text_index():
+    client = FakeClient({"_id_": {"key": [("_id", 1)]}, "name_text": {"key": [("_fts", "text"), ("_ftsx", 1)]}})
+    report = asyncio.run(ensure_indexes(client, specs=[SPEC]))
+    assert report.created == ["company.legal_name_id"]
+    assert client._collection.created == ["legal_name_id"]
+
+
+def test_check_only_reports_missing():
+    report = asyncio.run(ensure_indexes(FakeClient({}), create=False, specs=[SPEC]))
+    assert report.missing == ["company.legal_name_id"] and not report.healthy
+
+
+def test_drift_on_unique():
+    spec = IndexSpec(collection="reminders", keys=[("a", 1)], name="a", options={"unique": True})
+    assert _drift(spec, {"key": [("a", 1)]}) == {"unique": (True, False)}
+    assert _drift(spec, {"key": [("a", 1)], "unique": True}) == {}
+
+
+def _load_indexes(monkeypatch, retention):
+    import importlib
+    import app.db.indexes as indexes
+    if retention is None:
+        monkeypatch.delenv("CHANGELOG_RETENTION_DAYS", raising=False)
+    else:
+        monkeypatch.setenv("CHANGELOG_RETENTION_DAYS", retention)
+    try:
+        reloaded = importlib.reload(indexes)
+        return {spec.name: spec for spec in reloaded.INDEXES}, reloaded.RETIRED_INDEXES
+    finally:
+        monkeypatch.delenv("CHANGELOG_RETENTION_DAYS", raising=False)
+        importlib.reload(indexes)
+
+
+def test_ttl_index_only_registered_with_retention(monkeypatch):
+    specs, retired = _load_indexes(monkeypatch, None)
+    assert "date_ttl" not in specs and ("changelog", "date_ttl") in retired
+    specs, retired = _load_indexes(monkeypatch, "30")
+    assert specs["date_ttl"].options == {"expireAfterSeconds": 30 * 86400}
+    assert ("changelog", "date_ttl") not in retired
+
+
+def test_retired_index_is_dropped():
+    client = FakeClient({"_id_": {"key": [("_id", 1)]}, "old": {"key": [("legal_name", 1)]}})
+    report = asyncio.run(ensure_indexes(client, specs=[], retired=[("company", "old"), ("company", "gone")]))
+    assert report.dropped == ["company.old"]
+    assert client._collection.dropped == ["old"]
+
+
+def test_check_only_reports_retired_without_dropping():
+    client = FakeClient({"old": {"key": [("legal_name", 1)]}})
+    report = asyncio.run(ensure_indexes(client, create=False, specs=[], retired=[("company", "old")]))
+    assert report.retired == ["company.old"] and not report.healthy
+    assert client._collection.dropped == []
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+from prometheus_client import REGISTRY
+from app.db.monitoring import MongoCommandMetrics
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_requests_are_labelled_with_the_route_template(api):
+    route = "/api/v1/companies/import/{job_id}"
+    before = sample("http_requests_total", method="GET", route=route, status="404")
+    assert api.get("/api/v1/companies/import/one").status_code == 404
+    assert api.get("/api/v1/companies/import/two").status_code == 404
+    assert sample("http_requests_total", method="GET", route=route, status="404") == before + 2
+    assert sample("http_request_duration_seconds_count", method="GET", route=route) >= 2
+
+
+def test_unknown_paths_share_one_label(api):
+    before = sample("http_requests_total", method="GET", route="unmatched", status="404")
+    api.get("/no/such/path/123")
+    assert sample("http_requests_total", method="GET", route="unmatched", status="404") == before + 1
+
+
+def test_metrics_endpoint_serves_prometheus_text(api):
+    response = api.get("/metrics")
+    assert response.status_code == 200
+    assert "http_requests_total" in response.text
+
+
+def event(request_id, command_name, **fields):
+    return SimpleNamespace(connection_id=("localhost", 27017), request_id=request_id, command_name=command_name, duration_micros=1500, **fields)
+
+
+def test_command_listener_records_latency_documents_and_failures():
+    listener = MongoCommandMetrics()
+    labels = {"collection": "company", "command": "find"}
+    count = sample("mongo_command_duration_seconds_count", **labels)
+    documents = sample("mongo_command_documents_total", **labels)
+    failures = sample("mongo_command_failures_total", **labels)
+
+    listener.started(event(1, "find", command={"find": "company", "filter": {}}))
+    listener.succeeded(event(1, "find", reply={"cursor": {"firstBatch": [{}, {}, {}]}}))
+    listener.started(event(2, "find", command={"find": "company"}))
+    listener.failed(event(2, "find", failure={}))
+
+    assert sample("mongo_command_duration_seconds_count", **labels) == count + 2
+    assert sample("mongo_command_documents_total", **labels) == documents + 3
+    assert sample("mongo_command_failures_total", **labels) == failures + 1
+    assert listener._pending == {}
+
+
+def test_get_more_is_labelled_with_its_collection():
+    listener = MongoCommandMetrics()
+    labels = {"collection": "emails", "command": "getMore"}
+    documents = sample("mongo_command_documents_total", **labels)
+    listener.started(event(3, "getMore", command={"getMore": 123, "collection": "emails"}))
+    listener.succeeded(event(3, "getMore", reply={"cursor": {"nextBatch": [{}]}}))
+    assert sample("mongo_command_documents_total", **labels) == documents + 1
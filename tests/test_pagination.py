@@ -0,0 +1,70 @@
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_filter, split_page, with_keyset
+
+SORT = [("legal_name", 1), ("_id", 1)]
+
+
+def test_cursor_round_trip_keeps_bson_types():
+    doc = {"legal_name": "Acme", "_id": ObjectId()}
+    assert decode_cursor(encode_cursor(doc, SORT), SORT) == ["Acme", doc["_id"]]
+
+
+def test_empty_cursor_is_first_page():
+    assert decode_cursor("", SORT) is None
+    assert with_keyset({"a": 1}, SORT, "") == {"a": 1}
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "e30=", encode_cursor({"_id": 1}, [("_id", 1)])])
+def test_malformed_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as ex:
+        decode_cursor(cursor, SORT)
+    assert ex.value.status_code == 400
+
+
+def test_keyset_filter_single_field():
+    assert keyset_filter([("_id", -1)], [5]) == {"_id": {"$lt": 5}}
+
+
+def test_keyset_filter_compound():
+    assert keyset_filter(SORT, ["Acme", 7]) == {"$or": [
+        {"legal_name": {"$gt": "Acme"}},
+        {"legal_name": "Acme", "_id": {"$gt": 7}},
+    ]}
+
+
+def test_with_keyset_combines_base_filter():
+    cursor = encode_cursor({"_id": 3}, [("_id", 1)])
+    assert with_keyset({"company_id": 1}, [("_id", 1)], cursor) == {"$and": [{"company_id": 1}, {"_id": {"$gt": 3}}]}
+
+
+def test_split_page_returns_cursor_of_last_item_when_more_remain():
+    docs = [{"_id": i} for i in range(4)]
+    page, cursor = split_page(docs, [("_id", 1)], 3)
+    assert page == docs[:3]
+    assert decode_cursor(cursor, [("_id", 1)]) == [2]
+
+
+def test_split_page_last_page_has_no_cursor():
+    docs = [{"_id": 1}]
+    assert split_page(docs, [("_id", 1)], 3) == (docs, None)
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_split_page_rejects_non_positive_limit(limit):
+    with pytest.raises(ValueError):
+        split_page([{"_id": 1}, {"_id": 2}], [("_id", 1)], limit)
+
+
+@pytest.mark.parametrize("path", [
+    "/api/v1/companies/?limit=0&cursor=",
+    "/api/v1/companies/?limit=-1",
+    "/api/v1/companies/?limit=101",
+    "/api/v1/emails/?limit=0&cursor=",
+    "/api/v1/emails/company/abc?limit=0&cursor=",
+    "/api/v1/reminders?limit=0&cursor=",
+    "/api/v1/reminders?limit=",
+])
+def test_paginated_routes_validate_limit(api, path):
+    assert api.get(path).status_code == 422
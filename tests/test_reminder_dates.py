@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta, timezone
+from app.enums.reminder import ReminderWindow
+from app.models.reminder import ReminderBase
+from app.services.reminder import ReminderService
+from app.utils.dates import to_utc, utc_now
+
+MONTREAL = timezone(timedelta(hours=-4))
+
+
+def test_utc_now_is_naive_utc():
+    now = utc_now()
+    assert now.tzinfo is None
+    assert abs(now - datetime.now(timezone.utc).replace(tzinfo=None)) < timedelta(seconds=1)
+
+
+def test_to_utc_converts_aware_and_keeps_naive():
+    assert to_utc(datetime(2026, 1, 1, 8, tzinfo=MONTREAL)) == datetime(2026, 1, 1, 12)
+    assert to_utc(datetime(2026, 1, 1, 8)) == datetime(2026, 1, 1, 8)
+
+
+def test_reminder_due_date_is_stored_as_naive_utc():
+    reminder = ReminderBase(company_id="c", action_id="a", due_date="2026-01-01T08:00:00-04:00")
+    assert reminder.due_date == datetime(2026, 1, 1, 12)
+
+
+def test_window_filter_normalises_bounds():
+    _filter = ReminderService._window_filter(datetime(2026, 1, 1, tzinfo=MONTREAL), datetime(2026, 1, 2))
+    assert _filter == {"completed": False, "due_date": {"$gte": datetime(2026, 1, 1, 4), "$lt": datetime(2026, 1, 2)}}
+
+
+def test_overdue_window_ends_at_utc_now():
+    before = utc_now()
+    upper = ReminderService._window_filter(window=ReminderWindow.OVERDUE)["due_date"]["$lt"]
+    assert upper.tzinfo is None and before <= upper <= utc_now()
@@ -0,0 +1,91 @@
+from datetime import timedelta
+from bson import ObjectId
+from app.db import get_mongo_client
+from app.utils.dates import utc_now
+from tests.mongo_expressions import evaluate, project
+
+ACME = ObjectId()
+GONE = ObjectId()
+ACTION = {"id": "a1", "title": "Call", "description": "", "operation": "CALL", "date": utc_now(), "user": "ann"}
+COMPANIES = [
+    {"_id": ACME, "legal_name": "Acme", "actions": [{**ACTION, "id": "a0", "title": "Other"}, ACTION]},
+]
+
+
+def reminder(hours, company_id, action_id):
+    return {"_id": ObjectId(), "company_id": company_id, "action_id": action_id, "due_date": utc_now() + timedelta(hours=hours),
+            "created_at": utc_now(), "completed": False}
+
+
+REMINDERS = [
+    reminder(-1, str(ACME), "a1"),
+    reminder(1, str(ACME), "deleted-action"),
+    reminder(2, str(GONE), "a1"),
+    reminder(3, "not-an-object-id", "a1"),
+    reminder(4, str(ACME), "a1"),
+]
+
+
+class Aggregation:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return self.docs
+
+
+class Reminders:
+    """
+    Runs the reminder page pipeline: the $lookup sub-pipeline is evaluated against COMPANIES and
+    the result unwound; the leading $match, $sort and $limit are applied to REMINDERS directly.
+    """
+
+    def __init__(self):
+        self.pipelines = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        stages = {name: spec for stage in pipeline for name, spec in stage.items()}
+        assert set(stages) == {"$match", "$sort", "$limit", "$lookup", "$unwind"}
+        lookup = stages["$lookup"]
+        match, projection = lookup["pipeline"][0]["$match"]["$expr"], lookup["pipeline"][1]["$project"]
+        docs = []
+        for doc in sorted(REMINDERS, key=lambda doc: doc["due_date"])[:stages["$limit"]]:
+            variables = {name: evaluate(expr, doc) for name, expr in lookup["let"].items()}
+            joined = [project(company, projection, variables) for company in COMPANIES if evaluate(match, company, variables)]
+            doc = dict(doc)
+            if joined:
+                doc[lookup["as"]] = joined[0]
+            docs.append(doc)
+        return Aggregation(docs)
+
+
+class Client:
+    def __init__(self):
+        self.reminders = Reminders()
+
+    def collection(self, name):
+        assert name == "reminders"
+        return self.reminders
+
+
+def test_listing_resolves_company_and_action_in_one_aggregation(api):
+    client = Client()
+    api.app.dependency_overrides[get_mongo_client] = lambda: client
+    response = api.get("/api/v1/reminders", params={"limit": 20})
+    assert response.status_code == 200
+    body = response.json()
+    # Reminders whose company or action no longer exists, or whose company id is malformed, are skipped
+    assert [item["id"] for item in body] == [str(REMINDERS[0]["_id"]), str(REMINDERS[4]["_id"])]
+    assert {item["companyName"] for item in body} == {"Acme"}
+    assert {item["action"]["title"] for item in body} == {"Call"}
+    assert [item["state"] for item in body] == ["PAST", "NOT_PAST"]
+    assert len(client.reminders.pipelines) == 1
+
+
+def test_cursor_page_reports_next_cursor(api):
+    client = Client()
+    api.app.dependency_overrides[get_mongo_client] = lambda: client
+    body = api.get("/api/v1/reminders", params={"limit": 2, "cursor": ""}).json()
+    assert body["nextCursor"] is not None
+    assert [item["id"] for item in body["items"]] == [str(REMINDERS[0]["_id"])]
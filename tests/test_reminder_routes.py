@@ -0,0 +1,49 @@
+from datetime import datetime
+from app.services.reminder import ReminderService
+
+
+def test_patch_with_malformed_due_date_is_422(api, monkeypatch):
+    async def update_partial(client, reminder_id, updates):
+        raise AssertionError("must not reach the service")
+    monkeypatch.setattr(ReminderService, "update_partial", update_partial)
+    response = api.patch("/api/v1/reminders/abc", json={"dueDate": "next tuesday"})
+    assert response.status_code == 422
+
+
+def test_patch_passes_validated_db_fields(api, monkeypatch):
+    received = {}
+
+    async def update_partial(client, reminder_id, updates):
+        received.update(updates)
+        return None
+    monkeypatch.setattr(ReminderService, "update_partial", update_partial)
+    response = api.patch("/api/v1/reminders/abc", json={"dueDate": "2026-01-01T08:00:00-04:00", "isCompleted": None, "other": 1})
+    assert response.status_code == 404
+    assert received == {"due_date": datetime(2026, 1, 1, 12)}
+
+
+def test_stream_is_404_without_the_sse_notifier(api, monkeypatch):
+    from app.services.reminder_scheduler import reminder_scheduler
+    monkeypatch.setattr(reminder_scheduler, "_running", True)
+    monkeypatch.setattr(reminder_scheduler, "notifiers", [])
+    assert api.get("/api/v1/reminders/stream").status_code == 404
+
+
+def test_stream_is_404_while_the_scheduler_is_stopped(api, monkeypatch):
+    from app.services.reminder_scheduler import reminder_scheduler, sse_notifier
+    monkeypatch.setattr(reminder_scheduler, "notifiers", [sse_notifier])
+    assert api.get("/api/v1/reminders/stream").status_code == 404
+
+
+def test_stream_serves_events_with_the_sse_notifier(api, monkeypatch):
+    from app.services.reminder_scheduler import reminder_scheduler, sse_notifier
+
+    async def subscribe():
+        yield "event: reminder\ndata: {}\n\n"
+    monkeypatch.setattr(reminder_scheduler, "_running", True)
+    monkeypatch.setattr(reminder_scheduler, "notifiers", [sse_notifier])
+    monkeypatch.setattr(sse_notifier, "subscribe", subscribe)
+    response = api.get("/api/v1/reminders/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == "event: reminder\ndata: {}\n\n"
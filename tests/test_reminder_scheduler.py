@@ -0,0 +1,144 @@
+import asyncio
+from datetime import timedelta
+import pytest
+from bson import ObjectId
+from app.models.reminder import Reminder
+from app.repositories.reminder import ReminderRepository
+import app.services.reminder_scheduler as scheduler_module
+from app.services.reminder_scheduler import ReminderNotifier, ReminderScheduler
+from app.utils.dates import utc_now
+
+
+def make_reminder(seconds: float, action_id: str = "a", completed: bool = False) -> Reminder:
+    return Reminder(_id=ObjectId(), company_id="c", action_id=action_id, due_date=utc_now() + timedelta(seconds=seconds),
+                    created_at=utc_now(), completed=completed)
+
+
+class RecordingNotifier(ReminderNotifier):
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.fired = []
+
+    async def notify(self, reminder: Reminder) -> None:
+        await asyncio.sleep(self.delay)
+        self.fired.append(reminder.action_id)
+
+
+@pytest.fixture(autouse=True)
+def no_database(monkeypatch):
+    async def list_upcoming(client, after, limit):
+        return []
+    monkeypatch.setattr(ReminderRepository, "list_upcoming", list_upcoming)
+
+
+def test_notifier_base_is_abstract():
+    with pytest.raises(TypeError):
+        ReminderNotifier()
+
+
+def test_schedule_is_a_no_op_until_started():
+    scheduler = ReminderScheduler([])
+    scheduler.schedule(make_reminder(60))
+    scheduler.unschedule("c", "a")
+    assert scheduler._heap == [] and scheduler._entries == {} and scheduler._keys_by_id == {}
+
+
+def test_stop_releases_scheduled_reminders():
+    async def run():
+        scheduler = ReminderScheduler([])
+        await scheduler.start(None)
+        scheduler.schedule(make_reminder(60))
+        await scheduler.stop()
+        scheduler.schedule(make_reminder(60, "b"))
+        return scheduler
+    scheduler = asyncio.run(run())
+    assert not scheduler.running and scheduler._heap == [] and scheduler._entries == {}
+
+
+def test_completed_and_past_reminders_are_not_scheduled():
+    async def run():
+        scheduler = ReminderScheduler([])
+        await scheduler.start(None)
+        scheduler.schedule(make_reminder(-1, "past"))
+        scheduler.schedule(make_reminder(60, "done", completed=True))
+        await scheduler.stop()
+        return scheduler
+    assert asyncio.run(run())._entries == {}
+
+
+def test_rescheduling_compacts_stale_heap_items(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "HEAP_COMPACT_MIN_STALE", 10)
+
+    async def run():
+        scheduler = ReminderScheduler([])
+        await scheduler.start(None)
+        reminder = make_reminder(60)
+        for i in range(100):
+            scheduler.schedule(reminder.model_copy(update={"due_date": reminder.due_date + timedelta(seconds=i)}))
+        sizes = (len(scheduler._heap), len(scheduler._entries))
+        await scheduler.stop()
+        return sizes
+    heap_size, entries = asyncio.run(run())
+    assert entries == 1
+    assert heap_size <= 20
+
+
+def test_due_reminders_fire_in_order_without_waiting_for_slow_notifiers(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "REMINDER_NOTIFY_TIMEOUT_SECONDS", 0.3)
+    fast = RecordingNotifier()
+    slow = RecordingNotifier(delay=5)
+
+    async def run():
+        scheduler = ReminderScheduler([slow, fast])
+        await scheduler.start(None)
+        scheduler.schedule(make_reminder(0.2, "second"))
+        scheduler.schedule(make_reminder(0.1, "first"))
+        scheduler.schedule(make_reminder(0.15, "removed"))
+        scheduler.unschedule("c", "removed")
+        await asyncio.sleep(0.8)
+        pending = len(scheduler._notifications)
+        await scheduler.stop()
+        return pending
+    pending = asyncio.run(run())
+    assert fast.fired == ["first", "second"]
+    # The slow notifier timed out instead of blocking
+    assert slow.fired == [] and pending == 0
+
+
+def test_changing_the_key_moves_the_reminder():
+    notifier = RecordingNotifier()
+
+    async def run():
+        scheduler = ReminderScheduler([notifier])
+        await scheduler.start(None)
+        reminder = make_reminder(0.1, "a")
+        scheduler.schedule(reminder)
+        scheduler.schedule(reminder.model_copy(update={"action_id": "b"}))
+        await asyncio.sleep(0.3)
+        entries = dict(scheduler._entries)
+        await scheduler.stop()
+        return entries
+    assert asyncio.run(run()) == {}
+    assert notifier.fired == ["b"]
+
+
+def test_schedule_keeps_the_earliest_reminders_at_the_cap(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "REMINDER_SCHEDULER_MAX", 2)
+
+    async def run():
+        scheduler = ReminderScheduler([])
+        await scheduler.start(None)
+        scheduler.schedule(make_reminder(60, "a"))
+        scheduler.schedule(make_reminder(120, "b"))
+        # Due after everything held: left for the reload
+        scheduler.schedule(make_reminder(180, "late"))
+        held_after_late = sorted(action for _, action in scheduler._entries)
+        # Due earlier: the latest entry makes room
+        scheduler.schedule(make_reminder(30, "early"))
+        held = sorted(action for _, action in scheduler._entries)
+        ids = len(scheduler._keys_by_id)
+        await scheduler.stop()
+        return held_after_late, held, ids
+    held_after_late, held, ids = asyncio.run(run())
+    assert held_after_late == ["a", "b"]
+    assert held == ["a", "early"] and ids == 2
@@ -0,0 +1,85 @@
+import asyncio
+import copy
+from bson import ObjectId
+from app.models.payloads import CreateActionPayload, PostContactPayload
+from app.repositories.action import ActionRepository
+from app.repositories.contact import ContactRepository
+from app.services import action as action_service
+from app.services.action import ActionService
+from app.services.contact import ContactService
+
+COMPANY_ID = ObjectId()
+
+
+class Collection:
+    """
+    One company document; only find_one_and_update is available, so any re-listing read fails the test.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.writes = 0
+
+    async def find_one_and_update(self, query, update, projection, return_document):
+        self.writes += 1
+        if query["_id"] != self.doc["_id"]:
+            return None
+        for field, value in query.items():
+            array, _, key = field.partition(".")
+            if key and not any(item.get(key) == value for item in self.doc.get(array, [])):
+                return None
+        (op, fields), = update.items()
+        for path, value in fields.items():
+            if op == "$push":
+                self.doc.setdefault(path, []).append(copy.deepcopy(value))
+            elif op == "$pull":
+                self.doc[path] = [item for item in self.doc[path] if not all(item.get(k) == v for k, v in value.items())]
+            elif op == "$set":
+                array, _, field_name = path.partition(".$.")
+                matched_id = query[f"{array}.id"]
+                next(item for item in self.doc[array] if item["id"] == matched_id)[field_name] = value
+        return {field: copy.deepcopy(self.doc.get(field, [])) for field, include in projection.items() if include}
+
+
+class Client:
+    def __init__(self, doc):
+        self.company = Collection(doc)
+
+    def collection(self, name):
+        return self.company
+
+
+def test_actions_come_back_from_the_write(monkeypatch):
+    deleted_reminders = []
+
+    async def delete(client, company_id, action_id):
+        deleted_reminders.append(action_id)
+    monkeypatch.setattr(action_service.ReminderService, "delete", delete)
+    client = Client({"_id": COMPANY_ID, "actions": []})
+    service = ActionService(ActionRepository())
+
+    actions = asyncio.run(service.create_action(client, str(COMPANY_ID), CreateActionPayload(title="Call", description="", operation="CALL")))
+    assert [action.title for action in actions] == ["Call"]
+    action_id = actions[0].id
+
+    assert asyncio.run(service.delete_action(client, str(COMPANY_ID), action_id)) == []
+    assert asyncio.run(service.delete_action(client, str(COMPANY_ID), action_id)) is None
+    assert client.company.writes == 3 and deleted_reminders == [action_id]
+
+
+def test_contacts_come_back_from_the_write():
+    client = Client({"_id": COMPANY_ID, "contacts": [{"id": "c0", "first_name": "Bob", "last_name": "B", "email": "bob@x.test"}]})
+    service = ContactService(ContactRepository())
+    payload = PostContactPayload(firstName="Ann", lastName="A", email="ann@x.test")
+
+    contacts = asyncio.run(service.create_contact(client, str(COMPANY_ID), payload))
+    assert [contact.first_name for contact in contacts] == ["Bob", "Ann"]
+    contact_id = contacts[1].id
+
+    updated = asyncio.run(service.update_contact(client, str(COMPANY_ID), contact_id, payload.model_copy(update={"email": "ann@y.test"})))
+    assert [contact.email for contact in updated] == ["bob@x.test", "ann@y.test"]
+
+    assert [contact.id for contact in asyncio.run(service.delete_contact(client, str(COMPANY_ID), "c0"))] == [contact_id]
+    assert asyncio.run(service.update_contact(client, str(COMPANY_ID), "missing", payload)) is None
+    assert asyncio.run(service.create_contact(Client({"_id": ObjectId()}), str(COMPANY_ID), payload)) is None
+    assert client.company.writes == 4